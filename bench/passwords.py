@@ -0,0 +1,67 @@
+"""
+Benchmark: latency of unrelated work on the event loop during a login storm,
+with bcrypt run inline (old behaviour) vs in the password executor.
+
+A probe coroutine stands in for an unrelated endpoint: it sleeps for a short
+tick and records how late it woke up, which is exactly the delay a request
+waiting on the loop would see.
+
+Usage: python -m bench.passwords [logins] [concurrency]
+"""
+import asyncio
+import statistics
+import sys
+import time
+import bcrypt
+from modules.auth import passwords
+
+PROBE_TICK = 0.005
+
+async def probe(delays: list, done: asyncio.Event):
+    while not done.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_TICK)
+        delays.append(time.perf_counter() - start - PROBE_TICK)
+
+async def inline_login(password: str, hashed: str):
+    await asyncio.sleep(0)  # yield like a request handler would before the check
+    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+async def pooled_login(password: str, hashed: str):
+    return await passwords.verify_password(password, hashed)
+
+async def storm(login, hashed: str, logins: int, concurrency: int):
+    delays = []
+    done = asyncio.Event()
+    probe_task = asyncio.create_task(probe(delays, done))
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with limit:
+            await login("admin123", hashed)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await probe_task
+    return elapsed, delays
+
+def report(label: str, elapsed: float, delays: list, logins: int):
+    delays = sorted(delays) or [0.0]
+    p50 = statistics.median(delays)
+    p99 = delays[min(len(delays) - 1, int(len(delays) * 0.99))]
+    print(f"{label:<8} {logins / elapsed:7.1f} logins/s   probe p50 {p50 * 1000:7.2f} ms   "
+          f"p99 {p99 * 1000:7.2f} ms   max {delays[-1] * 1000:7.2f} ms")
+
+async def main():
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    hashed = bcrypt.hashpw(b"admin123", bcrypt.gensalt(rounds=passwords.BCRYPT_ROUNDS)).decode('utf-8')
+    print(f"bcrypt rounds {passwords.BCRYPT_ROUNDS}, executor threads {passwords.BCRYPT_MAX_CONCURRENCY}, "
+          f"{logins} logins, {concurrency} in flight")
+    report("inline", *await storm(inline_login, hashed, logins, concurrency), logins)
+    report("pooled", *await storm(pooled_login, hashed, logins, concurrency), logins)
+
+if __name__ == "__main__":
+    asyncio.run(main())
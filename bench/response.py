@@ -0,0 +1,78 @@
+"""
+Micro-benchmark: old serialize_data + JSONResponse vs FastJSONResponse.
+
+Usage: python -m bench.response [repeats]
+"""
+import sys
+import timeit
+from datetime import datetime, time, timedelta
+from fastapi.responses import JSONResponse
+from modules.shared.response import FastJSONResponse, serialize_data, orjson
+
+def make_matches(count: int):
+    start = datetime(2025, 1, 1, 15, 0)
+    return [
+        {
+            "match_id": i,
+            "season_id": 1 + i % 4,
+            "team1_id": 1 + i % 20,
+            "team2_id": 1 + (i + 7) % 20,
+            "team1_name": f"Team {1 + i % 20}",
+            "team2_name": f"Team {1 + (i + 7) % 20}",
+            "date": (start + timedelta(days=i)).date(),
+            "time": time(15, 0),
+            "home_goals": i % 4,
+            "away_goals": i % 3,
+            "results": {"status": "finished", "attendance": 1000 + i},
+            "created_at": start + timedelta(days=i, minutes=i),
+            "updated_at": start + timedelta(days=i, minutes=i),
+        }
+        for i in range(count)
+    ]
+
+def make_news(count: int):
+    published = datetime(2025, 1, 1, 9, 0)
+    return [
+        {
+            "news_id": i,
+            "title": f"Headline number {i}",
+            "slug": f"headline-number-{i}",
+            "excerpt": "Short summary of the article. " * 3,
+            "content": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 40,
+            "author": "Newsroom",
+            "tags": ["league", "report", f"round-{i % 30}"],
+            "views": i * 13,
+            "is_published": True,
+            "published_at": published + timedelta(hours=i),
+            "created_at": published + timedelta(hours=i),
+            "updated_at": published + timedelta(hours=i),
+        }
+        for i in range(count)
+    ]
+
+def old_render(data):
+    # serialize_data only knows datetime/date, so give it the shape it was used with
+    return JSONResponse(content={"status": "success", "data": serialize_data(data)}).body
+
+def new_render(data):
+    return FastJSONResponse(content={"status": "success", "data": data}).body
+
+def bench(label: str, data, repeats: int):
+    old = min(timeit.repeat(lambda: old_render(data), number=1, repeat=repeats))
+    new = min(timeit.repeat(lambda: new_render(data), number=1, repeat=repeats))
+    print(f"{label:<18} old {old * 1000:8.2f} ms   new {new * 1000:8.2f} ms   x{old / new:5.1f}")
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print(f"Encoder: {'orjson' if orjson is not None else 'stdlib json (fallback)'}")
+    for count in (100, 1000, 5000):
+        matches = make_matches(count)
+        # old path can't encode datetime.time, the managers pre-format it
+        for match in matches:
+            match["time"] = match["time"].isoformat()
+        bench(f"matches x{count}", matches, repeats)
+    for count in (20, 100):
+        bench(f"news x{count}", make_news(count), repeats)
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,12 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from modules.shared.db import init_db
+from modules.shared.db import init_db, init_pool, close_pool, get_pool_stats
+from modules.shared.cache import get_cache_stats, init_cache_backend, close_cache_backend
+from modules.shared.conditional import ConditionalGetMiddleware
+from modules.shared.tasks import start_periodic_tasks, stop_periodic_tasks, get_task_stats
 from modules.shared.seeda import seed_data
-from modules.auth.router import router as auth_router
+from modules.auth.router import router as auth_router, get_current_user
+from modules.shared.response import error_response
 from modules.leagues.router import router as leagues_router
 from modules.teams.router import router as teams_router
 from modules.players.router import router as players_router
@@ -10,6 +14,8 @@ from modules.matches.router import router as matches_router
 from modules.standings.router import router as standings_router
 from modules.venues.router import router as venues_router
 from modules.news.router import router as news_router
+from modules.imports.router import router as imports_router
+from modules.exports.router import router as exports_router
 from modules.seasons import router as seasons_router
 import logging
 
@@ -22,6 +28,9 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI()
 
+# ETag / Last-Modified on JSON GETs so polling clients get 304s when nothing changed
+app.add_middleware(ConditionalGetMiddleware)
+
 # Configure CORS to allow all origins
 app.add_middleware(
     CORSMiddleware,
@@ -40,6 +49,8 @@ app.include_router(matches_router, prefix="/matches", tags=["matches"])
 app.include_router(standings_router, prefix="/standings", tags=["standings"])
 app.include_router(venues_router, prefix="/venues", tags=["venues"])
 app.include_router(news_router, prefix="/news", tags=["news"])
+app.include_router(imports_router, prefix="/import", tags=["import"])
+app.include_router(exports_router, prefix="/export", tags=["export"])
 app.include_router(seasons_router.router, prefix="/seasons")
 
 @app.on_event("startup")
@@ -48,15 +59,26 @@ async def startup_event():
     logger.info("🚀 Starting Crimax Sport application...")
     
     try:
-        # Step 1: Initialize database (create tables + run migrations)
+        # Step 1: Open the shared connection pool
+        logger.info("🔌 Creating database connection pool...")
+        await init_pool()
+
+        # Step 2: Initialize database (create tables + run migrations)
         logger.info("📊 Initializing database...")
         await init_db()
         logger.info("✅ Database initialized successfully")
         
-        # Step 2: Seed initial data
+        # Step 3: Seed initial data
         logger.info("🌱 Seeding initial data...")
         await seed_data()
         logger.info("✅ Data seeded successfully")
+
+        # Step 4: Connect the cache backend
+        logger.info("🗄️  Connecting cache backend...")
+        await init_cache_backend()
+
+        # Step 5: Start background jobs
+        start_periodic_tasks()
         
         logger.info("🎉 Application startup complete!")
         
@@ -64,6 +86,36 @@ async def startup_event():
         logger.error(f"❌ Startup failed: {e}")
         raise
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release pooled database connections on application shutdown"""
+    # Stop background jobs first: their final run (e.g. flushing buffered views) needs the pool
+    await stop_periodic_tasks()
+    await close_cache_backend()
+    logger.info(f"🔌 Database pool at shutdown: {get_pool_stats()}")
+    await close_pool()
+
+@app.get("/debug/db", tags=["debug"])
+async def debug_db(current_user: dict = Depends(get_current_user)):
+    """Connection pool usage; 'outstanding' should be 0 when the server is idle (admin only)"""
+    if current_user["role"] != "admin":
+        return error_response("Unauthorized", 403)
+    return get_pool_stats()
+
+@app.get("/debug/cache", tags=["debug"])
+async def debug_cache(current_user: dict = Depends(get_current_user)):
+    """Hit/miss counters and sizes of the in-process read caches (admin only)"""
+    if current_user["role"] != "admin":
+        return error_response("Unauthorized", 403)
+    return get_cache_stats()
+
+@app.get("/debug/tasks", tags=["debug"])
+async def debug_tasks(current_user: dict = Depends(get_current_user)):
+    """Run/failure counters of the background periodic tasks (admin only)"""
+    if current_user["role"] != "admin":
+        return error_response("Unauthorized", 403)
+    return get_task_stats()
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to Crimax Sports League Management Platform"}
\ No newline at end of file
@@ -0,0 +1,65 @@
+import hashlib
+import logging
+import os
+import random
+import time
+
+# Per-request INFO lines on the auth path (successful logins/auth checks etc.).
+# Warnings and errors are never sampled.
+AUTH_REQUEST_LOG = os.getenv("AUTH_REQUEST_LOG", "on").lower() not in ("0", "off", "false", "no")
+# Fraction of request lines kept (1.0 = all)
+AUTH_REQUEST_LOG_SAMPLE = float(os.getenv("AUTH_REQUEST_LOG_SAMPLE", "1.0"))
+# Max request lines per second per logger, 0 for no limit
+AUTH_REQUEST_LOG_RATE = int(os.getenv("AUTH_REQUEST_LOG_RATE", "20"))
+
+class redact:
+    """
+    Log argument that prints a short fingerprint of a token instead of the
+    token itself. The digest is only computed if the line is emitted.
+    """
+    __slots__ = ("token",)
+
+    def __init__(self, token: str):
+        self.token = token
+
+    def __str__(self):
+        if not self.token:
+            return "<none>"
+        return "<token " + hashlib.sha256(self.token.encode("utf-8")).hexdigest()[:8] + ">"
+
+class RequestLogger:
+    """
+    Wraps a logger for lines written on every request: they can be switched
+    off, sampled and rate-limited through the AUTH_REQUEST_LOG* settings.
+    Messages use %-style args, so nothing is formatted for dropped lines.
+    """
+    def __init__(self, logger: logging.Logger, enabled: bool = AUTH_REQUEST_LOG,
+                 sample: float = AUTH_REQUEST_LOG_SAMPLE, rate: int = AUTH_REQUEST_LOG_RATE):
+        self.logger = logger
+        self.enabled = enabled
+        self.sample = sample
+        self.rate = rate
+        self._window = 0
+        self._count = 0
+        self._suppressed = 0
+
+    def _allow(self) -> bool:
+        if not self.enabled or not self.logger.isEnabledFor(logging.INFO):
+            return False
+        if self.sample < 1.0 and random.random() >= self.sample:
+            return False
+        if self.rate:
+            window = int(time.monotonic())
+            if window != self._window:
+                if self._suppressed:
+                    self.logger.info("%d auth log line(s) suppressed by rate limit", self._suppressed)
+                self._window, self._count, self._suppressed = window, 0, 0
+            if self._count >= self.rate:
+                self._suppressed += 1
+                return False
+            self._count += 1
+        return True
+
+    def info(self, msg: str, *args):
+        if self._allow():
+            self.logger.info(msg, *args)
@@ -1,131 +1,250 @@
 import jwt
-import bcrypt
+import hashlib
 import logging
+import os
+import time
+import uuid
 from datetime import datetime, timedelta
-from modules.shared.db import get_db_connection
+from modules.shared.db import acquire_connection
+from modules.shared.cache import TTLCache
+from modules.shared.tasks import PeriodicTask
 from .models import UserCreate
+from .passwords import hash_password, verify_password
+from .log import RequestLogger
 
 logger = logging.getLogger("auth_manager")
+request_log = RequestLogger(logger)
 
 SECRET_KEY = "your-secret-key"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# How long a verified token -> user lookup is reused (never past the token's exp)
+AUTH_TOKEN_CACHE_TTL = float(os.getenv("AUTH_TOKEN_CACHE_TTL", "30"))
+# Seconds between incremental reloads of the in-memory blacklist
+AUTH_BLACKLIST_REFRESH_INTERVAL = float(os.getenv("AUTH_BLACKLIST_REFRESH_INTERVAL", "5"))
+# Seconds between sweeps of expired blacklist rows, and rows deleted per statement
+AUTH_BLACKLIST_SWEEP_INTERVAL = float(os.getenv("AUTH_BLACKLIST_SWEEP_INTERVAL", "300"))
+AUTH_BLACKLIST_SWEEP_BATCH = int(os.getenv("AUTH_BLACKLIST_SWEEP_BATCH", "1000"))
+
+# Keyed by a digest so raw tokens never end up in a shared cache backend
+_token_cache = TTLCache("auth_tokens", ttl=AUTH_TOKEN_CACHE_TTL)
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+def _blacklist_key(token: str, payload: dict = None) -> bytes:
+    """
+    Fixed-size key stored in token_blacklist: the digest of the jti claim,
+    or of the whole token for tokens issued before jti was added.
+    """
+    if payload is None:
+        payload = jwt.decode(token, options={"verify_signature": False})
+    jti = payload.get("jti")
+    return hashlib.sha256((f"jti:{jti}" if jti else token).encode("utf-8")).digest()
+
+class TokenBlacklist:
+    """
+    In-memory copy of the unexpired rows of token_blacklist (by digest, see
+    _blacklist_key), refreshed incrementally by created_at so the auth hot
+    path needs no query.
+    """
+    # Re-read this far behind the last refresh, for rows that commit late
+    OVERLAP = timedelta(seconds=60)
+
+    def __init__(self):
+        self._tokens = {}  # token_hash -> expires_at
+        # Database time of the last refresh. created_at is set by the
+        # database's NOW(), so the window must use that clock, not ours.
+        self._watermark = None
+
+    def add(self, token_hash: bytes, expires_at: datetime):
+        self._tokens[token_hash] = expires_at
+
+    def __contains__(self, token_hash: bytes):
+        expires_at = self._tokens.get(token_hash)
+        return expires_at is not None and expires_at > datetime.now()
+
+    def __len__(self):
+        return len(self._tokens)
+
+    async def refresh(self):
+        # clock.now is read in the same statement as the rows, so nothing
+        # created after it can have been left out of this refresh
+        async with acquire_connection() as conn:
+            if self._watermark is None:
+                rows = await conn.fetch("""
+                    SELECT clock.now, b.token_hash, b.expires_at
+                    FROM (SELECT LOCALTIMESTAMP AS now) clock
+                    LEFT JOIN token_blacklist b ON b.expires_at > NOW()
+                """)
+            else:
+                rows = await conn.fetch("""
+                    SELECT clock.now, b.token_hash, b.expires_at
+                    FROM (SELECT LOCALTIMESTAMP AS now) clock
+                    LEFT JOIN token_blacklist b ON b.created_at > $1 AND b.expires_at > NOW()
+                """, self._watermark - self.OVERLAP)
+        for row in rows:
+            if row["token_hash"] is not None:
+                self._tokens[row["token_hash"]] = row["expires_at"]
+        self._watermark = rows[0]["now"]
+        now = datetime.now()
+        for token_hash in [key for key, expires_at in self._tokens.items() if expires_at <= now]:
+            del self._tokens[token_hash]
+
+_blacklist = TokenBlacklist()
+blacklist_refresh_task = PeriodicTask("auth_blacklist_refresh", AUTH_BLACKLIST_REFRESH_INTERVAL, _blacklist.refresh)
+
+async def sweep_expired_blacklist():
+    """Delete expired blacklist rows in batches so no single statement holds locks for long"""
+    deleted = 0
+    while True:
+        async with acquire_connection() as conn:
+            result = await conn.execute("""
+                DELETE FROM token_blacklist
+                WHERE token_hash IN (
+                    SELECT token_hash FROM token_blacklist
+                    WHERE expires_at <= NOW()
+                    LIMIT $1
+                )
+            """, AUTH_BLACKLIST_SWEEP_BATCH)
+        count = int(result.split()[-1])
+        deleted += count
+        if count < AUTH_BLACKLIST_SWEEP_BATCH:
+            break
+    if deleted:
+        logger.info("Swept %d expired blacklisted token(s)", deleted)
+    return deleted
+
+blacklist_sweep_task = PeriodicTask("auth_blacklist_sweep", AUTH_BLACKLIST_SWEEP_INTERVAL, sweep_expired_blacklist)
+
 async def register_user(user: UserCreate):
-    logger.debug(f"Attempting to register user: username={user.username}, email={user.email}, role={user.role}")
-    conn = await get_db_connection()
-    try:
-        hashed_password = bcrypt.hashpw(user.password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-        logger.debug("Password hashed successfully for user registration.")
-        existing = await conn.fetchrow(
-            "SELECT user_id FROM users WHERE username = $1 OR email = $2", user.username, user.email
-        )
-        if existing:
-            logger.info(f"Registration failed: Username or email already exists for username={user.username}, email={user.email}")
-            return None
-        user_id = await conn.fetchval("""
-            INSERT INTO users (username, email, password, role)
-            VALUES ($1, $2, $3, $4) RETURNING user_id
-        """, user.username, user.email, hashed_password, user.role)
-        logger.info(f"User registered successfully: username={user.username}, user_id={user_id}")
-        return user_id
-    except Exception as e:
-        logger.error(f"Error during user registration: {e}", exc_info=True)
-        raise
-    finally:
-        await conn.close()
-        logger.debug("Database connection closed after register_user.")
+    logger.debug("Attempting to register user: username=%s, email=%s, role=%s", user.username, user.email, user.role)
+    # Hash before taking a connection so slow hashes don't hold the pool
+    hashed_password = await hash_password(user.password)
+    logger.debug("Password hashed successfully for user registration.")
+    async with acquire_connection() as conn:
+        try:
+            existing = await conn.fetchrow(
+                "SELECT user_id FROM users WHERE username = $1 OR email = $2", user.username, user.email
+            )
+            if existing:
+                request_log.info("Registration failed: Username or email already exists for username=%s, email=%s", user.username, user.email)
+                return None
+            user_id = await conn.fetchval("""
+                INSERT INTO users (username, email, password, role)
+                VALUES ($1, $2, $3, $4) RETURNING user_id
+            """, user.username, user.email, hashed_password, user.role)
+            request_log.info("User registered successfully: username=%s, user_id=%s", user.username, user_id)
+            return user_id
+        except Exception as e:
+            logger.error("Error during user registration: %s", e, exc_info=True)
+            raise
 
 async def authenticate_user(username: str = None, password: str = None, token: str = None):
-    logger.debug(f"Authenticating user. username={username}, token={'provided' if token else 'not provided'}")
-    conn = await get_db_connection()
+    logger.debug("Authenticating user. username=%s, token=%s", username, "provided" if token else "not provided")
+    if token:  # Authenticate via token
+        return await _authenticate_token(token)
     try:
-        if token:  # Authenticate via token
-            try:
-                payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-                username = payload.get("sub")
-                logger.debug(f"Decoded JWT token. Username from token: {username}")
-                if username is None:
-                    logger.warning("JWT token does not contain 'sub' (username).")
-                    return None
-                if await is_token_blacklisted(token):
-                    logger.warning("Token is blacklisted.")
-                    return None
-            except jwt.ExpiredSignatureError:
-                logger.warning("JWT token has expired.")
-                return None
-            except jwt.InvalidTokenError as e:
-                logger.warning(f"Invalid JWT token: {e}")
-                return None
-            user = await conn.fetchrow(
-                "SELECT user_id, username, email, role FROM users WHERE username = $1", username
-            )
-            if user:
-                logger.info(f"User authenticated via token: {username}")
-            else:
-                logger.warning(f"No user found for username from token: {username}")
-            return dict(user) if user else None
-        else:  # Authenticate via username/password
+        # Authenticate via username/password
+        async with acquire_connection() as conn:
             user = await conn.fetchrow(
                 "SELECT user_id, username, email, password, role FROM users WHERE username = $1", username
             )
-            if not user:
-                logger.warning(f"Authentication failed: No user found with username={username}")
-                return None
-            if not bcrypt.checkpw(password.encode('utf-8'), user["password"].encode('utf-8')):
-                logger.warning(f"Authentication failed: Incorrect password for username={username}")
-                return None
-            logger.info(f"User authenticated via username/password: {username}")
-            return {k: user[k] for k in ("user_id", "username", "email", "role")}
+        if not user:
+            logger.warning("Authentication failed: No user found with username=%s", username)
+            return None
+        # Checked after releasing the connection so slow hashes don't hold the pool
+        if not await verify_password(password, user["password"]):
+            logger.warning("Authentication failed: Incorrect password for username=%s", username)
+            return None
+        request_log.info("User authenticated via username/password: %s", username)
+        return {k: user[k] for k in ("user_id", "username", "email", "role")}
     except Exception as e:
-        logger.error(f"Error during authentication: {e}", exc_info=True)
+        logger.error("Error during authentication: %s", e, exc_info=True)
         raise
-    finally:
-        await conn.close()
-        logger.debug("Database connection closed after authenticate_user.")
+
+async def _authenticate_token(token: str):
+    """
+    Resolve a bearer token to its user. A recently verified token is served
+    from memory (checked against the in-memory blacklist); otherwise the JWT
+    is decoded and the user and blacklist are read with one query.
+    """
+    entry = await _token_cache.get_or_load(_token_key(token), lambda: _load_token_user(token))
+    # Never serve a cached lookup past the token's own expiry
+    if entry is None or entry["exp"] <= time.time():
+        return None
+    if bytes.fromhex(entry["blacklist_key"]) in _blacklist:
+        logger.warning("Token is blacklisted.")
+        return None
+    return entry["user"]
+
+async def _load_token_user(token: str):
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.ExpiredSignatureError:
+        logger.warning("JWT token has expired.")
+        return None
+    except jwt.InvalidTokenError as e:
+        logger.warning("Invalid JWT token: %s", e)
+        return None
+    username = payload.get("sub")
+    logger.debug("Decoded JWT token. Username from token: %s", username)
+    if username is None:
+        logger.warning("JWT token does not contain 'sub' (username).")
+        return None
+    blacklist_key = _blacklist_key(token, payload)
+
+    async with acquire_connection() as conn:
+        try:
+            user = await conn.fetchrow("""
+                SELECT user_id, username, email, role,
+                       EXISTS (SELECT 1 FROM token_blacklist WHERE token_hash = $2 AND expires_at > NOW()) AS blacklisted
+                FROM users WHERE username = $1
+            """, username, blacklist_key)
+        except Exception as e:
+            logger.error("Error during authentication: %s", e, exc_info=True)
+            raise
+    if not user:
+        logger.warning("No user found for username from token: %s", username)
+        return None
+    if user["blacklisted"]:
+        logger.warning("Token is blacklisted.")
+        return None
+    request_log.info("User authenticated via token: %s", username)
+    return {
+        "user": {k: user[k] for k in ("user_id", "username", "email", "role")},
+        "exp": payload["exp"],
+        # hex so the entry stays JSON-serializable for a shared cache backend
+        "blacklist_key": blacklist_key.hex(),
+    }
 
 def create_access_token(data: dict):
-    logger.debug(f"Creating access token for data: {data}")
+    logger.debug("Creating access token for data: %s", data)
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    # jti gives every token a short unique id, used as its blacklist key
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     token = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    logger.info(f"Access token created. Expires at: {expire.isoformat()}")
+    request_log.info("Access token created. Expires at: %s", expire)
     return token
 
 async def blacklist_token(token: str):
     logger.debug("Blacklisting token.")
-    conn = await get_db_connection()
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        expires_at = datetime.fromtimestamp(payload["exp"])
-        await conn.execute("""
-            INSERT INTO token_blacklist (token, expires_at)
-            VALUES ($1, $2)
-            ON CONFLICT (token) DO NOTHING
-        """, token, expires_at)
-        logger.info(f"Token blacklisted until {expires_at.isoformat()}")
-    except Exception as e:
-        logger.error(f"Error blacklisting token: {e}", exc_info=True)
-        raise
-    finally:
-        await conn.close()
-        logger.debug("Database connection closed after blacklist_token.")
-
-async def is_token_blacklisted(token: str):
-    logger.debug("Checking if token is blacklisted.")
-    conn = await get_db_connection()
-    try:
-        result = await conn.fetchrow(
-            "SELECT EXISTS (SELECT 1 FROM token_blacklist WHERE token = $1 AND expires_at > NOW())",
-            token
-        )
-        is_blacklisted = result["exists"]
-        logger.debug(f"Token blacklisted: {is_blacklisted}")
-        return is_blacklisted
-    except Exception as e:
-        logger.error(f"Error checking token blacklist: {e}", exc_info=True)
-        raise
-    finally:
-        await conn.close()
-        logger.debug("Database connection closed after is_token_blacklisted.")
\ No newline at end of file
+    async with acquire_connection() as conn:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            expires_at = datetime.fromtimestamp(payload["exp"])
+            token_hash = _blacklist_key(token, payload)
+            await conn.execute("""
+                INSERT INTO token_blacklist (token_hash, expires_at)
+                VALUES ($1, $2)
+                ON CONFLICT (token_hash) DO NOTHING
+            """, token_hash, expires_at)
+            _blacklist.add(token_hash, expires_at)
+            # Other workers drop their cached lookup of this token and re-check the table
+            await _token_cache.delete(_token_key(token))
+            request_log.info("Token blacklisted until %s", expires_at)
+        except Exception as e:
+            logger.error("Error blacklisting token: %s", e, exc_info=True)
+            raise
\ No newline at end of file
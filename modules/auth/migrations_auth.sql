@@ -0,0 +1,24 @@
+-- Lets workers reload the token blacklist incrementally
+ALTER TABLE token_blacklist ADD COLUMN IF NOT EXISTS created_at TIMESTAMP NOT NULL DEFAULT NOW();
+
+CREATE INDEX IF NOT EXISTS idx_token_blacklist_created ON token_blacklist (created_at);
+
+-- Store each entry as a 32-byte SHA-256 digest (of the jti claim, or of the
+-- whole token for tokens issued without one) instead of the full JWT text.
+-- Existing rows were keyed by the raw token, so they are digested in place.
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = 'token_blacklist' AND column_name = 'token'
+    ) THEN
+        DELETE FROM token_blacklist WHERE expires_at <= NOW();
+        ALTER TABLE token_blacklist ADD COLUMN token_hash BYTEA;
+        UPDATE token_blacklist SET token_hash = sha256(convert_to(token, 'UTF8'));
+        ALTER TABLE token_blacklist DROP COLUMN token;
+        ALTER TABLE token_blacklist ADD PRIMARY KEY (token_hash);
+    END IF;
+END $$;
+
+-- Supports the periodic sweep of expired entries
+CREATE INDEX IF NOT EXISTS idx_token_blacklist_expires ON token_blacklist (expires_at);
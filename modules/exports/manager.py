@@ -0,0 +1,215 @@
+import asyncio
+import csv
+import io
+import logging
+import os
+from datetime import date, datetime, time
+from decimal import Decimal
+from modules.shared.db import acquire_connection
+from modules.shared.response import dumps
+from modules.matches.manager import _MATCH_SORT
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched from the server-side cursor per round trip
+EXPORT_FETCH_ROWS = int(os.getenv("EXPORT_FETCH_ROWS", "1000"))
+# Encoded rows are sent in chunks of about this many bytes
+EXPORT_CHUNK_BYTES = int(os.getenv("EXPORT_CHUNK_BYTES", str(64 * 1024)))
+# Exports running at once; each holds a pooled connection until the client has read everything
+EXPORT_MAX_CONCURRENCY = int(os.getenv("EXPORT_MAX_CONCURRENCY", "2"))
+# Seconds to wait for a free export slot before giving up with a 503
+EXPORT_SLOT_TIMEOUT = float(os.getenv("EXPORT_SLOT_TIMEOUT", "10"))
+# Seconds one fetch may run, and seconds the transaction may sit idle while the
+# client reads; past either the server ends the export and its snapshot
+EXPORT_STATEMENT_TIMEOUT = float(os.getenv("EXPORT_STATEMENT_TIMEOUT", "30"))
+EXPORT_IDLE_TIMEOUT = float(os.getenv("EXPORT_IDLE_TIMEOUT", "60"))
+
+_export_slots = asyncio.Semaphore(EXPORT_MAX_CONCURRENCY)
+
+class ExportBusyError(Exception):
+    """No export slot freed up within EXPORT_SLOT_TIMEOUT"""
+
+# Export kind -> query (its select list is the column order of the output) and
+# the filters it accepts. Orders are total, so repeated exports line up; matches
+# follow the keyset indexes of migrations_pagination.sql.
+#   filters: query parameter -> SQL condition ($n is filled in by position)
+_KINDS = {
+    "matches": {
+        "query": f"""
+            SELECT
+                m.match_id,
+                m.season_id,
+                s.season_name,
+                l.league_name,
+                m.team1_id,
+                t1.team_name AS team1_name,
+                m.team2_id,
+                t2.team_name AS team2_name,
+                m.venue_id,
+                v.venue_name,
+                m.date,
+                m.time,
+                COALESCE(m.home_score, 0) AS home_score,
+                COALESCE(m.away_score, 0) AS away_score,
+                m.results->>'status' AS status,
+                m.results
+            FROM matches m
+            LEFT JOIN teams t1 ON m.team1_id = t1.team_id
+            LEFT JOIN teams t2 ON m.team2_id = t2.team_id
+            LEFT JOIN venues v ON m.venue_id = v.venue_id
+            LEFT JOIN seasons s ON m.season_id = s.season_id
+            LEFT JOIN leagues l ON s.league_id = l.league_id
+            {{where}}
+            ORDER BY {_MATCH_SORT}
+        """,
+        "filters": {"season_id": "m.season_id = ${}"},
+    },
+    "goals": {
+        "query": """
+            SELECT
+                mg.id AS goal_id,
+                mg.match_id,
+                m.season_id,
+                mg.player_id,
+                p.first_name || ' ' || p.last_name AS player_name,
+                mg.team_id,
+                t.team_name,
+                mg.minute,
+                mg.goal_type,
+                mg.created_at
+            FROM match_goals mg
+            JOIN matches m ON mg.match_id = m.match_id
+            LEFT JOIN players p ON mg.player_id = p.player_id
+            LEFT JOIN teams t ON mg.team_id = t.team_id
+            {where}
+            ORDER BY mg.match_id, mg.minute, mg.id
+        """,
+        "filters": {"season_id": "m.season_id = ${}"},
+    },
+    "standings": {
+        "query": """
+            SELECT
+                s.league_id,
+                l.league_name,
+                s.team_id,
+                t.team_name,
+                s.matches_played,
+                s.wins,
+                s.draws,
+                s.losses,
+                s.goals_for,
+                s.goals_against,
+                s.points
+            FROM standings s
+            JOIN leagues l ON s.league_id = l.league_id
+            JOIN teams t ON s.team_id = t.team_id
+            WHERE s.matches_played > 0 {and_where}
+            ORDER BY s.league_id, s.points DESC, (s.goals_for - s.goals_against) DESC, s.goals_for DESC, s.team_id
+        """,
+        # The table is kept per league, not per season
+        "filters": {"league_id": "s.league_id = ${}"},
+    },
+}
+
+EXPORT_KINDS = tuple(_KINDS)
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+def export_filters(kind: str):
+    return tuple(_KINDS[kind]["filters"])
+
+def _build_query(kind: str, filters: dict):
+    spec = _KINDS[kind]
+    conditions = []
+    params = []
+    for name, condition in spec["filters"].items():
+        if filters.get(name) is not None:
+            params.append(filters[name])
+            conditions.append(condition.format(len(params)))
+    where = " AND ".join(conditions)
+    query = spec["query"].format(
+        where=f"WHERE {where}" if where else "",
+        and_where=f"AND {where}" if where else "",
+    )
+    return query, params
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        # Same JSON text the importer accepts in a CSV cell
+        return dumps(value).decode("utf-8")
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+class _CsvEncoder:
+    def __init__(self):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+
+    def encode(self, values) -> bytes:
+        self._writer.writerow([_csv_value(value) for value in values])
+        line = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return line.encode("utf-8")
+
+async def export_rows(kind: str, fmt: str, **filters):
+    """
+    Yield the rows of one export as encoded chunks of about EXPORT_CHUNK_BYTES.
+    Rows come from a server-side cursor in a read-only repeatable-read
+    transaction, so memory stays flat and the export is one consistent
+    snapshot however long the client takes. The next rows are only fetched
+    once the previous chunk has been sent.
+    Raises ExportBusyError when no export slot frees up within
+    EXPORT_SLOT_TIMEOUT; statement and idle timeouts stop a stuck query or a
+    client that stops reading from holding the snapshot open.
+    """
+    if kind not in _KINDS:
+        raise ValueError(f"Unknown export kind '{kind}'")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{fmt}' (use {' or '.join(EXPORT_FORMATS)})")
+    query, params = _build_query(kind, filters)
+
+    try:
+        await asyncio.wait_for(_export_slots.acquire(), EXPORT_SLOT_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise ExportBusyError(f"All {EXPORT_MAX_CONCURRENCY} export slot(s) are busy, try again later")
+
+    rows = 0
+    try:
+        async with acquire_connection() as conn:
+            async with conn.transaction(isolation="repeatable_read", readonly=True):
+                await conn.execute(f"""
+                    SET LOCAL statement_timeout = {int(EXPORT_STATEMENT_TIMEOUT * 1000)};
+                    SET LOCAL idle_in_transaction_session_timeout = {int(EXPORT_IDLE_TIMEOUT * 1000)};
+                """)
+                statement = await conn.prepare(query)
+                chunk = []
+                size = 0
+                if fmt == "csv":
+                    csv_encoder = _CsvEncoder()
+                    encode = lambda record: csv_encoder.encode(record.values())
+                    # Header from the statement, so an empty export still has one
+                    chunk.append(csv_encoder.encode(attribute.name for attribute in statement.get_attributes()))
+                else:
+                    encode = lambda record: dumps(dict(record)) + b"\n"
+                async for record in statement.cursor(*params, prefetch=EXPORT_FETCH_ROWS):
+                    line = encode(record)
+                    chunk.append(line)
+                    size += len(line)
+                    rows += 1
+                    if size >= EXPORT_CHUNK_BYTES:
+                        yield b"".join(chunk)
+                        chunk = []
+                        size = 0
+                if chunk:
+                    yield b"".join(chunk)
+    finally:
+        _export_slots.release()
+    logger.info(f"📤 Exported {rows} {kind} row(s) as {fmt}")
@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from .manager import EXPORT_FORMATS, EXPORT_KINDS, ExportBusyError, export_filters, export_rows
+from modules.shared.response import error_response
+from modules.auth.router import get_current_user
+
+router = APIRouter()
+
+async def _prepend(first: bytes, chunks):
+    try:
+        yield first
+        async for chunk in chunks:
+            yield chunk
+    finally:
+        # Hands the export slot and connection back if the client goes away early
+        await chunks.aclose()
+
+@router.get("/{kind}", dependencies=[Depends(get_current_user)])
+async def export(kind: str, format: str = "ndjson", season_id: int = None, league_id: int = None):
+    """
+    Stream every match, goal or standings row as NDJSON (default) or CSV.
+    Matches and goals filter by season_id, standings by league_id.
+    Answers 503 when every export slot stays busy for EXPORT_SLOT_TIMEOUT.
+    """
+    if kind not in EXPORT_KINDS:
+        return error_response(f"Unknown export kind (use one of: {', '.join(EXPORT_KINDS)})", 404)
+    if format not in EXPORT_FORMATS:
+        return error_response(f"Unsupported export format (use one of: {', '.join(EXPORT_FORMATS)})", 400)
+    filters = {"season_id": season_id, "league_id": league_id}
+    unsupported = [name for name, value in filters.items() if value is not None and name not in export_filters(kind)]
+    if unsupported:
+        return error_response(f"{kind} exports can't be filtered by {', '.join(unsupported)}", 400)
+
+    chunks = export_rows(kind, format, **filters)
+    # Wait for a slot and run the query before the response starts, so a busy
+    # server can still answer with a status code
+    try:
+        first = await chunks.__anext__()
+    except ExportBusyError as e:
+        return error_response(str(e), 503)
+    except StopAsyncIteration:
+        first = b""
+
+    suffix = "".join(f"-{name.split('_')[0]}-{value}" for name, value in filters.items() if value is not None)
+    return StreamingResponse(
+        _prepend(first, chunks),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{kind}{suffix}.{format}"'},
+    )
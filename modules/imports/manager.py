@@ -0,0 +1,412 @@
+import csv
+import json
+import logging
+import os
+from datetime import date, time
+from modules.shared.db import acquire_connection
+from modules.shared.cache import invalidate_caches
+from modules.players.manager import promoted_columns
+
+logger = logging.getLogger(__name__)
+
+# Largest import accepted in one request / CLI run
+IMPORT_MAX_ROWS = int(os.getenv("IMPORT_MAX_ROWS", "100000"))
+# Per-row errors returned in the summary (the failed count is always exact)
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))
+# Imports writing at least this many rows re-ANALYZE the target table, so the
+# trigger and query plans that follow see the new row counts
+IMPORT_ANALYZE_ROWS = int(os.getenv("IMPORT_ANALYZE_ROWS", "1000"))
+
+def _int(value):
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError("expected an integer")
+    value = int(value)
+    if not -2**31 <= value < 2**31:
+        raise ValueError("out of range")
+    return value
+
+def _text(max_length: int = None):
+    def convert(value):
+        value = str(value)
+        if max_length is not None and len(value) > max_length:
+            raise ValueError(f"longer than {max_length} characters")
+        return value
+    return convert
+
+def _date(value):
+    return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+def _time(value):
+    return value if isinstance(value, time) else time.fromisoformat(str(value))
+
+def _json(value):
+    # CSV cells carry JSON text, NDJSON fields are already decoded
+    if isinstance(value, str):
+        value = json.loads(value)
+    if not isinstance(value, dict):
+        raise ValueError("expected a JSON object")
+    return value
+
+def _player_columns(values: dict):
+    position, squad_number = promoted_columns(values["statistics"])
+    return {"position": position, "squad_number": squad_number}
+
+# Import kinds. The first column is the primary key: rows that carry it
+# update that row (empty fields keep their value), rows without it are
+# inserted and must have every required column.
+#   columns:    (name, staging SQL type, converter)
+#   references: column -> (table, key) checked set-wise before writing
+#   checks:     (condition on staged row s / existing row t, message)
+#   derived:    staged columns computed from another column by derive()
+_KINDS = {
+    "teams": {
+        "table": "teams",
+        "columns": [
+            ("team_id", "INT", _int),
+            ("league_id", "INT", _int),
+            ("division_id", "INT", _int),
+            ("team_name", "TEXT", _text(100)),
+            ("logo", "TEXT", _text(255)),
+            ("contact_info", "JSONB", _json),
+        ],
+        "required": ("league_id", "team_name"),
+        "references": {
+            "league_id": ("leagues", "league_id"),
+            "division_id": ("divisions", "division_id"),
+        },
+        "caches": ("teams",),
+    },
+    "players": {
+        "table": "players",
+        "columns": [
+            ("player_id", "INT", _int),
+            ("team_id", "INT", _int),
+            ("first_name", "TEXT", _text(50)),
+            ("last_name", "TEXT", _text(50)),
+            ("photo", "TEXT", _text(255)),
+            ("statistics", "JSONB", _json),
+        ],
+        "required": ("team_id", "first_name", "last_name"),
+        "references": {"team_id": ("teams", "team_id")},
+        # Same sync as create_player/update_player
+        "derived": {"position": ("statistics", "TEXT"), "squad_number": ("statistics", "INT")},
+        "derive": _player_columns,
+    },
+    "matches": {
+        "table": "matches",
+        "columns": [
+            ("match_id", "INT", _int),
+            ("season_id", "INT", _int),
+            ("team1_id", "INT", _int),
+            ("team2_id", "INT", _int),
+            ("venue_id", "INT", _int),
+            ("date", "DATE", _date),
+            ("time", "TIME", _time),
+            ("results", "JSONB", _json),
+        ],
+        "required": ("season_id", "team1_id", "team2_id", "date", "time"),
+        "references": {
+            "season_id": ("seasons", "season_id"),
+            "team1_id": ("teams", "team_id"),
+            "team2_id": ("teams", "team_id"),
+            "venue_id": ("venues", "venue_id"),
+        },
+    },
+    "goals": {
+        "table": "match_goals",
+        "columns": [
+            ("id", "INT", _int),
+            ("match_id", "INT", _int),
+            ("player_id", "INT", _int),
+            ("team_id", "INT", _int),
+            ("minute", "INT", _int),
+            ("goal_type", "TEXT", _text(50)),
+        ],
+        "required": ("match_id", "player_id", "team_id", "minute"),
+        "references": {
+            "match_id": ("matches", "match_id"),
+            "player_id": ("players", "player_id"),
+            "team_id": ("teams", "team_id"),
+        },
+        "checks": [
+            ("COALESCE(s.minute, t.minute) NOT BETWEEN 0 AND 120", "minute must be between 0 and 120"),
+            ("""NOT EXISTS (
+                    SELECT 1 FROM matches m
+                    WHERE m.match_id = COALESCE(s.match_id, t.match_id)
+                      AND COALESCE(s.team_id, t.team_id) IN (m.team1_id, m.team2_id)
+                )""", "team_id is not playing in this match"),
+        ],
+    },
+}
+
+IMPORT_KINDS = tuple(_KINDS)
+
+class _Rejected(Exception):
+    """Raised inside the import transaction to roll back an atomic import"""
+
+async def _iterate(lines):
+    """Lines from a file or list, or from an async source such as a request body"""
+    if hasattr(lines, "__aiter__"):
+        async for line in lines:
+            yield line
+    else:
+        for line in lines:
+            yield line
+
+async def _csv_rows(lines):
+    """
+    Yield (line number, fields) per CSV record. Lines are joined while a quoted
+    field is still open (odd number of quotes), so fields may span lines.
+    """
+    text, line_no = "", 0
+    async for line in _iterate(lines):
+        line_no += 1
+        text += line
+        if text.count('"') % 2:
+            continue
+        yield line_no, next(csv.reader([text]), [])
+        text = ""
+    if text:
+        yield line_no, ValueError("unterminated quoted field")
+
+async def parse_records(lines, fmt: str):
+    """
+    Yield (row number, record dict) from CSV (header row required) or NDJSON
+    lines as they are read. Row numbers are line numbers, so errors point into
+    the source.
+    """
+    if fmt == "csv":
+        header = None
+        async for line_no, fields in _csv_rows(lines):
+            if isinstance(fields, Exception):
+                yield line_no, fields
+            elif not fields:
+                continue  # blank line
+            elif header is None:
+                header = fields
+            elif len(fields) > len(header):
+                yield line_no, ValueError("more fields than header columns")
+            else:
+                yield line_no, {key: value for key, value in zip(header, fields) if value != ""}
+    elif fmt == "ndjson":
+        line_no = 0
+        async for line in _iterate(lines):
+            line_no += 1
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_no, ValueError(f"invalid JSON: {e}")
+                continue
+            if not isinstance(record, dict):
+                yield line_no, ValueError("expected a JSON object")
+                continue
+            yield line_no, {key: value for key, value in record.items() if value is not None}
+    else:
+        raise ValueError(f"Unsupported import format '{fmt}' (use csv or ndjson)")
+
+def detect_format(content_type: str = None, first_line: str = None) -> str:
+    content_type = (content_type or "").lower()
+    if "csv" in content_type:
+        return "csv"
+    if "json" in content_type:
+        return "ndjson"
+    return "ndjson" if (first_line or "").lstrip().startswith("{") else "csv"
+
+def _convert(spec: dict, record: dict):
+    """Staging values for one record, or ValueError describing what is wrong"""
+    names = {name for name, _, _ in spec["columns"]}
+    unknown = sorted(set(record) - names)
+    if unknown:
+        raise ValueError(f"unknown column(s): {', '.join(unknown)}")
+    values = {}
+    for name, _, convert in spec["columns"]:
+        value = record.get(name)
+        try:
+            values[name] = convert(value) if value is not None else None
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"{name}: {e}")
+    key = spec["columns"][0][0]
+    if values[key] is None:
+        missing = [name for name in spec["required"] if values[name] is None]
+        if missing:
+            raise ValueError(f"missing required column(s): {', '.join(missing)}")
+    if "derive" in spec:
+        values.update(spec["derive"](values))
+    row = []
+    for name, sql_type in _staged_columns(spec):
+        value = values[name]
+        row.append(json.dumps(value) if sql_type == "JSONB" and value is not None else value)
+    return row
+
+def _staged_columns(spec: dict):
+    columns = [(name, sql_type) for name, sql_type, _ in spec["columns"]]
+    columns += [(name, sql_type) for name, (_, sql_type) in spec.get("derived", {}).items()]
+    return columns
+
+async def _validate(conn, spec: dict, stage: str):
+    """Set-wise checks on the staged rows; returns per-row errors"""
+    table = spec["table"]
+    key = spec["columns"][0][0]
+    queries = [
+        (f"""
+            SELECT s.row_no, format('unknown {key} %s', s.{key}) AS error
+            FROM {stage} s
+            WHERE s.{key} IS NOT NULL AND NOT EXISTS (SELECT 1 FROM {table} t WHERE t.{key} = s.{key})
+        """, ),
+        (f"""
+            SELECT row_no, format('{key} %s appears again on a later row', {key}) AS error
+            FROM (
+                SELECT row_no, {key}, row_number() OVER (PARTITION BY {key} ORDER BY row_no DESC) AS later
+                FROM {stage} WHERE {key} IS NOT NULL
+            ) d
+            WHERE later > 1
+        """, ),
+    ]
+    for column, (ref_table, ref_key) in spec.get("references", {}).items():
+        queries.append((f"""
+            SELECT s.row_no, format('unknown {column} %s', s.{column}) AS error
+            FROM {stage} s
+            WHERE s.{column} IS NOT NULL
+              AND NOT EXISTS (SELECT 1 FROM {ref_table} r WHERE r.{ref_key} = s.{column})
+        """, ))
+    for condition, message in spec.get("checks", []):
+        queries.append((f"""
+            SELECT s.row_no, $1::text AS error
+            FROM {stage} s
+            LEFT JOIN {table} t ON t.{key} = s.{key}
+            WHERE {condition}
+        """, message))
+
+    errors = []
+    for query, *args in queries:
+        errors.extend({"row": row["row_no"], "error": row["error"]} for row in await conn.fetch(query, *args))
+    if errors:
+        await conn.execute(f"DELETE FROM {stage} WHERE row_no = ANY($1::int[])", [error["row"] for error in errors])
+    return errors
+
+async def _upsert(conn, spec: dict, stage: str):
+    """Update rows that name an existing key, insert the rest; returns (inserted, updated)"""
+    table = spec["table"]
+    key = spec["columns"][0][0]
+    columns = _staged_columns(spec)[1:]
+    derived = spec.get("derived", {})
+
+    def staged(name, sql_type):
+        return f"s.{name}::jsonb" if sql_type == "JSONB" else f"s.{name}"
+
+    assignments = []
+    for name, sql_type in columns:
+        if name in derived:
+            # Derived columns follow their source, like the single-row update
+            assignments.append(f"{name} = CASE WHEN s.{derived[name][0]} IS NULL THEN t.{name} ELSE s.{name} END")
+        else:
+            assignments.append(f"{name} = COALESCE({staged(name, sql_type)}, t.{name})")
+    result = await conn.execute(f"""
+        UPDATE {table} t
+        SET {", ".join(assignments)}
+        FROM {stage} s
+        WHERE s.{key} IS NOT NULL AND t.{key} = s.{key}
+    """)
+    updated = int(result.split()[-1])
+
+    # Columns left empty get the table's default (e.g. goal_type 'regular'),
+    # not the NULL that copying them over would store
+    defaults = dict(await conn.fetch("""
+        SELECT a.attname, pg_get_expr(d.adbin, d.adrelid)
+        FROM pg_attrdef d
+        JOIN pg_attribute a ON a.attrelid = d.adrelid AND a.attnum = d.adnum
+        WHERE d.adrelid = $1::regclass
+    """, table))
+
+    def inserted_value(name, sql_type):
+        if name in defaults:
+            return f"COALESCE({staged(name, sql_type)}, {defaults[name]})"
+        return staged(name, sql_type)
+
+    names = ", ".join(name for name, _ in columns)
+    result = await conn.execute(f"""
+        INSERT INTO {table} ({names})
+        SELECT {", ".join(inserted_value(name, sql_type) for name, sql_type in columns)}
+        FROM {stage} s
+        WHERE s.{key} IS NULL
+        ORDER BY s.row_no
+    """)
+    inserted = int(result.split()[-1])
+    return inserted, updated
+
+async def import_records(conn, kind: str, records, atomic: bool = False):
+    """
+    Stream (row number, record) pairs from an async iterable into a temp
+    staging table with COPY, validate them set-wise and upsert the valid ones
+    in one transaction. Invalid rows are reported and skipped; with atomic,
+    any invalid row rolls the whole import back.
+    """
+    spec = _KINDS.get(kind)
+    if spec is None:
+        raise ValueError(f"Unknown import kind '{kind}'")
+    staged_columns = _staged_columns(spec)
+
+    errors = []
+    received = staged = 0
+
+    async def staging_rows():
+        nonlocal received, staged
+        async for row_no, record in records:
+            received += 1
+            if received > IMPORT_MAX_ROWS:
+                raise ValueError(f"Imports are limited to {IMPORT_MAX_ROWS} rows")
+            try:
+                if isinstance(record, Exception):
+                    raise record
+                row = [row_no, *_convert(spec, record)]
+            except ValueError as e:
+                errors.append({"row": row_no, "error": str(e)})
+                continue
+            staged += 1
+            yield row
+
+    stage = f"_import_{kind}"
+    inserted = updated = 0
+    committed = False
+    try:
+        async with conn.transaction():
+            column_defs = ", ".join(
+                f"{name} {'TEXT' if sql_type == 'JSONB' else sql_type}" for name, sql_type in staged_columns
+            )
+            await conn.execute(f"CREATE TEMP TABLE {stage} (row_no INT PRIMARY KEY, {column_defs}) ON COMMIT DROP")
+            await conn.copy_records_to_table(
+                stage, records=staging_rows(), columns=["row_no", *(name for name, _ in staged_columns)]
+            )
+            if staged:
+                # Temp tables are never auto-analyzed
+                await conn.execute(f"ANALYZE {stage}")
+            errors.extend(await _validate(conn, spec, stage))
+            if atomic and errors:
+                raise _Rejected()
+            inserted, updated = await _upsert(conn, spec, stage)
+        committed = True
+    except _Rejected:
+        pass
+
+    if committed and inserted + updated >= IMPORT_ANALYZE_ROWS:
+        await conn.execute(f"ANALYZE {spec['table']}")
+    if committed and (inserted or updated) and spec.get("caches"):
+        await invalidate_caches(*spec["caches"])
+    errors.sort(key=lambda error: error["row"])
+    logger.info(f"📥 Imported {kind}: {inserted} inserted, {updated} updated, {len(errors)} error(s)")
+    return {
+        "kind": kind,
+        "received": received,
+        "inserted": inserted,
+        "updated": updated,
+        "failed": len({error["row"] for error in errors}),
+        "committed": committed,
+        "errors": errors[:IMPORT_MAX_ERRORS],
+        "errors_truncated": len(errors) > IMPORT_MAX_ERRORS,
+    }
+
+async def import_data(kind: str, records, atomic: bool = False):
+    async with acquire_connection() as conn:
+        return await import_records(conn, kind, records, atomic)
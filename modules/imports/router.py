@@ -0,0 +1,82 @@
+import os
+from fastapi import APIRouter, Depends, Request
+from .manager import IMPORT_KINDS, detect_format, import_data, parse_records
+from modules.shared.response import success_response, error_response
+from modules.auth.router import get_current_user
+
+# Largest request body accepted by the import endpoints
+IMPORT_MAX_BYTES = int(os.getenv("IMPORT_MAX_BYTES", str(50 * 1024 * 1024)))
+
+router = APIRouter()
+
+class _TooLarge(Exception):
+    pass
+
+async def _body_lines(request: Request):
+    """
+    Yield the streamed request body line by line as it arrives (line endings
+    kept for csv). Lines end at "\n" only: JSON strings may hold U+2028 and
+    other separators unescaped. A "\n" byte never occurs inside a multi-byte
+    UTF-8 character, so each line decodes on its own.
+    """
+    buffer = bytearray()
+    encoding = "utf-8-sig"  # drops a BOM from the first line only
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > IMPORT_MAX_BYTES:
+            raise _TooLarge()
+        # Only the new bytes can hold the next "\n"
+        start, scan_from = 0, len(buffer)
+        buffer += chunk
+        while True:
+            end = buffer.find(b"\n", scan_from)
+            if end == -1:
+                break
+            yield buffer[start:end + 1].decode(encoding)
+            encoding = "utf-8"
+            start = scan_from = end + 1
+        del buffer[:start]
+    if buffer:
+        yield buffer.decode(encoding)
+
+async def _prepend(line: str, lines):
+    yield line
+    async for line in lines:
+        yield line
+
+@router.post("/{kind}", dependencies=[Depends(get_current_user)])
+async def import_rows(
+    kind: str,
+    request: Request,
+    format: str = None,
+    atomic: bool = False,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Bulk import teams, players, matches or goals from a CSV (with header) or
+    NDJSON body. Rows with a primary key update that row, others are
+    inserted. Returns counts and per-row errors; with atomic=true nothing is
+    written unless every row is valid.
+    """
+    if current_user["role"] != "admin":
+        return error_response("Unauthorized", 403)
+    if kind not in IMPORT_KINDS:
+        return error_response(f"Unknown import kind (use one of: {', '.join(IMPORT_KINDS)})", 404)
+    # Rows are parsed and copied into the database while the body streams in
+    lines = _body_lines(request)
+    try:
+        try:
+            first_line = await lines.__anext__()
+            lines = _prepend(first_line, lines)
+        except StopAsyncIteration:
+            first_line = None
+        fmt = format or detect_format(request.headers.get("content-type"), first_line)
+        result = await import_data(kind, parse_records(lines, fmt), atomic)
+    except _TooLarge:
+        return error_response(f"Import body is larger than {IMPORT_MAX_BYTES} bytes", 413)
+    except UnicodeDecodeError:
+        return error_response("Import body must be UTF-8", 400)
+    except ValueError as e:
+        return error_response(str(e), 400)
+    return success_response(result)
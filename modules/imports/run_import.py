@@ -0,0 +1,33 @@
+import asyncio
+import asyncpg
+import sys
+from modules.shared.db import DATABASE_URL
+from .manager import IMPORT_KINDS, detect_format, import_records, parse_records
+
+async def run_import(kind: str, path: str, atomic: bool = False):
+    """Bulk import a CSV/NDJSON file (run as: python -m modules.imports.run_import <kind> <file> [--atomic])"""
+    conn = await asyncpg.connect(DATABASE_URL)
+    
+    try:
+        with open(path, newline="", encoding="utf-8-sig") as source:
+            first_line = source.readline()
+            source.seek(0)
+            fmt = "csv" if path.endswith(".csv") else detect_format(first_line=first_line)
+            result = await import_records(conn, kind, parse_records(source, fmt), atomic)
+        status = "✅" if result["committed"] else "❌"
+        print(f"{status} Import of {kind}: {result['received']} received, {result['inserted']} inserted, "
+              f"{result['updated']} updated, {result['failed']} failed")
+        for error in result["errors"][:20]:
+            print(f"   line {error['row']}: {error['error']}")
+        
+    except Exception as e:
+        print(f"❌ Import failed: {e}")
+    finally:
+        await conn.close()
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--atomic"]
+    if len(args) != 2 or args[0] not in IMPORT_KINDS:
+        print(f"Usage: python -m modules.imports.run_import <{'|'.join(IMPORT_KINDS)}> <file> [--atomic]")
+        sys.exit(1)
+    asyncio.run(run_import(args[0], args[1], "--atomic" in sys.argv[1:]))
@@ -1,59 +1,44 @@
-from modules.shared.db import get_db_connection
+from modules.shared.db import acquire_connection
+from modules.shared.cache import TTLCache, invalidate_caches
 from .models import LeagueCreate, LeagueUpdate
-import json
+
+_cache = TTLCache("leagues")
 
 async def get_leagues():
-    conn = await get_db_connection()
-    try:
-        leagues = await conn.fetch("SELECT * FROM leagues")
-        result = []
-        for league in leagues:
-            league_dict = dict(league)
-            # Parse settings JSON string to dict
-            if league_dict.get('settings'):
-                try:
-                    league_dict['settings'] = json.loads(league_dict['settings'])
-                except (json.JSONDecodeError, TypeError):
-                    league_dict['settings'] = None
-            result.append(league_dict)
-        return result
-    finally:
-        await conn.close()
+    return await _cache.get_or_load("all", _fetch_leagues)
 
 async def get_league_by_id(league_id: int):
-    conn = await get_db_connection()
-    try:
+    return await _cache.get_or_load(("id", league_id), lambda: _fetch_league_by_id(league_id))
+
+async def _invalidate():
+    await _cache.invalidate()
+    # Seasons are listed with their league name
+    await invalidate_caches("seasons")
+
+async def _fetch_leagues():
+    async with acquire_connection() as conn:
+        leagues = await conn.fetch("SELECT * FROM leagues")
+        return [dict(league) for league in leagues]
+
+async def _fetch_league_by_id(league_id: int):
+    async with acquire_connection() as conn:
         league = await conn.fetchrow("SELECT * FROM leagues WHERE league_id = $1", league_id)
-        if league:
-            league_dict = dict(league)
-            # Parse settings JSON string to dict
-            if league_dict.get('settings'):
-                try:
-                    league_dict['settings'] = json.loads(league_dict['settings'])
-                except (json.JSONDecodeError, TypeError):
-                    league_dict['settings'] = None
-            return league_dict
-        return None
-    finally:
-        await conn.close()
+        return dict(league) if league else None
 
 async def create_league(league: LeagueCreate):
-    conn = await get_db_connection()
-    settings = json.dumps(league.settings) if league.settings else None
+    settings = league.settings or None
 
-    try:
+    async with acquire_connection() as conn:
         league_id = await conn.fetchval("""
             INSERT INTO leagues (league_name, description, rules, settings)
             VALUES ($1, $2, $3, $4) RETURNING league_id
         """, league.league_name, league.description, league.rules, settings)
+        await _invalidate()
         return league_id
-    finally:
-        await conn.close()
 
 async def update_league(league_id: int, league: LeagueUpdate):
-    conn = await get_db_connection()
-    settings = json.dumps(league.settings) if league.settings else None
-    try:
+    settings = league.settings or None
+    async with acquire_connection() as conn:
         result = await conn.execute("""
             UPDATE leagues 
             SET league_name = COALESCE($2, league_name),
@@ -62,14 +47,11 @@ async def update_league(league_id: int, league: LeagueUpdate):
                 settings = COALESCE($5, settings)
             WHERE league_id = $1
         """, league_id, league.league_name, league.description, league.rules, settings)
+        await _invalidate()
         return result == "UPDATE 1"
-    finally:
-        await conn.close()
 
 async def delete_league(league_id: int):
-    conn = await get_db_connection()
-    try:
+    async with acquire_connection() as conn:
         result = await conn.execute("DELETE FROM leagues WHERE league_id = $1", league_id)
-        return result == "DELETE 1"
-    finally:
-        await conn.close()
\ No newline at end of file
+        await _invalidate()
+        return result == "DELETE 1"
\ No newline at end of file
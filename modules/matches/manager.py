@@ -1,41 +1,66 @@
-from modules.shared.db import get_db_connection
-from .models import MatchCreate, MatchUpdate, MatchStatistics, UpdateMatchScore
-import json
+from modules.shared.db import acquire_connection
+from modules.shared.pagination import clamp_limit, decode_cursor, nullable, page
+from datetime import date, time
+from typing import List
+from .models import MatchCreate, MatchUpdate, MatchStatistics, UpdateMatchScore, GoalEvent
+
+_MATCH_SELECT = """
+    SELECT 
+        m.match_id,
+        m.season_id,
+        m.team1_id,
+        t1.team_name as team1_name,
+        m.team2_id,
+        t2.team_name as team2_name,
+        m.venue_id,
+        v.venue_name,
+        m.date,
+        m.time,
+        m.results,
+        s.season_name,
+        l.league_name,
+        COALESCE(m.home_score, 0) as home_goals,
+        COALESCE(m.away_score, 0) as away_goals
+    FROM matches m
+    LEFT JOIN teams t1 ON m.team1_id = t1.team_id
+    LEFT JOIN teams t2 ON m.team2_id = t2.team_id
+    LEFT JOIN venues v ON m.venue_id = v.venue_id
+    LEFT JOIN seasons s ON m.season_id = s.season_id
+    LEFT JOIN leagues l ON s.league_id = l.league_id
+"""
+
+# Keyset sort key; matches the expression index in migrations_pagination.sql
+_MATCH_SORT = "COALESCE(m.date, '-infinity'::date), COALESCE(m.time, '00:00'::time), m.match_id"
+
+def _format_match(match):
+    results = match["results"]
+    return {
+        "match_id": match["match_id"],
+        "season_id": match["season_id"],
+        "season_name": match["season_name"],
+        "league_name": match["league_name"],
+        "team1_id": match["team1_id"],
+        "team1_name": match["team1_name"],
+        "team2_id": match["team2_id"],
+        "team2_name": match["team2_name"],
+        "venue_id": match["venue_id"],
+        "venue_name": match["venue_name"],
+        "date": match["date"].isoformat() if match["date"] else None,
+        "time": match["time"].isoformat() if match["time"] else None,
+        "results": results,
+        "home_score": match["home_goals"],  # Kept in sync with match_goals by trigger
+        "away_score": match["away_goals"],  # Kept in sync with match_goals by trigger
+        "status": results.get("status") if results else None
+    }
+
+def _match_sort_key(match):
+    # NULL date/time stay NULL; get_matches_page applies _MATCH_SORT's COALESCE to them
+    return (match["date"], match["time"], match["match_id"])
 
 async def get_matches(season_id: int = None):
-    conn = await get_db_connection()
-    try:
+    async with acquire_connection() as conn:
         # Build query with optional season filter, including goal counts
-        query = """
-            SELECT 
-                m.match_id,
-                m.season_id,
-                m.team1_id,
-                t1.team_name as team1_name,
-                m.team2_id,
-                t2.team_name as team2_name,
-                m.venue_id,
-                v.venue_name,
-                m.date,
-                m.time,
-                m.results,
-                s.season_name,
-                l.league_name,
-                COALESCE(
-                    (SELECT COUNT(*) FROM match_goals WHERE match_id = m.match_id AND team_id = m.team1_id),
-                    0
-                ) as home_goals,
-                COALESCE(
-                    (SELECT COUNT(*) FROM match_goals WHERE match_id = m.match_id AND team_id = m.team2_id),
-                    0
-                ) as away_goals
-            FROM matches m
-            LEFT JOIN teams t1 ON m.team1_id = t1.team_id
-            LEFT JOIN teams t2 ON m.team2_id = t2.team_id
-            LEFT JOIN venues v ON m.venue_id = v.venue_id
-            LEFT JOIN seasons s ON m.season_id = s.season_id
-            LEFT JOIN leagues l ON s.league_id = l.league_id
-        """
+        query = _MATCH_SELECT
         
         # Add WHERE clause if season_id is provided
         if season_id is not None:
@@ -44,106 +69,50 @@ async def get_matches(season_id: int = None):
         else:
             matches = await conn.fetch(query)
             
-        return [
-            {
-                "match_id": match["match_id"],
-                "season_id": match["season_id"],
-                "season_name": match["season_name"],
-                "league_name": match["league_name"],
-                "team1_id": match["team1_id"],
-                "team1_name": match["team1_name"],
-                "team2_id": match["team2_id"],
-                "team2_name": match["team2_name"],
-                "venue_id": match["venue_id"],
-                "venue_name": match["venue_name"],
-                "date": match["date"].isoformat() if match["date"] else None,
-                "time": match["time"].isoformat() if match["time"] else None,
-                "results": (results := json.loads(match["results"]) if match["results"] else None),
-                "home_score": match["home_goals"],  # Calculated from match_goals table
-                "away_score": match["away_goals"],  # Calculated from match_goals table
-                "status": results.get("status") if results else None
-            }
-            for match in matches
-        ]
-    finally:
-        await conn.close()
+        return [_format_match(match) for match in matches]
 
-async def get_match_by_id(match_id: int):
-    conn = await get_db_connection()
-    try:
-        match = await conn.fetchrow("""
-            SELECT 
-                m.match_id,
-                m.season_id,
-                m.team1_id,
-                t1.team_name as team1_name,
-                m.team2_id,
-                t2.team_name as team2_name,
-                m.venue_id,
-                v.venue_name,
-                m.date,
-                m.time,
-                m.results,
-                s.season_name,
-                l.league_name,
-                COALESCE(
-                    (SELECT COUNT(*) FROM match_goals WHERE match_id = m.match_id AND team_id = m.team1_id),
-                    0
-                ) as home_goals,
-                COALESCE(
-                    (SELECT COUNT(*) FROM match_goals WHERE match_id = m.match_id AND team_id = m.team2_id),
-                    0
-                ) as away_goals
-            FROM matches m
-            LEFT JOIN teams t1 ON m.team1_id = t1.team_id
-            LEFT JOIN teams t2 ON m.team2_id = t2.team_id
-            LEFT JOIN venues v ON m.venue_id = v.venue_id
-            LEFT JOIN seasons s ON m.season_id = s.season_id
-            LEFT JOIN leagues l ON s.league_id = l.league_id
-            WHERE m.match_id = $1
-        """, match_id)
+async def get_matches_page(season_id: int = None, cursor: str = None, limit: int = None):
+    """One page of matches ordered by date, time and id"""
+    limit = clamp_limit(limit)
+    conditions = []
+    params = []
+    if season_id is not None:
+        params.append(season_id)
+        conditions.append(f"m.season_id = ${len(params)}")
+    if cursor:
+        after_date, after_time, after_id = decode_cursor(
+            cursor, nullable(date.fromisoformat), nullable(time.fromisoformat), int
+        )
+        params.extend([after_date, after_time, after_id])
+        conditions.append(
+            f"({_MATCH_SORT}) > (COALESCE(${len(params) - 2}::date, '-infinity'::date), "
+            f"COALESCE(${len(params) - 1}::time, '00:00'::time), ${len(params)})"
+        )
+    query = _MATCH_SELECT
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    params.append(limit + 1)
+    query += f" ORDER BY {_MATCH_SORT} LIMIT ${len(params)}"
 
-        if match:
-            results = json.loads(match["results"]) if match["results"] else None
-            return {
-                "match_id": match["match_id"],
-                "season_id": match["season_id"],
-                "season_name": match["season_name"],
-                "league_name": match["league_name"],
-                "team1_id": match["team1_id"],
-                "team1_name": match["team1_name"],
-                "team2_id": match["team2_id"],
-                "team2_name": match["team2_name"],
-                "venue_id": match["venue_id"],
-                "venue_name": match["venue_name"],
-                "date": match["date"].isoformat() if match["date"] else None,
-                "time": match["time"].isoformat() if match["time"] else None,
-                "results": results,
-                "home_score": match["home_goals"],  # Calculated from match_goals table
-                "away_score": match["away_goals"],  # Calculated from match_goals table
-                "status": results.get("status") if results else None
-            }
-        else:
-            return None
-    finally:
-        await conn.close()
+    async with acquire_connection() as conn:
+        matches = await conn.fetch(query, *params)
+    return page([_format_match(match) for match in matches], limit, _match_sort_key)
+
+async def get_match_by_id(match_id: int):
+    async with acquire_connection() as conn:
+        match = await conn.fetchrow(_MATCH_SELECT + " WHERE m.match_id = $1", match_id)
+        return _format_match(match) if match else None
 
 async def create_match(match: MatchCreate):
-    conn = await get_db_connection()
-    match_results = json.dumps(match.results)
-    try:
+    async with acquire_connection() as conn:
         match_id = await conn.fetchval("""
             INSERT INTO matches (season_id, team1_id, team2_id, venue_id, date, time, results)
             VALUES ($1, $2, $3, $4, $5, $6, $7) RETURNING match_id
-        """, match.season_id, match.team1_id, match.team2_id, match.venue_id, match.date, match.time, match_results)
+        """, match.season_id, match.team1_id, match.team2_id, match.venue_id, match.date, match.time, match.results)
         return match_id
-    finally:
-        await conn.close()
 
 async def update_match(match_id: int, match: MatchUpdate):
-    conn = await get_db_connection()
-    match_results = json.dumps(match.results)
-    try:
+    async with acquire_connection() as conn:
         result = await conn.execute("""
             UPDATE matches 
             SET season_id = COALESCE($2, season_id),
@@ -154,18 +123,80 @@ async def update_match(match_id: int, match: MatchUpdate):
                 time = COALESCE($7, time),
                 results = COALESCE($8, results)
             WHERE match_id = $1
-        """, match_id, match.season_id, match.team1_id, match.team2_id, match.venue_id, match.date, match.time, match_results)
+        """, match_id, match.season_id, match.team1_id, match.team2_id, match.venue_id, match.date, match.time, match.results)
         return result == "UPDATE 1"
-    finally:
-        await conn.close()
 
 async def delete_match(match_id: int):
-    conn = await get_db_connection()
-    try:
+    async with acquire_connection() as conn:
         result = await conn.execute("DELETE FROM matches WHERE match_id = $1", match_id)
         return result == "DELETE 1"
-    finally:
-        await conn.close()
+
+async def record_goals(goals: List[GoalEvent]):
+    """
+    Record a batch of goal events (possibly across matches) in one transaction
+    and return the resulting score of every match involved. Events whose
+    event_id is already recorded, in this batch or an earlier one, are skipped,
+    so a feed can safely resend a batch. Raises ValueError, without writing
+    anything, if any event names an unknown match or player or a team that
+    isn't playing.
+    """
+    columns = (
+        [goal.match_id for goal in goals],
+        [goal.player_id for goal in goals],
+        [goal.team_id for goal in goals],
+        [goal.minute for goal in goals],
+        [goal.goal_type for goal in goals],
+        [goal.event_id for goal in goals],
+    )
+    async with acquire_connection() as conn:
+        async with conn.transaction():
+            invalid = await conn.fetch("""
+                SELECT e.n - 1 AS index, e.error
+                FROM (
+                    SELECT e.n, CASE
+                        WHEN m.match_id IS NULL THEN format('unknown match_id %s', e.match_id)
+                        WHEN e.team_id IS DISTINCT FROM m.team1_id AND e.team_id IS DISTINCT FROM m.team2_id
+                            THEN 'team_id is not playing in this match'
+                        WHEN p.player_id IS NULL THEN format('unknown player_id %s', e.player_id)
+                    END AS error
+                    FROM unnest($1::int[], $2::int[], $3::int[]) WITH ORDINALITY AS e(match_id, player_id, team_id, n)
+                    LEFT JOIN matches m ON m.match_id = e.match_id
+                    LEFT JOIN players p ON p.player_id = e.player_id
+                ) e
+                WHERE e.error IS NOT NULL
+                ORDER BY e.n
+            """, *columns[:3])
+            if invalid:
+                raise ValueError("; ".join(f"goals[{row['index']}]: {row['error']}" for row in invalid[:10]))
+
+            # One statement for the whole batch, so the score and stats triggers run once
+            inserted = await conn.fetch("""
+                INSERT INTO match_goals (match_id, player_id, team_id, minute, goal_type, event_id, created_at)
+                SELECT e.match_id, e.player_id, e.team_id, e.minute, e.goal_type, e.event_id, NOW()
+                FROM unnest($1::int[], $2::int[], $3::int[], $4::int[], $5::text[], $6::text[])
+                    AS e(match_id, player_id, team_id, minute, goal_type, event_id)
+                ON CONFLICT (event_id) DO NOTHING
+                RETURNING id, match_id, event_id
+            """, *columns)
+
+            # Read back the scores the triggers just maintained
+            scores = await conn.fetch("""
+                SELECT match_id, COALESCE(home_score, 0) AS home_score, COALESCE(away_score, 0) AS away_score
+                FROM matches
+                WHERE match_id = ANY($1::int[])
+                ORDER BY match_id
+            """, sorted(set(columns[0])))
+
+    recorded = {row["event_id"] for row in inserted if row["event_id"] is not None}
+    return {
+        "inserted": len(inserted),
+        "goals": [dict(row) for row in inserted],
+        # Already recorded by an earlier request (repeats within the batch are recorded once)
+        "duplicate_event_ids": sorted(
+            {goal.event_id for goal in goals if goal.event_id is not None} - recorded
+        ),
+        "matches": [dict(row) for row in scores],
+    }
 
 class MatchManager:
     def __init__(self, db):
@@ -244,8 +275,8 @@ class MatchManager:
         
         result = await self.db.fetchrow(
             query,
-            statistics.home_team_stats.model_dump_json(),
-            statistics.away_team_stats.model_dump_json(),
+            statistics.home_team_stats.model_dump(),
+            statistics.away_team_stats.model_dump(),
             match_id
         )
         return dict(result) if result else None
@@ -258,4 +289,9 @@ class MatchManager:
         result = await self.db.fetchrow(query, match_id)
         if not result:
             return None
-        return dict(result)
\ No newline at end of file
+        return dict(result)
+
+async def reconcile_match_scores():
+    """Recount every match score from match_goals, returns the number of matches fixed"""
+    async with acquire_connection() as conn:
+        return await conn.fetchval("SELECT reconcile_match_scores()")
\ No newline at end of file
@@ -12,3 +12,7 @@ CREATE TABLE IF NOT EXISTS match_goals (
 
 CREATE INDEX IF NOT EXISTS idx_match_goals_match_id ON match_goals(match_id);
 CREATE INDEX IF NOT EXISTS idx_match_goals_player_id ON match_goals(player_id);
+
+-- Client-supplied id of a live feed event, so a retried batch never records a goal twice
+ALTER TABLE match_goals ADD COLUMN IF NOT EXISTS event_id VARCHAR(100);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_match_goals_event_id ON match_goals(event_id);
@@ -0,0 +1,111 @@
+-- Keep matches.home_score / matches.away_score in sync with match_goals so
+-- reads never have to count goals per row.
+
+-- Apply goal deltas for every match touched by a statement (set-wise, so
+-- batch inserts and COPY imports update each match once)
+CREATE OR REPLACE FUNCTION match_goals_sync_scores() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE matches m
+        SET home_score = COALESCE(m.home_score, 0) + d.home_delta,
+            away_score = COALESCE(m.away_score, 0) + d.away_delta
+        FROM (
+            SELECT g.match_id,
+                   COUNT(*) FILTER (WHERE g.team_id = mm.team1_id) AS home_delta,
+                   COUNT(*) FILTER (WHERE g.team_id = mm.team2_id) AS away_delta
+            FROM new_goals g
+            JOIN matches mm ON mm.match_id = g.match_id
+            GROUP BY g.match_id
+        ) d
+        WHERE m.match_id = d.match_id;
+    END IF;
+
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE matches m
+        SET home_score = GREATEST(COALESCE(m.home_score, 0) - d.home_delta, 0),
+            away_score = GREATEST(COALESCE(m.away_score, 0) - d.away_delta, 0)
+        FROM (
+            SELECT g.match_id,
+                   COUNT(*) FILTER (WHERE g.team_id = mm.team1_id) AS home_delta,
+                   COUNT(*) FILTER (WHERE g.team_id = mm.team2_id) AS away_delta
+            FROM old_goals g
+            JOIN matches mm ON mm.match_id = g.match_id
+            GROUP BY g.match_id
+        ) d
+        WHERE m.match_id = d.match_id;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Recount every match from match_goals, returns rows fixed. Later repairs go
+-- through run_score_reconcile rather than every startup.
+CREATE OR REPLACE FUNCTION reconcile_match_scores() RETURNS INTEGER AS $$
+DECLARE
+    fixed INTEGER;
+BEGIN
+    UPDATE matches m
+    SET home_score = c.home_goals,
+        away_score = c.away_goals
+    FROM (
+        SELECT mm.match_id,
+               COUNT(g.id) FILTER (WHERE g.team_id = mm.team1_id) AS home_goals,
+               COUNT(g.id) FILTER (WHERE g.team_id = mm.team2_id) AS away_goals
+        FROM matches mm
+        LEFT JOIN match_goals g ON g.match_id = mm.match_id
+        GROUP BY mm.match_id
+    ) c
+    WHERE m.match_id = c.match_id
+      AND (m.home_score IS DISTINCT FROM c.home_goals OR m.away_score IS DISTINCT FROM c.away_goals);
+    GET DIAGNOSTICS fixed = ROW_COUNT;
+    RETURN fixed;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Backfill on first deploy only, before the sync triggers below exist: the
+-- score columns have been there since migrations_statistics.sql, unmaintained
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'trg_match_goals_scores_insert') THEN
+        PERFORM reconcile_match_scores();
+    END IF;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_match_goals_scores_insert ON match_goals;
+CREATE TRIGGER trg_match_goals_scores_insert
+AFTER INSERT ON match_goals
+REFERENCING NEW TABLE AS new_goals
+FOR EACH STATEMENT EXECUTE FUNCTION match_goals_sync_scores();
+
+DROP TRIGGER IF EXISTS trg_match_goals_scores_update ON match_goals;
+CREATE TRIGGER trg_match_goals_scores_update
+AFTER UPDATE ON match_goals
+REFERENCING OLD TABLE AS old_goals NEW TABLE AS new_goals
+FOR EACH STATEMENT EXECUTE FUNCTION match_goals_sync_scores();
+
+DROP TRIGGER IF EXISTS trg_match_goals_scores_delete ON match_goals;
+CREATE TRIGGER trg_match_goals_scores_delete
+AFTER DELETE ON match_goals
+REFERENCING OLD TABLE AS old_goals
+FOR EACH STATEMENT EXECUTE FUNCTION match_goals_sync_scores();
+
+-- Swapping the home/away team of a match changes which goals count for which side
+CREATE OR REPLACE FUNCTION matches_recount_scores() RETURNS TRIGGER AS $$
+BEGIN
+    SELECT COUNT(*) FILTER (WHERE team_id = NEW.team1_id),
+           COUNT(*) FILTER (WHERE team_id = NEW.team2_id)
+    INTO NEW.home_score, NEW.away_score
+    FROM match_goals
+    WHERE match_id = NEW.match_id;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_matches_recount_scores ON matches;
+CREATE TRIGGER trg_matches_recount_scores
+BEFORE UPDATE OF team1_id, team2_id ON matches
+FOR EACH ROW
+WHEN (OLD.team1_id IS DISTINCT FROM NEW.team1_id OR OLD.team2_id IS DISTINCT FROM NEW.team2_id)
+EXECUTE FUNCTION matches_recount_scores();
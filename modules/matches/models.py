@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional, Dict
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, List
 from datetime import date, time, datetime
 
 class MatchCreate(BaseModel):
@@ -81,4 +81,19 @@ class MatchStatistics(BaseModel):
 class UpdateMatchScore(BaseModel):
     home_score: int
     away_score: int
-    status: Optional[str] = None  # e.g., "live", "finished", "scheduled"
\ No newline at end of file
+    status: Optional[str] = None  # e.g., "live", "finished", "scheduled"
+
+# Most goal events accepted in one batch
+GOAL_BATCH_MAX_EVENTS = 1000
+
+class GoalEvent(BaseModel):
+    match_id: int
+    player_id: int
+    team_id: int
+    minute: int = Field(ge=0, le=120)
+    goal_type: str = Field("regular", max_length=50)
+    # Retrying an event with the same id is a no-op
+    event_id: Optional[str] = Field(None, min_length=1, max_length=100)
+
+class GoalBatch(BaseModel):
+    goals: List[GoalEvent] = Field(min_length=1, max_length=GOAL_BATCH_MAX_EVENTS)
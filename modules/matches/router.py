@@ -1,23 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException
-from .manager import get_matches, get_match_by_id, create_match, update_match, delete_match
-from .models import MatchCreate, MatchUpdate, MatchStatistics, UpdateMatchScore, TeamMatchStats
+from .manager import get_matches, get_matches_page, get_match_by_id, create_match, update_match, delete_match, record_goals
+from .models import MatchCreate, MatchUpdate, MatchStatistics, UpdateMatchScore, TeamMatchStats, GoalBatch
 from modules.shared.response import success_response, error_response
 from modules.auth.router import get_current_user
 from .manager import MatchManager
-from ..shared.db import get_db_connection
-import json
+from ..shared.db import acquire_connection, get_db
 
 router = APIRouter()
 
-async def get_match_manager():
-    """Dependency to get MatchManager instance"""
-    db = await get_db_connection()
-    return MatchManager(db)
+async def get_match_manager(db=Depends(get_db)):
+    """Dependency to get MatchManager instance (connection is released after the request)"""
+    yield MatchManager(db)
 
 @router.get("/")
-async def list_matches(season_id: int = None):
-    matches = await get_matches(season_id)
-    return success_response(matches)
+async def list_matches(season_id: int = None, cursor: str = None, limit: int = None, paginate: bool = True):
+    """Matches by date; pass paginate=false for the full unpaginated list"""
+    if not paginate:
+        return success_response(await get_matches(season_id))
+    return success_response(await get_matches_page(season_id, cursor, limit))
 
 @router.get("/{match_id}")
 async def get_match(match_id: int):
@@ -98,44 +98,34 @@ async def get_match_stats(match_id: int, manager: MatchManager = Depends(get_mat
     result = await manager.get_match_statistics(match_id)
     
     if result:
-        # Parse the JSON strings back to objects
-        import json
-        home_stats = json.loads(result.get("home_team_stats", "{}")) if isinstance(result.get("home_team_stats"), str) else result.get("home_team_stats", {})
-        away_stats = json.loads(result.get("away_team_stats", "{}")) if isinstance(result.get("away_team_stats"), str) else result.get("away_team_stats", {})
-        
         return success_response({
-            "home_team_stats": home_stats,
-            "away_team_stats": away_stats
+            "home_team_stats": result["home_team_stats"],
+            "away_team_stats": result["away_team_stats"]
         })
     
-    # Fallback to checking match results field
-    conn = await get_db_connection()
-    try:
-        match = await get_match_by_id(match_id)
-        if not match:
-            raise HTTPException(status_code=404, detail="Match not found")
-        
-        results = match.get("results", {})
-        if results and isinstance(results, dict):
-            stats = {
-                "home_team_stats": results.get("home_team_stats", {}),
-                "away_team_stats": results.get("away_team_stats", {})
-            }
-            return success_response(stats)
-        
-        # Return empty stats if no data
-        return success_response({
-            "home_team_stats": {},
-            "away_team_stats": {}
-        })
-    finally:
-        await conn.close()
+    # Fallback to checking match results field (reusing the manager's connection)
+    match = await manager.get_match_by_id(match_id)
+    if not match:
+        raise HTTPException(status_code=404, detail="Match not found")
+    
+    results = match.get("results")
+    if results and isinstance(results, dict):
+        stats = {
+            "home_team_stats": results.get("home_team_stats", {}),
+            "away_team_stats": results.get("away_team_stats", {})
+        }
+        return success_response(stats)
+    
+    # Return empty stats if no data
+    return success_response({
+        "home_team_stats": {},
+        "away_team_stats": {}
+    })
 
 @router.get("/{match_id}/goals")
 async def get_match_goals(match_id: int):
     """Get all goals for a specific match"""
-    conn = await get_db_connection()
-    try:
+    async with acquire_connection() as conn:
         goals = await conn.fetch("""
             SELECT 
                 mg.id,
@@ -170,8 +160,6 @@ async def get_match_goals(match_id: int):
         ]
         
         return success_response(goals_list)
-    finally:
-        await conn.close()
 
 @router.post("/{match_id}/goals")
 async def add_match_goal(
@@ -181,94 +169,80 @@ async def add_match_goal(
     minute: int,
     goal_type: str = 'regular'
 ):
-    """Add a goal to a match (scores calculated automatically from match_goals)"""
-    conn = await get_db_connection()
-    try:
-        # Verify match exists
-        match = await conn.fetchrow("""
-            SELECT team1_id, team2_id
-            FROM matches
-            WHERE match_id = $1
-        """, match_id)
-        
-        if not match:
-            raise HTTPException(status_code=404, detail="Match not found")
-        
-        # Insert the goal
-        goal_id = await conn.fetchval("""
-            INSERT INTO match_goals (match_id, player_id, team_id, minute, goal_type, created_at)
-            VALUES ($1, $2, $3, $4, $5, NOW())
-            RETURNING id
-        """, match_id, player_id, team_id, minute, goal_type)
-        
-        # Count total goals for each team (for response only)
-        home_goals = await conn.fetchval("""
-            SELECT COUNT(*) FROM match_goals
-            WHERE match_id = $1 AND team_id = $2
-        """, match_id, match["team1_id"])
-        
-        away_goals = await conn.fetchval("""
-            SELECT COUNT(*) FROM match_goals
-            WHERE match_id = $1 AND team_id = $2
-        """, match_id, match["team2_id"])
-        
-        return success_response({
-            "id": goal_id,
-            "message": "Goal added successfully",
-            "home_score": home_goals,
-            "away_score": away_goals
-        })
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to add goal: {str(e)}")
-    finally:
-        await conn.close()
-
-@router.delete("/goals/{goal_id}")
-async def delete_match_goal(goal_id: int):
-    """Delete a goal (scores calculated automatically from match_goals)"""
-    conn = await get_db_connection()
-    try:
-        # Get goal details before deleting
-        goal = await conn.fetchrow("SELECT match_id FROM match_goals WHERE id = $1", goal_id)
-        if not goal:
-            raise HTTPException(status_code=404, detail="Goal not found")
-        
-        match_id = goal["match_id"]
-        
-        # Delete the goal
-        result = await conn.execute("DELETE FROM match_goals WHERE id = $1", goal_id)
-        
-        if result == "DELETE 1":
-            # Get match details
+    """Add a goal to a match (match scores are updated by trigger)"""
+    async with acquire_connection() as conn:
+        try:
+            # Verify match exists
             match = await conn.fetchrow("""
                 SELECT team1_id, team2_id
                 FROM matches
                 WHERE match_id = $1
             """, match_id)
+        
+            if not match:
+                raise HTTPException(status_code=404, detail="Match not found")
+        
+            async with conn.transaction():
+                # Insert the goal
+                goal_id = await conn.fetchval("""
+                    INSERT INTO match_goals (match_id, player_id, team_id, minute, goal_type, created_at)
+                    VALUES ($1, $2, $3, $4, $5, NOW())
+                    RETURNING id
+                """, match_id, player_id, team_id, minute, goal_type)
             
-            # Recalculate goals for each team (for response only)
-            home_goals = await conn.fetchval("""
-                SELECT COUNT(*) FROM match_goals
-                WHERE match_id = $1 AND team_id = $2
-            """, match_id, match["team1_id"])
-            
-            away_goals = await conn.fetchval("""
-                SELECT COUNT(*) FROM match_goals
-                WHERE match_id = $1 AND team_id = $2
-            """, match_id, match["team2_id"])
+                # Read back the score the trigger just maintained
+                score = await conn.fetchrow(
+                    "SELECT home_score, away_score FROM matches WHERE match_id = $1", match_id
+                )
+        
+            return success_response({
+                "id": goal_id,
+                "message": "Goal added successfully",
+                "home_score": score["home_score"],
+                "away_score": score["away_score"]
+            })
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to add goal: {str(e)}")
+
+@router.post("/goals/batch", dependencies=[Depends(get_current_user)])
+async def add_match_goals(batch: GoalBatch, current_user: dict = Depends(get_current_user)):
+    """
+    Record many goal events, across any number of matches, in one transaction
+    (match scores are updated by trigger). Events carrying an event_id already
+    recorded are skipped, so a feed can resend a batch after a failure.
+    Returns the inserted goals and the current score of every match involved.
+    """
+    if current_user["role"] not in ["admin", "team_manager"]:
+        return error_response("Unauthorized", 403)
+    try:
+        return success_response(await record_goals(batch.goals))
+    except ValueError as e:
+        return error_response(str(e), 400)
+
+@router.delete("/goals/{goal_id}")
+async def delete_match_goal(goal_id: int):
+    """Delete a goal (match scores are updated by trigger)"""
+    async with acquire_connection() as conn:
+        try:
+            async with conn.transaction():
+                # Delete the goal
+                match_id = await conn.fetchval("DELETE FROM match_goals WHERE id = $1 RETURNING match_id", goal_id)
+                if match_id is None:
+                    raise HTTPException(status_code=404, detail="Goal not found")
             
+                # Read back the score the trigger just maintained
+                score = await conn.fetchrow(
+                    "SELECT home_score, away_score FROM matches WHERE match_id = $1", match_id
+                )
+        
             return success_response({
                 "message": "Goal deleted successfully",
-                "home_score": home_goals,
-                "away_score": away_goals
+                "home_score": score["home_score"],
+                "away_score": score["away_score"]
             })
-        else:
-            raise HTTPException(status_code=404, detail="Goal not found")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to delete goal: {str(e)}")
-    finally:
-        await conn.close()
\ No newline at end of file
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to delete goal: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,19 @@
+import asyncio
+import asyncpg
+from modules.shared.db import DATABASE_URL
+
+async def run_reconcile():
+    """Recount match scores from match_goals (run as: python -m modules.matches.run_score_reconcile)"""
+    conn = await asyncpg.connect(DATABASE_URL)
+    
+    try:
+        fixed = await conn.fetchval("SELECT reconcile_match_scores()")
+        print(f"✅ Score reconcile completed: {fixed} match(es) corrected")
+        
+    except Exception as e:
+        print(f"❌ Score reconcile failed: {e}")
+    finally:
+        await conn.close()
+
+if __name__ == "__main__":
+    asyncio.run(run_reconcile())
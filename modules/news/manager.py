@@ -1,14 +1,40 @@
-from modules.shared.db import get_db_connection
-from .models import NewsCreate, NewsUpdate, SectionCreate, SectionUpdate
+from modules.shared.db import acquire_connection
+from modules.shared.cache import CACHE_BACKEND, TTLCache
+from modules.shared.pagination import decode_cursor, nullable, page
+from modules.shared.tasks import PeriodicTask
+from .models import NewsCreate, NewsUpdate, NewsListResponse, SectionCreate, SectionUpdate
+from fastapi import HTTPException
 from datetime import datetime
 from typing import Optional, List
+import os
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Seconds between writes of buffered article views
+NEWS_VIEW_FLUSH_INTERVAL = float(os.getenv("NEWS_VIEW_FLUSH_INTERVAL", "5"))
+NEWS_ARTICLE_CACHE_SIZE = int(os.getenv("NEWS_ARTICLE_CACHE_SIZE", "1000"))
+# Seconds between checks for scheduled articles that are due
+NEWS_SCHEDULE_INTERVAL = float(os.getenv("NEWS_SCHEDULE_INTERVAL", "30"))
+NEWS_FRONT_PAGE_FEATURED = int(os.getenv("NEWS_FRONT_PAGE_FEATURED", "5"))
+NEWS_FRONT_PAGE_PER_SECTION = int(os.getenv("NEWS_FRONT_PAGE_PER_SECTION", "5"))
+# The front page is rebuilt whenever news or sections change, but with the
+# memory cache backend that only reaches the worker that made the change:
+# the others keep serving their copy until it expires. So the TTL is only a
+# long safety net when invalidations are shared through Redis.
+NEWS_FRONT_PAGE_TTL = float(os.getenv("NEWS_FRONT_PAGE_TTL", "3600" if CACHE_BACKEND == "redis" else "30"))
 
 # ==================== SECTIONS MANAGEMENT ====================
 
+_sections_cache = TTLCache("sections")
+
 async def get_sections(is_active: Optional[bool] = None):
     """Get all sections, optionally filtered by active status"""
-    conn = await get_db_connection()
-    try:
+    return await _sections_cache.get_or_load(("all", is_active), lambda: _fetch_sections(is_active))
+
+async def _fetch_sections(is_active: Optional[bool] = None):
+    async with acquire_connection() as conn:
         if is_active is not None:
             sections = await conn.fetch(
                 "SELECT * FROM sections WHERE is_active = $1 ORDER BY display_order, section_name",
@@ -17,44 +43,34 @@ async def get_sections(is_active: Optional[bool] = None):
         else:
             sections = await conn.fetch("SELECT * FROM sections ORDER BY display_order, section_name")
         return [dict(section) for section in sections]
-    finally:
-        await conn.close()
 
 async def get_section_by_id(section_id: int):
     """Get a section by ID"""
-    conn = await get_db_connection()
-    try:
+    async with acquire_connection() as conn:
         section = await conn.fetchrow("SELECT * FROM sections WHERE section_id = $1", section_id)
         return dict(section) if section else None
-    finally:
-        await conn.close()
 
 async def get_section_by_slug(slug: str):
     """Get a section by slug"""
-    conn = await get_db_connection()
-    try:
+    async with acquire_connection() as conn:
         section = await conn.fetchrow("SELECT * FROM sections WHERE slug = $1", slug)
         return dict(section) if section else None
-    finally:
-        await conn.close()
 
 async def create_section(section: SectionCreate):
     """Create a new section"""
-    conn = await get_db_connection()
-    try:
+    async with acquire_connection() as conn:
         section_id = await conn.fetchval("""
             INSERT INTO sections (section_name, slug, description, display_order, is_active)
             VALUES ($1, $2, $3, $4, $5) RETURNING section_id
         """, section.section_name, section.slug, section.description, 
             section.display_order, section.is_active)
+        await _sections_cache.invalidate()
+        await _front_page_cache.invalidate()
         return section_id
-    finally:
-        await conn.close()
 
 async def update_section(section_id: int, section: SectionUpdate):
     """Update a section"""
-    conn = await get_db_connection()
-    try:
+    async with acquire_connection() as conn:
         # Build dynamic update query
         updates = []
         values = []
@@ -96,116 +112,272 @@ async def update_section(section_id: int, section: SectionUpdate):
         query = f"UPDATE sections SET {', '.join(updates)} WHERE section_id = ${param_count}"
         
         result = await conn.execute(query, *values)
+        await _sections_cache.invalidate()
+        # Articles and the front page embed section details
+        await _article_cache.invalidate()
+        await _front_page_cache.invalidate()
         return result == "UPDATE 1"
-    finally:
-        await conn.close()
 
 async def delete_section(section_id: int):
     """Delete a section"""
-    conn = await get_db_connection()
-    try:
+    async with acquire_connection() as conn:
         result = await conn.execute("DELETE FROM sections WHERE section_id = $1", section_id)
+        await _sections_cache.invalidate()
+        # Its articles fall back to no section
+        await _invalidate_articles()
         return result == "DELETE 1"
-    finally:
-        await conn.close()
 
 # ==================== NEWS MANAGEMENT ====================
 
+_counts_cache = TTLCache("news_counts")
+# Article detail by ("id", news_id) and ("slug", slug); views are merged in per read
+_article_cache = TTLCache("news_articles", maxsize=NEWS_ARTICLE_CACHE_SIZE)
+
+# Keyset sort key, newest first; matches the indexes in migrations_news.sql.
+# NULL timestamps become -infinity so they sort last, as NULLS LAST did.
+_NEWS_SORT = "COALESCE(n.published_at, '-infinity'::timestamp), COALESCE(n.created_at, '-infinity'::timestamp), n.news_id"
+_NEWS_ORDER = "COALESCE(n.published_at, '-infinity'::timestamp) DESC, COALESCE(n.created_at, '-infinity'::timestamp) DESC, n.news_id DESC"
+
+# Fields a client can ask for with fields=, mapped to their SQL. Everything
+# except search_vector, which is only used for matching.
+_NEWS_FIELDS = {
+    "news_id": "n.news_id",
+    "section_id": "n.section_id",
+    "section_name": "s.section_name",
+    "title": "n.title",
+    "slug": "n.slug",
+    "excerpt": "n.excerpt",
+    "content": "n.content",
+    "image": "n.image",
+    "author_id": "n.author_id",
+    "author_name": "n.author_name",
+    "author_avatar": "n.author_avatar",
+    "read_time": "n.read_time",
+    "tags": "n.tags",
+    "featured": "n.featured",
+    "is_published": "n.is_published",
+    "published_at": "n.published_at",
+    "scheduled_at": "n.scheduled_at",
+    "created_at": "n.created_at",
+    "updated_at": "n.updated_at",
+    "views": "n.views",
+}
+
+# List pages default to what the list view shows: no article body
+NEWS_LIST_FIELDS = tuple(NewsListResponse.model_fields)
+
+def _projection(fields, required=()):
+    selected = dict.fromkeys((*fields, *required))
+    return ", ".join(f"{_NEWS_FIELDS[field]} AS {field}" for field in selected)
+
+_NEWS_COLUMNS = _projection(_NEWS_FIELDS)
+
+def parse_news_fields(fields: Optional[str] = None):
+    """Validate a comma-separated fields= value; None gives the lean list projection"""
+    if not fields:
+        return NEWS_LIST_FIELDS
+    requested = tuple(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+    unknown = [field for field in requested if field not in _NEWS_FIELDS]
+    if unknown or not requested:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown) or fields}")
+    return requested
+
+def _sparse_page(result: dict, fields):
+    """Drop columns that were only selected for the cursor"""
+    result["items"] = [{key: value for key, value in item.items() if key in fields} for item in result["items"]]
+    return result
+
+def _news_filters(section_id, is_published, featured, tag=None, alias="n.", published_only=False):
+    conditions = []
+    params = []
+    for column, value in (("section_id", section_id), ("is_published", is_published), ("featured", featured)):
+        if value is not None:
+            params.append(value)
+            conditions.append(f"{alias}{column} = ${len(params)}")
+    if published_only:
+        # What anonymous readers may see: no drafts, nothing dated in the future
+        params.append(datetime.now())
+        conditions.append(f"{alias}is_published AND {alias}published_at <= ${len(params)}")
+    if tag is not None:
+        # @> so the GIN index on tags can be used
+        params.append(tag)
+        conditions.append(f"{alias}tags @> ARRAY[${len(params)}]::text[]")
+    return conditions, params
+
+def _news_sort_key(item):
+    # Drafts keep their NULL published_at; get_news_list applies _NEWS_SORT's COALESCE to it
+    return (item["published_at"], item["created_at"], item["news_id"])
+
 async def get_news_list(
     section_id: Optional[int] = None,
     is_published: Optional[bool] = None,
     featured: Optional[bool] = None,
     limit: int = 50,
-    offset: int = 0
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    tag: Optional[str] = None,
+    fields=NEWS_LIST_FIELDS,
+    published_only: bool = False
 ):
-    """Get news list with optional filters"""
-    conn = await get_db_connection()
-    try:
-        query = """
-            SELECT n.*, s.section_name
-            FROM news n
-            LEFT JOIN sections s ON n.section_id = s.section_id
-            WHERE 1=1
-        """
-        params = []
-        param_count = 1
-        
-        if section_id is not None:
-            query += f" AND n.section_id = ${param_count}"
-            params.append(section_id)
-            param_count += 1
-        
-        if is_published is not None:
-            query += f" AND n.is_published = ${param_count}"
-            params.append(is_published)
-            param_count += 1
-        
-        if featured is not None:
-            query += f" AND n.featured = ${param_count}"
-            params.append(featured)
-            param_count += 1
-        
-        query += f" ORDER BY n.published_at DESC NULLS LAST, n.created_at DESC LIMIT ${param_count} OFFSET ${param_count + 1}"
-        params.extend([limit, offset])
-        
+    """
+    Get a page of news with optional filters, newest first. Pages after the
+    first should pass the previous page's next_cursor; offset is only kept
+    for older clients. Only the given fields are returned (no article body
+    by default); published_only leaves out drafts and scheduled articles.
+    Returns (page, total).
+    """
+    conditions, params = _news_filters(section_id, is_published, featured, tag, published_only=published_only)
+    if cursor:
+        after_published, after_created, after_id = decode_cursor(
+            cursor, nullable(datetime.fromisoformat), nullable(datetime.fromisoformat), int
+        )
+        params.extend([after_published, after_created, after_id])
+        conditions.append(
+            f"({_NEWS_SORT}) < (COALESCE(${len(params) - 2}::timestamp, '-infinity'::timestamp), "
+            f"COALESCE(${len(params) - 1}::timestamp, '-infinity'::timestamp), ${len(params)})"
+        )
+
+    query = f"""
+        SELECT {_projection(fields, ("news_id", "published_at", "created_at"))}
+        FROM news n
+        LEFT JOIN sections s ON n.section_id = s.section_id
+    """
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    params.append(limit + 1)
+    query += f" ORDER BY {_NEWS_ORDER} LIMIT ${len(params)}"
+    if offset and not cursor:
+        params.append(offset)
+        query += f" OFFSET ${len(params)}"
+
+    async with acquire_connection() as conn:
         news = await conn.fetch(query, *params)
-        return [dict(item) for item in news]
-    finally:
-        await conn.close()
-
-async def get_news_by_id(news_id: int):
-    """Get a news article by ID"""
-    conn = await get_db_connection()
-    try:
-        news = await conn.fetchrow("""
-            SELECT n.*, s.section_name
+        total = await get_news_count(section_id, is_published, featured, tag, conn=conn, published_only=published_only)
+    result = page([_with_pending_views(dict(item)) for item in news], limit, _news_sort_key)
+    return _sparse_page(result, fields), total
+
+async def search_news(
+    q: str,
+    section_id: Optional[int] = None,
+    is_published: Optional[bool] = None,
+    tag: Optional[str] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    fields=NEWS_LIST_FIELDS,
+    published_only: bool = True
+):
+    """
+    Full-text search (web search syntax: quotes, OR, -word) ranked by
+    relevance, with highlighted snippets. Snippets are only built for the
+    rows of the returned page. Drafts and scheduled articles are only
+    searched when published_only is turned off.
+    """
+    conditions, params = _news_filters(section_id, is_published, None, tag, published_only=published_only)
+    params.append(q)
+    query_param = f"${len(params)}"
+    conditions.append(f"n.search_vector @@ websearch_to_tsquery('english', {query_param})")
+    rank = f"ts_rank(n.search_vector, websearch_to_tsquery('english', {query_param}))"
+    if cursor:
+        after_rank, after_id = decode_cursor(cursor, float, int)
+        params.extend([after_rank, after_id])
+        conditions.append(f"({rank}, n.news_id) < (${len(params) - 1}::real, ${len(params)})")
+    params.append(limit + 1)
+
+    selected = dict.fromkeys((*fields, "news_id"))
+    query = f"""
+        SELECT {", ".join(f"hits.{field}" for field in selected)}, hits.rank,
+               ts_headline('english', hits.snippet_source, websearch_to_tsquery('english', {query_param}),
+                           'MaxFragments=2, MaxWords=30, MinWords=10, StartSel=<mark>, StopSel=</mark>') AS snippet
+        FROM (
+            SELECT {_projection(selected)}, n.content AS snippet_source, {rank} AS rank
             FROM news n
             LEFT JOIN sections s ON n.section_id = s.section_id
-            WHERE n.news_id = $1
-        """, news_id)
-        return dict(news) if news else None
-    finally:
-        await conn.close()
-
-async def get_news_by_slug(slug: str):
-    """Get a news article by slug"""
-    conn = await get_db_connection()
-    try:
-        news = await conn.fetchrow("""
-            SELECT n.*, s.section_name
+            WHERE {" AND ".join(conditions)}
+            ORDER BY rank DESC, n.news_id DESC
+            LIMIT ${len(params)}
+        ) hits
+        ORDER BY hits.rank DESC, hits.news_id DESC
+    """
+    async with acquire_connection() as conn:
+        hits = await conn.fetch(query, *params)
+    result = page([_with_pending_views(dict(hit)) for hit in hits], limit, lambda hit: (hit["rank"], hit["news_id"]))
+    return _sparse_page(result, (*fields, "rank", "snippet"))
+
+async def get_news_by_id(news_id: int, published_only: bool = False):
+    """Get a news article by ID; with published_only, drafts and scheduled articles are not found"""
+    entry = await _article_cache.get_or_load(("id", news_id), lambda: _fetch_article("n.news_id = $1", news_id))
+    return _article_from_entry(entry, published_only)
+
+async def get_news_by_slug(slug: str, published_only: bool = False):
+    """Get a news article by slug; with published_only, drafts and scheduled articles are not found"""
+    entry = await _article_cache.get_or_load(("slug", slug), lambda: _fetch_article("n.slug = $1", slug))
+    return _article_from_entry(entry, published_only)
+
+async def _fetch_article(condition: str, value):
+    # Taken before the read so a flush racing with it isn't subtracted twice
+    flushed = _view_counter.flushed_snapshot()
+    async with acquire_connection() as conn:
+        news = await conn.fetchrow(f"""
+            SELECT {_NEWS_COLUMNS}
             FROM news n
             LEFT JOIN sections s ON n.section_id = s.section_id
-            WHERE n.slug = $1
-        """, slug)
-        return dict(news) if news else None
-    finally:
-        await conn.close()
+            WHERE {condition}
+        """, value)
+    if not news:
+        return None
+    news = dict(news)
+    return {"article": news, "views": news["views"] or 0, "flushed": flushed.get(news["news_id"], 0), "worker": _view_counter.worker_id}
+
+def _article_from_entry(entry, published_only=False):
+    """Copy a cached article and bring its view count up to date"""
+    if entry is None:
+        return None
+    article = entry["article"]
+    if published_only and not (
+        article["is_published"] and article["published_at"] is not None and article["published_at"] <= datetime.now()
+    ):
+        return None
+    news = dict(entry["article"])
+    news["views"] = _view_counter.current_views(news["news_id"], entry["views"], entry["flushed"], entry["worker"])
+    return news
+
+async def _invalidate_articles():
+    await _article_cache.invalidate()
+    await _counts_cache.invalidate()
+    await _front_page_cache.invalidate()
 
 async def create_news(news: NewsCreate, author_id: Optional[int] = None):
     """Create a new news article"""
-    conn = await get_db_connection()
-    try:
-        published_at = datetime.now() if news.is_published else None
+    async with acquire_connection() as conn:
+        is_published = news.is_published
+        published_at = _local_time(news.published_at)
+        scheduled_at = None
+        if published_at is not None and published_at > datetime.now():
+            # Stays a draft until the scheduler publishes it
+            is_published, published_at, scheduled_at = False, None, published_at
+        elif is_published:
+            published_at = published_at or datetime.now()
+        else:
+            published_at = None
         
         news_id = await conn.fetchval("""
             INSERT INTO news (
                 section_id, title, slug, excerpt, content, image,
                 author_id, author_name, author_avatar, read_time, tags,
-                featured, is_published, published_at
+                featured, is_published, published_at, scheduled_at
             )
-            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14)
+            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15)
             RETURNING news_id
         """, news.section_id, news.title, news.slug, news.excerpt, news.content,
             news.image, author_id, news.author_name, news.author_avatar,
-            news.read_time, news.tags, news.featured, news.is_published, published_at)
+            news.read_time, news.tags, news.featured, is_published, published_at, scheduled_at)
+        # Drops a cached "not found" for this slug too
+        await _invalidate_articles()
         return news_id
-    finally:
-        await conn.close()
 
 async def update_news(news_id: int, news: NewsUpdate):
     """Update a news article"""
-    conn = await get_db_connection()
-    try:
+    async with acquire_connection() as conn:
         # Build dynamic update query
         updates = []
         values = []
@@ -266,16 +438,30 @@ async def update_news(news_id: int, news: NewsUpdate):
             values.append(news.featured)
             param_count += 1
         
-        if news.is_published is not None:
+        published_at = _local_time(news.published_at)
+        if published_at is not None and published_at > datetime.now():
+            # Scheduling (or rescheduling) takes the article offline until then
+            updates.append("is_published = FALSE")
+            updates.append(f"scheduled_at = ${param_count}")
+            values.append(published_at)
+            param_count += 1
+        elif news.is_published is not None:
             updates.append(f"is_published = ${param_count}")
             values.append(news.is_published)
             param_count += 1
+            # An explicit publish/unpublish cancels any pending schedule
+            updates.append("scheduled_at = NULL")
             
             # Update published_at when publishing
             if news.is_published:
                 updates.append(f"published_at = ${param_count}")
-                values.append(datetime.now())
+                values.append(published_at or datetime.now())
                 param_count += 1
+        elif published_at is not None:
+            # Backdating an article keeps its published state
+            updates.append(f"published_at = ${param_count}")
+            values.append(published_at)
+            param_count += 1
         
         if not updates:
             return False
@@ -288,47 +474,189 @@ async def update_news(news_id: int, news: NewsUpdate):
         query = f"UPDATE news SET {', '.join(updates)} WHERE news_id = ${param_count}"
         
         result = await conn.execute(query, *values)
+        await _invalidate_articles()
         return result == "UPDATE 1"
-    finally:
-        await conn.close()
 
 async def delete_news(news_id: int):
     """Delete a news article"""
-    conn = await get_db_connection()
-    try:
+    async with acquire_connection() as conn:
         result = await conn.execute("DELETE FROM news WHERE news_id = $1", news_id)
+        await _invalidate_articles()
         return result == "DELETE 1"
-    finally:
-        await conn.close()
-
-async def increment_news_views(news_id: int):
-    """Increment view count for a news article"""
-    conn = await get_db_connection()
-    try:
-        await conn.execute("UPDATE news SET views = views + 1 WHERE news_id = $1", news_id)
-        return True
-    finally:
-        await conn.close()
-
-async def get_news_count(section_id: Optional[int] = None, is_published: Optional[bool] = None):
-    """Get total count of news articles"""
-    conn = await get_db_connection()
-    try:
-        query = "SELECT COUNT(*) FROM news WHERE 1=1"
-        params = []
-        param_count = 1
-        
-        if section_id is not None:
-            query += f" AND section_id = ${param_count}"
-            params.append(section_id)
-            param_count += 1
-        
-        if is_published is not None:
-            query += f" AND is_published = ${param_count}"
-            params.append(is_published)
-            param_count += 1
-        
-        count = await conn.fetchval(query, *params)
-        return count
-    finally:
-        await conn.close()
+
+def _local_time(value: Optional[datetime]):
+    """news timestamps are naive local time; convert aware inputs to match"""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+# ==================== SCHEDULED PUBLISHING ====================
+
+async def publish_scheduled_news():
+    """Publish every article whose scheduled time has passed, returns their ids"""
+    async with acquire_connection() as conn:
+        rows = await conn.fetch("""
+            UPDATE news
+            SET is_published = TRUE,
+                published_at = scheduled_at,
+                scheduled_at = NULL,
+                updated_at = $1
+            WHERE scheduled_at <= $1
+            RETURNING news_id
+        """, datetime.now())
+    if rows:
+        await _invalidate_articles()
+        logger.info(f"Published {len(rows)} scheduled news article(s)")
+    return [row["news_id"] for row in rows]
+
+publish_scheduled_task = PeriodicTask("news_scheduled_publish", NEWS_SCHEDULE_INTERVAL, publish_scheduled_news)
+
+# ==================== FRONT PAGE ====================
+
+_front_page_cache = TTLCache("news_front_page", maxsize=1, ttl=NEWS_FRONT_PAGE_TTL)
+
+# Front page items don't carry views, so the document never goes stale between rebuilds
+_FRONT_PAGE_FIELDS = tuple(field for field in NEWS_LIST_FIELDS if field != "views")
+
+async def get_front_page():
+    """Featured articles plus the latest articles of every active section"""
+    return await _front_page_cache.get_or_load("front", _build_front_page)
+
+async def _build_front_page():
+    async with acquire_connection() as conn:
+        featured = await conn.fetch(f"""
+            SELECT {_projection(_FRONT_PAGE_FIELDS)}
+            FROM news n
+            LEFT JOIN sections s ON n.section_id = s.section_id
+            WHERE n.is_published = TRUE AND n.featured = TRUE
+            ORDER BY {_NEWS_ORDER}
+            LIMIT $1
+        """, NEWS_FRONT_PAGE_FEATURED)
+        sections = await conn.fetch("""
+            SELECT section_id, section_name, slug
+            FROM sections
+            WHERE is_active = TRUE
+            ORDER BY display_order, section_name
+        """)
+        latest = await conn.fetch(f"""
+            SELECT * FROM (
+                SELECT {_projection(_FRONT_PAGE_FIELDS)},
+                       row_number() OVER (PARTITION BY n.section_id ORDER BY {_NEWS_ORDER}) AS position
+                FROM news n
+                JOIN sections s ON n.section_id = s.section_id
+                WHERE n.is_published = TRUE AND s.is_active = TRUE
+            ) ranked
+            WHERE position <= $1
+            ORDER BY section_id, position
+        """, NEWS_FRONT_PAGE_PER_SECTION)
+
+    by_section = {}
+    for item in latest:
+        item = dict(item)
+        del item["position"]
+        by_section.setdefault(item["section_id"], []).append(item)
+    return {
+        "featured": [dict(item) for item in featured],
+        "sections": [
+            {**dict(section), "news": by_section.get(section["section_id"], [])}
+            for section in sections
+        ],
+        "generated_at": datetime.now(),
+    }
+
+# ==================== VIEW COUNTER ====================
+
+class ViewCounter:
+    """
+    Buffers article views in memory and writes them in one UPDATE per flush,
+    so a popular article doesn't take a row lock on every read.
+    """
+    def __init__(self):
+        self.worker_id = uuid.uuid4().hex
+        self._pending = {}  # news_id -> views not yet written
+        self._flushing = {}  # views taken by the flush in progress
+        self._flushed = {}  # news_id -> views this worker has written so far
+
+    def add(self, news_id: int, count: int = 1):
+        self._pending[news_id] = self._pending.get(news_id, 0) + count
+
+    def pending(self, news_id: int) -> int:
+        return self._pending.get(news_id, 0) + self._flushing.get(news_id, 0)
+
+    def flushed_snapshot(self):
+        return dict(self._flushed)
+
+    def current_views(self, news_id: int, views: int, flushed: int, worker_id: str) -> int:
+        """
+        Views for an article read from the database when this worker had
+        flushed `flushed` views for it. Our own later flushes are added back;
+        other workers' only show up once the cached copy is refreshed.
+        """
+        if worker_id == self.worker_id:
+            views += self._flushed.get(news_id, 0) - flushed
+        return views + self.pending(news_id)
+
+    async def flush(self):
+        if not self._pending:
+            return
+        self._flushing, self._pending = self._pending, {}
+        news_ids = sorted(self._flushing)
+        deltas = [self._flushing[news_id] for news_id in news_ids]
+        written = False
+        try:
+            async with acquire_connection() as conn:
+                await conn.execute("""
+                    UPDATE news n
+                    SET views = COALESCE(n.views, 0) + v.delta
+                    FROM unnest($1::int[], $2::int[]) AS v(news_id, delta)
+                    WHERE n.news_id = v.news_id
+                """, news_ids, deltas)
+                written = True
+                for news_id, delta in zip(news_ids, deltas):
+                    self._flushed[news_id] = self._flushed.get(news_id, 0) + delta
+        except BaseException:
+            # Put the views back so the next flush retries them, also when
+            # cancelled (e.g. on shutdown) before the UPDATE went through
+            if not written:
+                for news_id, delta in self._flushing.items():
+                    self.add(news_id, delta)
+            raise
+        finally:
+            self._flushing = {}
+
+_view_counter = ViewCounter()
+views_flush_task = PeriodicTask("news_views_flush", NEWS_VIEW_FLUSH_INTERVAL, _view_counter.flush, run_on_stop=True)
+
+def increment_news_views(news_id: int):
+    """Count a view for a news article (written by the next flush)"""
+    _view_counter.add(news_id)
+
+def _with_pending_views(news: dict):
+    if "views" not in news:
+        return news
+    news["views"] = (news.get("views") or 0) + _view_counter.pending(news["news_id"])
+    return news
+
+async def get_news_count(
+    section_id: Optional[int] = None,
+    is_published: Optional[bool] = None,
+    featured: Optional[bool] = None,
+    tag: Optional[str] = None,
+    conn=None,
+    published_only: bool = False
+):
+    """Get total count of news articles (cached per filter until news changes)"""
+    return await _counts_cache.get_or_load(
+        (section_id, is_published, featured, tag, published_only),
+        lambda: _count_news(section_id, is_published, featured, tag, conn, published_only)
+    )
+
+async def _count_news(section_id, is_published, featured, tag=None, conn=None, published_only=False):
+    conditions, params = _news_filters(section_id, is_published, featured, tag, alias="", published_only=published_only)
+    query = "SELECT COUNT(*) FROM news"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    if conn is not None:
+        return await conn.fetchval(query, *params)
+    async with acquire_connection() as conn:
+        return await conn.fetchval(query, *params)
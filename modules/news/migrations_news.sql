@@ -0,0 +1,35 @@
+-- Keyset pagination for the news listing (newest first). The expressions
+-- must match _NEWS_SORT in manager.py for the planner to use these.
+CREATE INDEX IF NOT EXISTS idx_news_keyset
+    ON news ((COALESCE(published_at, '-infinity'::timestamp)) DESC, (COALESCE(created_at, '-infinity'::timestamp)) DESC, news_id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_news_published_keyset
+    ON news (is_published, (COALESCE(published_at, '-infinity'::timestamp)) DESC, (COALESCE(created_at, '-infinity'::timestamp)) DESC, news_id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_news_section_keyset
+    ON news (section_id, (COALESCE(published_at, '-infinity'::timestamp)) DESC, (COALESCE(created_at, '-infinity'::timestamp)) DESC, news_id DESC);
+
+-- Full-text search. array_to_string() is only STABLE, so wrap it in an
+-- IMMUTABLE function to be usable in a generated column.
+CREATE OR REPLACE FUNCTION news_tags_text(tags TEXT[]) RETURNS TEXT AS $$
+    SELECT array_to_string(tags, ' ')
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+ALTER TABLE news ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(news_tags_text(tags), '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(excerpt, '')), 'C') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'D')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_news_search ON news USING GIN (search_vector);
+
+-- Tag filters (tags @> ARRAY['x'])
+CREATE INDEX IF NOT EXISTS idx_news_tags ON news USING GIN (tags);
+
+-- Scheduled publishing: set while an article waits to go live
+ALTER TABLE news ADD COLUMN IF NOT EXISTS scheduled_at TIMESTAMP;
+
+CREATE INDEX IF NOT EXISTS idx_news_scheduled
+    ON news (scheduled_at) WHERE scheduled_at IS NOT NULL;
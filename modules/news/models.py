@@ -41,6 +41,8 @@ class NewsCreate(BaseModel):
     tags: List[str] = []
     featured: bool = False
     is_published: bool = False
+    # A future time schedules the article; it is published automatically then
+    published_at: Optional[datetime] = None
 
 class NewsUpdate(BaseModel):
     section_id: Optional[int] = None
@@ -55,6 +57,7 @@ class NewsUpdate(BaseModel):
     tags: Optional[List[str]] = None
     featured: Optional[bool] = None
     is_published: Optional[bool] = None
+    published_at: Optional[datetime] = None
 
 class NewsResponse(BaseModel):
     news_id: int
@@ -72,6 +75,7 @@ class NewsResponse(BaseModel):
     featured: bool
     is_published: bool
     published_at: Optional[datetime]
+    scheduled_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
     views: int
@@ -2,18 +2,22 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import Optional
 from .manager import (
     get_sections, get_section_by_id, get_section_by_slug, create_section, update_section, delete_section,
-    get_news_list, get_news_by_id, get_news_by_slug, create_news, update_news, delete_news,
-    increment_news_views, get_news_count
+    get_news_list, search_news, parse_news_fields, get_front_page, get_news_by_id, get_news_by_slug, create_news, update_news, delete_news,
+    increment_news_views
 )
 from .models import (
     SectionCreate, SectionUpdate, SectionResponse,
     NewsCreate, NewsUpdate, NewsResponse, NewsListResponse
 )
 from modules.shared.response import success_response, error_response
-from modules.auth.router import get_current_user
+from modules.auth.router import get_current_user, get_optional_user
 
 router = APIRouter()
 
+def _sees_unpublished(user: Optional[dict]) -> bool:
+    """Drafts and scheduled articles are only shown to those who can edit news"""
+    return user is not None and user["role"] == "admin"
+
 # ==================== SECTIONS ENDPOINTS ====================
 
 @router.get("/sections", response_model=None)
@@ -93,43 +97,84 @@ async def list_news(
     is_published: Optional[bool] = None,
     featured: Optional[bool] = None,
     limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0)
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
+    tag: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: Optional[dict] = Depends(get_optional_user)
 ):
-    """Get news list with optional filters and pagination"""
-    news = await get_news_list(section_id, is_published, featured, limit, offset)
-    total = await get_news_count(section_id, is_published)
+    """
+    Get news list with optional filters; follow next_cursor for further pages.
+    Articles are listed without their content unless requested with fields=.
+    Drafts and scheduled articles are only listed for admins.
+    """
+    news_page, total = await get_news_list(
+        section_id, is_published, featured, limit, offset, cursor, tag, parse_news_fields(fields),
+        published_only=not _sees_unpublished(current_user)
+    )
     return success_response({
-        "news": news,
+        "news": news_page["items"],
         "total": total,
         "limit": limit,
-        "offset": offset
+        "offset": offset,
+        "next_cursor": news_page["next_cursor"]
+    })
+
+@router.get("/front-page", response_model=None)
+async def front_page():
+    """Featured articles plus the latest articles of each active section"""
+    return success_response(await get_front_page())
+
+@router.get("/search", response_model=None)
+async def search_news_articles(
+    q: str = Query(..., min_length=1, max_length=200),
+    section_id: Optional[int] = None,
+    is_published: Optional[bool] = None,
+    tag: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: Optional[dict] = Depends(get_optional_user)
+):
+    """
+    Full-text search over title, tags, excerpt and content, best matches first.
+    Drafts and scheduled articles are only searched for admins.
+    """
+    results = await search_news(
+        q, section_id, is_published, tag, limit, cursor, parse_news_fields(fields),
+        published_only=not _sees_unpublished(current_user)
+    )
+    return success_response({
+        "news": results["items"],
+        "limit": limit,
+        "next_cursor": results["next_cursor"]
     })
 
 @router.get("/{news_id}", response_model=None)
-async def get_news(news_id: int, increment_view: bool = True):
+async def get_news(news_id: int, increment_view: bool = True, current_user: Optional[dict] = Depends(get_optional_user)):
     """Get a news article by ID"""
-    news = await get_news_by_id(news_id)
+    news = await get_news_by_id(news_id, published_only=not _sees_unpublished(current_user))
     if not news:
         return error_response("News not found", 404)
     
     # Increment view count
     if increment_view:
-        await increment_news_views(news_id)
-        news['views'] = news.get('views', 0) + 1
+        increment_news_views(news_id)
+        news['views'] += 1
     
     return success_response(news)
 
 @router.get("/slug/{slug}", response_model=None)
-async def get_news_slug(slug: str, increment_view: bool = True):
+async def get_news_slug(slug: str, increment_view: bool = True, current_user: Optional[dict] = Depends(get_optional_user)):
     """Get a news article by slug"""
-    news = await get_news_by_slug(slug)
+    news = await get_news_by_slug(slug, published_only=not _sees_unpublished(current_user))
     if not news:
         return error_response("News not found", 404)
     
     # Increment view count
     if increment_view:
-        await increment_news_views(news['news_id'])
-        news['views'] = news.get('views', 0) + 1
+        increment_news_views(news['news_id'])
+        news['views'] += 1
     
     return success_response(news)
 
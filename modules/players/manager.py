@@ -1,44 +1,70 @@
-from modules.shared.db import get_db_connection
+from modules.shared.db import acquire_connection
+from modules.shared.pagination import clamp_limit, decode_cursor, page
 from .models import PlayerCreate, PlayerUpdate
-import json
 from typing import Optional
 
-async def get_players(team_id: Optional[int] = None):
-    conn = await get_db_connection()
+def _player_filters(team_id: Optional[int], position: Optional[str], squad_number: Optional[int], params: list):
+    """WHERE conditions for the player listings, appending their values to params"""
+    conditions = []
+    for column, value in (("team_id", team_id), ("position", position), ("squad_number", squad_number)):
+        if value is not None:
+            params.append(value)
+            conditions.append(f"p.{column} = ${len(params)}")
+    return conditions
+
+# Size of the promoted position column (see migrations_players.sql)
+PLAYER_POSITION_MAX_LENGTH = 50
+
+def _squad_number(value) -> int:
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError("statistics.squad_number: expected an integer")
     try:
-        if team_id is not None:
-            query = """
-                SELECT 
-                    p.player_id,
-                    p.first_name,
-                    p.last_name,
-                    CONCAT(p.first_name, ' ', p.last_name) as player_name,
-                    p.team_id,
-                    t.team_name,
-                    p.photo,
-                    p.statistics
-                FROM players p
-                LEFT JOIN teams t ON p.team_id = t.team_id
-                WHERE p.team_id = $1
-                ORDER BY CONCAT(p.first_name, ' ', p.last_name)
-            """
-            players = await conn.fetch(query, team_id)
-        else:
-            query = """
-                SELECT 
-                    p.player_id,
-                    p.first_name,
-                    p.last_name,
-                    CONCAT(p.first_name, ' ', p.last_name) as player_name,
-                    p.team_id,
-                    t.team_name,
-                    p.photo,
-                    p.statistics
-                FROM players p
-                LEFT JOIN teams t ON p.team_id = t.team_id
-                ORDER BY CONCAT(p.first_name, ' ', p.last_name)
-            """
-            players = await conn.fetch(query)
+        value = int(value.strip() if isinstance(value, str) else value)
+    except (TypeError, ValueError):
+        raise ValueError("statistics.squad_number: expected an integer")
+    if not -2**31 <= value < 2**31:
+        raise ValueError("statistics.squad_number: out of range")
+    return value
+
+def promoted_columns(statistics: Optional[dict]):
+    """
+    position and squad_number columns derived from the statistics blob.
+    Raises ValueError if either doesn't fit its column.
+    """
+    if not statistics:
+        return None, None
+    position = statistics.get("position")
+    if position is not None:
+        position = str(position)
+        if len(position) > PLAYER_POSITION_MAX_LENGTH:
+            raise ValueError(f"statistics.position: longer than {PLAYER_POSITION_MAX_LENGTH} characters")
+    squad_number = statistics.get("squad_number")
+    if squad_number is not None:
+        squad_number = _squad_number(squad_number)
+    return position, squad_number
+
+async def get_players(team_id: Optional[int] = None, position: Optional[str] = None, squad_number: Optional[int] = None):
+    params = []
+    conditions = _player_filters(team_id, position, squad_number, params)
+    query = f"""
+        SELECT 
+            p.player_id,
+            p.first_name,
+            p.last_name,
+            CONCAT(p.first_name, ' ', p.last_name) as player_name,
+            p.team_id,
+            t.team_name,
+            p.photo,
+            p.position,
+            p.squad_number,
+            p.statistics
+        FROM players p
+        LEFT JOIN teams t ON p.team_id = t.team_id
+        {"WHERE " + " AND ".join(conditions) if conditions else ""}
+        ORDER BY CONCAT(p.first_name, ' ', p.last_name)
+    """
+    async with acquire_connection() as conn:
+        players = await conn.fetch(query, *params)
         
         return [
             {
@@ -49,106 +75,111 @@ async def get_players(team_id: Optional[int] = None):
                 "team_id": player["team_id"],
                 "team_name": player["team_name"],
                 "photo": player["photo"],
-                "statistics": json.loads(player["statistics"]) if player["statistics"] else None
+                "position": player["position"],
+                "squad_number": player["squad_number"],
+                "statistics": player["statistics"]
             }
             for player in players
         ]
-    finally:
-        await conn.close()
+
+# Keyset sort key; matches the expression indexes in migrations_pagination.sql
+# (CONCAT isn't immutable, so the name is built with || instead)
+_PLAYER_SORT = "(COALESCE(p.first_name, '') || ' ' || COALESCE(p.last_name, '')), p.player_id"
+
+async def get_players_page(team_id: Optional[int] = None, cursor: Optional[str] = None, limit: Optional[int] = None,
+                           position: Optional[str] = None, squad_number: Optional[int] = None):
+    """One page of players ordered by name and id"""
+    limit = clamp_limit(limit)
+    params = []
+    conditions = _player_filters(team_id, position, squad_number, params)
+    if cursor:
+        after_name, after_id = decode_cursor(cursor, str, int)
+        params.extend([after_name, after_id])
+        conditions.append(f"({_PLAYER_SORT}) > (${len(params) - 1}, ${len(params)})")
+    params.append(limit + 1)
+    query = f"""
+        SELECT 
+            p.player_id,
+            p.first_name,
+            p.last_name,
+            CONCAT(p.first_name, ' ', p.last_name) as player_name,
+            p.team_id,
+            t.team_name,
+            p.photo,
+            p.position,
+            p.squad_number,
+            p.statistics
+        FROM players p
+        LEFT JOIN teams t ON p.team_id = t.team_id
+        {"WHERE " + " AND ".join(conditions) if conditions else ""}
+        ORDER BY {_PLAYER_SORT}
+        LIMIT ${len(params)}
+    """
+    async with acquire_connection() as conn:
+        players = await conn.fetch(query, *params)
+    return page([dict(player) for player in players], limit, lambda player: (player["player_name"], player["player_id"]))
 
 async def get_player_by_id(player_id: int):
-    conn = await get_db_connection()
-    try:
+    async with acquire_connection() as conn:
         player = await conn.fetchrow("SELECT * FROM players WHERE player_id = $1", player_id)
         return dict(player) if player else None
-    finally:
-        await conn.close()
 
 async def create_player(player: PlayerCreate):
-    conn = await get_db_connection()
-    player_statistics = json.dumps(player.statistics)
-    try:
+    position, squad_number = promoted_columns(player.statistics)
+    async with acquire_connection() as conn:
         player_id = await conn.fetchval("""
-            INSERT INTO players (team_id, first_name, last_name, photo, statistics)
-            VALUES ($1, $2, $3, $4, $5) RETURNING player_id
-        """, player.team_id, player.first_name, player.last_name, player.photo, player_statistics)
+            INSERT INTO players (team_id, first_name, last_name, photo, statistics, position, squad_number)
+            VALUES ($1, $2, $3, $4, $5, $6, $7) RETURNING player_id
+        """, player.team_id, player.first_name, player.last_name, player.photo, player.statistics,
+            position, squad_number)
         return player_id
-    finally:
-        await conn.close()
 
 async def update_player(player_id: int, player: PlayerUpdate):
-    conn = await get_db_connection()
-    player_statistics = json.dumps(player.statistics)
-    try:
+    position, squad_number = promoted_columns(player.statistics)
+    async with acquire_connection() as conn:
+        # position/squad_number follow statistics whenever statistics is replaced
         result = await conn.execute("""
             UPDATE players 
             SET team_id = COALESCE($2, team_id),
                 first_name = COALESCE($3, first_name),
                 last_name = COALESCE($4, last_name),
                 photo = COALESCE($5, photo),
-                statistics = COALESCE($6, statistics)
+                statistics = COALESCE($6, statistics),
+                position = CASE WHEN $6::jsonb IS NULL THEN position ELSE $7 END,
+                squad_number = CASE WHEN $6::jsonb IS NULL THEN squad_number ELSE $8 END
             WHERE player_id = $1
-        """, player_id, player.team_id, player.first_name, player.last_name, player.photo, player_statistics)
+        """, player_id, player.team_id, player.first_name, player.last_name, player.photo, player.statistics,
+            position, squad_number)
         return result == "UPDATE 1"
-    finally:
-        await conn.close()
 
 async def delete_player(player_id: int):
-    conn = await get_db_connection()
-    try:
+    async with acquire_connection() as conn:
         result = await conn.execute("DELETE FROM players WHERE player_id = $1", player_id)
         return result == "DELETE 1"
-    finally:
-        await conn.close()
 
 async def get_top_scorers(season_id: Optional[int] = None, limit: int = 10):
     """Get top scorers based on goals from match_goals table"""
-    conn = await get_db_connection()
-    try:
-        if season_id is not None:
-            query = """
-                SELECT 
-                    p.player_id,
-                    p.first_name,
-                    p.last_name,
-                    CONCAT(p.first_name, ' ', p.last_name) as player_name,
-                    p.photo,
-                    t.team_id,
-                    t.team_name,
-                    t.logo as team_logo,
-                    COUNT(mg.id) as goals
-                FROM players p
-                LEFT JOIN teams t ON p.team_id = t.team_id
-                LEFT JOIN match_goals mg ON p.player_id = mg.player_id
-                LEFT JOIN matches m ON mg.match_id = m.match_id
-                WHERE m.season_id = $1
-                GROUP BY p.player_id, p.first_name, p.last_name, p.photo, t.team_id, t.team_name, t.logo
-                HAVING COUNT(mg.id) > 0
-                ORDER BY goals DESC, player_name ASC
-                LIMIT $2
-            """
-            scorers = await conn.fetch(query, season_id, limit)
-        else:
-            query = """
-                SELECT 
-                    p.player_id,
-                    p.first_name,
-                    p.last_name,
-                    CONCAT(p.first_name, ' ', p.last_name) as player_name,
-                    p.photo,
-                    t.team_id,
-                    t.team_name,
-                    t.logo as team_logo,
-                    COUNT(mg.id) as goals
-                FROM players p
-                LEFT JOIN teams t ON p.team_id = t.team_id
-                LEFT JOIN match_goals mg ON p.player_id = mg.player_id
-                GROUP BY p.player_id, p.first_name, p.last_name, p.photo, t.team_id, t.team_name, t.logo
-                HAVING COUNT(mg.id) > 0
-                ORDER BY goals DESC, player_name ASC
-                LIMIT $1
-            """
-            scorers = await conn.fetch(query, limit)
+    async with acquire_connection() as conn:
+        # player_season_stats is maintained by triggers (see migrations_player_stats.sql);
+        # season_key 0 holds the all-time totals
+        scorers = await conn.fetch("""
+            SELECT 
+                p.player_id,
+                p.first_name,
+                p.last_name,
+                CONCAT(p.first_name, ' ', p.last_name) as player_name,
+                p.photo,
+                t.team_id,
+                t.team_name,
+                t.logo as team_logo,
+                s.goals
+            FROM player_season_stats s
+            JOIN players p ON p.player_id = s.player_id
+            LEFT JOIN teams t ON p.team_id = t.team_id
+            WHERE s.season_key = $1 AND s.goals > 0
+            ORDER BY s.goals DESC, player_name ASC
+            LIMIT $2
+        """, season_id or 0, limit)
         
         return [
             {
@@ -164,114 +195,30 @@ async def get_top_scorers(season_id: Optional[int] = None, limit: int = 10):
             }
             for scorer in scorers
         ]
-    finally:
-        await conn.close()
 
 async def get_clean_sheets(season_id: Optional[int] = None, limit: int = 10):
     """Get goalkeepers with most clean sheets (matches where their team didn't concede)"""
-    conn = await get_db_connection()
-    try:
-        if season_id is not None:
-            query = """
-                WITH goalkeeper_matches AS (
-                    SELECT DISTINCT
-                        p.player_id,
-                        p.first_name,
-                        p.last_name,
-                        CONCAT(p.first_name, ' ', p.last_name) as player_name,
-                        p.photo,
-                        t.team_id,
-                        t.team_name,
-                        t.logo as team_logo,
-                        m.match_id,
-                        CASE 
-                            WHEN m.team1_id = t.team_id THEN m.team2_id
-                            WHEN m.team2_id = t.team_id THEN m.team1_id
-                        END as opponent_team_id
-                    FROM players p
-                    JOIN teams t ON p.team_id = t.team_id
-                    JOIN matches m ON (m.team1_id = t.team_id OR m.team2_id = t.team_id)
-                    WHERE m.season_id = $1
-                        AND p.statistics::jsonb->>'position' = 'Goalkeeper'
-                ),
-                clean_sheet_counts AS (
-                    SELECT 
-                        gm.player_id,
-                        gm.first_name,
-                        gm.last_name,
-                        gm.player_name,
-                        gm.photo,
-                        gm.team_id,
-                        gm.team_name,
-                        gm.team_logo,
-                        COUNT(DISTINCT gm.match_id) as total_matches,
-                        COUNT(DISTINCT CASE 
-                            WHEN NOT EXISTS (
-                                SELECT 1 FROM match_goals mg 
-                                WHERE mg.match_id = gm.match_id 
-                                AND mg.team_id = gm.opponent_team_id
-                            ) THEN gm.match_id 
-                        END) as clean_sheets
-                    FROM goalkeeper_matches gm
-                    GROUP BY gm.player_id, gm.first_name, gm.last_name, gm.player_name, 
-                             gm.photo, gm.team_id, gm.team_name, gm.team_logo
-                )
-                SELECT * FROM clean_sheet_counts
-                WHERE clean_sheets > 0
-                ORDER BY clean_sheets DESC, player_name ASC
-                LIMIT $2
-            """
-            keepers = await conn.fetch(query, season_id, limit)
-        else:
-            query = """
-                WITH goalkeeper_matches AS (
-                    SELECT DISTINCT
-                        p.player_id,
-                        p.first_name,
-                        p.last_name,
-                        CONCAT(p.first_name, ' ', p.last_name) as player_name,
-                        p.photo,
-                        t.team_id,
-                        t.team_name,
-                        t.logo as team_logo,
-                        m.match_id,
-                        CASE 
-                            WHEN m.team1_id = t.team_id THEN m.team2_id
-                            WHEN m.team2_id = t.team_id THEN m.team1_id
-                        END as opponent_team_id
-                    FROM players p
-                    JOIN teams t ON p.team_id = t.team_id
-                    JOIN matches m ON (m.team1_id = t.team_id OR m.team2_id = t.team_id)
-                    WHERE p.statistics::jsonb->>'position' = 'Goalkeeper'
-                ),
-                clean_sheet_counts AS (
-                    SELECT 
-                        gm.player_id,
-                        gm.first_name,
-                        gm.last_name,
-                        gm.player_name,
-                        gm.photo,
-                        gm.team_id,
-                        gm.team_name,
-                        gm.team_logo,
-                        COUNT(DISTINCT gm.match_id) as total_matches,
-                        COUNT(DISTINCT CASE 
-                            WHEN NOT EXISTS (
-                                SELECT 1 FROM match_goals mg 
-                                WHERE mg.match_id = gm.match_id 
-                                AND mg.team_id = gm.opponent_team_id
-                            ) THEN gm.match_id 
-                        END) as clean_sheets
-                    FROM goalkeeper_matches gm
-                    GROUP BY gm.player_id, gm.first_name, gm.last_name, gm.player_name, 
-                             gm.photo, gm.team_id, gm.team_name, gm.team_logo
-                )
-                SELECT * FROM clean_sheet_counts
-                WHERE clean_sheets > 0
-                ORDER BY clean_sheets DESC, player_name ASC
-                LIMIT $1
-            """
-            keepers = await conn.fetch(query, limit)
+    async with acquire_connection() as conn:
+        # Only goalkeepers (players.position) get clean sheets in player_season_stats
+        keepers = await conn.fetch("""
+            SELECT 
+                p.player_id,
+                p.first_name,
+                p.last_name,
+                CONCAT(p.first_name, ' ', p.last_name) as player_name,
+                p.photo,
+                t.team_id,
+                t.team_name,
+                t.logo as team_logo,
+                s.clean_sheets,
+                s.appearances as total_matches
+            FROM player_season_stats s
+            JOIN players p ON p.player_id = s.player_id
+            JOIN teams t ON p.team_id = t.team_id
+            WHERE s.season_key = $1 AND s.clean_sheets > 0
+            ORDER BY s.clean_sheets DESC, player_name ASC
+            LIMIT $2
+        """, season_id or 0, limit)
         
         return [
             {
@@ -288,5 +235,8 @@ async def get_clean_sheets(season_id: Optional[int] = None, limit: int = 10):
             }
             for keeper in keepers
         ]
-    finally:
-        await conn.close()
\ No newline at end of file
+
+async def rebuild_player_season_stats():
+    """Recompute player_season_stats from match_goals, matches and players"""
+    async with acquire_connection() as conn:
+        return await conn.fetchval("SELECT rebuild_player_season_stats()")
\ No newline at end of file
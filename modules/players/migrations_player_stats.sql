@@ -0,0 +1,248 @@
+-- Per-player, per-season aggregates behind /players/top-scorers and
+-- /players/clean-sheets, kept up to date by triggers on match_goals,
+-- matches and players. season_key 0 holds the totals over all matches.
+--   goals:        goals the player scored in the season's matches
+--   appearances:  matches of the player's current team in the season
+--   clean_sheets: those matches without an opponent goal (goalkeepers only)
+CREATE TABLE IF NOT EXISTS player_season_stats (
+    player_id INT NOT NULL REFERENCES players(player_id) ON DELETE CASCADE,
+    season_key INT NOT NULL,
+    goals INT NOT NULL DEFAULT 0,
+    appearances INT NOT NULL DEFAULT 0,
+    clean_sheets INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (player_id, season_key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_player_season_stats_goals
+    ON player_season_stats(season_key, goals DESC) WHERE goals > 0;
+CREATE INDEX IF NOT EXISTS idx_player_season_stats_clean_sheets
+    ON player_season_stats(season_key, clean_sheets DESC) WHERE clean_sheets > 0;
+
+-- Used when recomputing the players of a team
+CREATE INDEX IF NOT EXISTS idx_matches_team1_id ON matches(team1_id);
+CREATE INDEX IF NOT EXISTS idx_matches_team2_id ON matches(team2_id);
+
+-- Stats computed from the base tables for the given players (every player when NULL)
+CREATE OR REPLACE FUNCTION player_season_stats_compute(p_player_ids INT[] DEFAULT NULL)
+RETURNS TABLE (player_id INT, season_key INT, goals INT, appearances INT, clean_sheets INT) AS $$
+    SELECT x.player_id, x.season_key, SUM(x.goals)::int, SUM(x.appearances)::int, SUM(x.clean_sheets)::int
+    FROM (
+        SELECT mg.player_id, k.season_key, COUNT(*) AS goals, 0 AS appearances, 0 AS clean_sheets
+        FROM match_goals mg
+        JOIN matches m ON m.match_id = mg.match_id
+        CROSS JOIN LATERAL (VALUES (m.season_id), (0)) k(season_key)
+        WHERE (p_player_ids IS NULL OR mg.player_id = ANY(p_player_ids))
+          AND k.season_key IS NOT NULL
+        GROUP BY mg.player_id, k.season_key
+        UNION ALL
+        SELECT p.player_id, k.season_key, 0, COUNT(*),
+               COUNT(*) FILTER (
+                   WHERE p.position = 'Goalkeeper'
+                     AND NOT EXISTS (
+                         SELECT 1 FROM match_goals g
+                         WHERE g.match_id = m.match_id
+                           AND g.team_id = CASE WHEN m.team1_id = p.team_id THEN m.team2_id ELSE m.team1_id END
+                     )
+               )
+        FROM players p
+        JOIN matches m ON p.team_id IN (m.team1_id, m.team2_id)
+        CROSS JOIN LATERAL (VALUES (m.season_id), (0)) k(season_key)
+        WHERE (p_player_ids IS NULL OR p.player_id = ANY(p_player_ids))
+          AND k.season_key IS NOT NULL
+        GROUP BY p.player_id, k.season_key
+    ) x
+    GROUP BY x.player_id, x.season_key;
+$$ LANGUAGE sql STABLE;
+
+-- Recompute the rows of the given players
+CREATE OR REPLACE FUNCTION refresh_player_season_stats(p_player_ids INT[]) RETURNS VOID AS $$
+BEGIN
+    IF p_player_ids IS NULL OR cardinality(p_player_ids) = 0 THEN
+        RETURN;
+    END IF;
+
+    -- Stale keys and fresh keys never overlap, so both writes can share one snapshot
+    WITH fresh AS (
+        SELECT * FROM player_season_stats_compute(p_player_ids)
+    ),
+    stale AS (
+        DELETE FROM player_season_stats s
+        WHERE s.player_id = ANY(p_player_ids)
+          AND NOT EXISTS (
+              SELECT 1 FROM fresh f
+              WHERE f.player_id = s.player_id AND f.season_key = s.season_key
+          )
+    )
+    INSERT INTO player_season_stats AS s (player_id, season_key, goals, appearances, clean_sheets, updated_at)
+    SELECT f.player_id, f.season_key, f.goals, f.appearances, f.clean_sheets, NOW()
+    FROM fresh f
+    ON CONFLICT (player_id, season_key) DO UPDATE
+    SET goals = EXCLUDED.goals,
+        appearances = EXCLUDED.appearances,
+        clean_sheets = EXCLUDED.clean_sheets,
+        updated_at = NOW()
+    WHERE (s.goals, s.appearances, s.clean_sheets)
+          IS DISTINCT FROM (EXCLUDED.goals, EXCLUDED.appearances, EXCLUDED.clean_sheets);
+END;
+$$ LANGUAGE plpgsql;
+
+-- A goal changes the scorer's tally and the clean sheets of the goalkeepers of both teams
+CREATE OR REPLACE FUNCTION match_goals_sync_player_stats() RETURNS TRIGGER AS $$
+DECLARE
+    v_match_ids INT[] := '{}';
+    v_player_ids INT[] := '{}';
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        v_match_ids := v_match_ids || ARRAY(SELECT DISTINCT match_id FROM new_goals);
+        v_player_ids := v_player_ids || ARRAY(SELECT DISTINCT player_id FROM new_goals);
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        v_match_ids := v_match_ids || ARRAY(SELECT DISTINCT match_id FROM old_goals);
+        v_player_ids := v_player_ids || ARRAY(SELECT DISTINCT player_id FROM old_goals);
+    END IF;
+
+    PERFORM refresh_player_season_stats(ARRAY(
+        SELECT unnest(v_player_ids)
+        UNION
+        SELECT p.player_id
+        FROM matches m
+        JOIN players p ON p.team_id IN (m.team1_id, m.team2_id)
+        WHERE m.match_id = ANY(v_match_ids)
+          AND p.position = 'Goalkeeper'
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_match_goals_player_stats_insert ON match_goals;
+CREATE TRIGGER trg_match_goals_player_stats_insert
+AFTER INSERT ON match_goals
+REFERENCING NEW TABLE AS new_goals
+FOR EACH STATEMENT EXECUTE FUNCTION match_goals_sync_player_stats();
+
+DROP TRIGGER IF EXISTS trg_match_goals_player_stats_update ON match_goals;
+CREATE TRIGGER trg_match_goals_player_stats_update
+AFTER UPDATE ON match_goals
+REFERENCING OLD TABLE AS old_goals NEW TABLE AS new_goals
+FOR EACH STATEMENT EXECUTE FUNCTION match_goals_sync_player_stats();
+
+DROP TRIGGER IF EXISTS trg_match_goals_player_stats_delete ON match_goals;
+CREATE TRIGGER trg_match_goals_player_stats_delete
+AFTER DELETE ON match_goals
+REFERENCING OLD TABLE AS old_goals
+FOR EACH STATEMENT EXECUTE FUNCTION match_goals_sync_player_stats();
+
+-- Adding, removing or re-pairing a match changes the appearances of both squads.
+-- Score-only updates (from the goal triggers) leave the teams alone and are skipped.
+CREATE OR REPLACE FUNCTION matches_sync_player_stats() RETURNS TRIGGER AS $$
+DECLARE
+    v_team_ids INT[] := '{}';
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        v_team_ids := ARRAY(SELECT team1_id FROM new_matches UNION SELECT team2_id FROM new_matches);
+    ELSIF TG_OP = 'DELETE' THEN
+        v_team_ids := ARRAY(SELECT team1_id FROM old_matches UNION SELECT team2_id FROM old_matches);
+    ELSE
+        -- Versions of the matches whose season or teams changed, on either side.
+        -- Set operations rather than a join of old to new: the plan is cached per
+        -- session and a nested loop sized for one row would be quadratic in bulk.
+        v_team_ids := ARRAY(
+            SELECT unnest(ARRAY[team1_id, team2_id])
+            FROM (
+                (SELECT match_id, season_id, team1_id, team2_id FROM old_matches
+                 EXCEPT
+                 SELECT match_id, season_id, team1_id, team2_id FROM new_matches)
+                UNION
+                (SELECT match_id, season_id, team1_id, team2_id FROM new_matches
+                 EXCEPT
+                 SELECT match_id, season_id, team1_id, team2_id FROM old_matches)
+            ) changed
+        );
+    END IF;
+
+    IF cardinality(v_team_ids) > 0 THEN
+        PERFORM refresh_player_season_stats(ARRAY(
+            SELECT player_id FROM players WHERE team_id = ANY(v_team_ids)
+        ));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_matches_player_stats_insert ON matches;
+CREATE TRIGGER trg_matches_player_stats_insert
+AFTER INSERT ON matches
+REFERENCING NEW TABLE AS new_matches
+FOR EACH STATEMENT EXECUTE FUNCTION matches_sync_player_stats();
+
+DROP TRIGGER IF EXISTS trg_matches_player_stats_update ON matches;
+CREATE TRIGGER trg_matches_player_stats_update
+AFTER UPDATE ON matches
+REFERENCING OLD TABLE AS old_matches NEW TABLE AS new_matches
+FOR EACH STATEMENT EXECUTE FUNCTION matches_sync_player_stats();
+
+DROP TRIGGER IF EXISTS trg_matches_player_stats_delete ON matches;
+CREATE TRIGGER trg_matches_player_stats_delete
+AFTER DELETE ON matches
+REFERENCING OLD TABLE AS old_matches
+FOR EACH STATEMENT EXECUTE FUNCTION matches_sync_player_stats();
+
+-- A transfer or a change of position changes appearances and clean sheets
+CREATE OR REPLACE FUNCTION players_sync_player_stats() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM refresh_player_season_stats(ARRAY(SELECT player_id FROM new_players));
+    ELSE
+        -- EXCEPT rather than a join of old to new, see matches_sync_player_stats()
+        PERFORM refresh_player_season_stats(ARRAY(
+            SELECT player_id FROM (
+                SELECT player_id, team_id, position FROM new_players
+                EXCEPT
+                SELECT player_id, team_id, position FROM old_players
+            ) changed
+        ));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_players_player_stats_insert ON players;
+CREATE TRIGGER trg_players_player_stats_insert
+AFTER INSERT ON players
+REFERENCING NEW TABLE AS new_players
+FOR EACH STATEMENT EXECUTE FUNCTION players_sync_player_stats();
+
+DROP TRIGGER IF EXISTS trg_players_player_stats_update ON players;
+CREATE TRIGGER trg_players_player_stats_update
+AFTER UPDATE ON players
+REFERENCING OLD TABLE AS old_players NEW TABLE AS new_players
+FOR EACH STATEMENT EXECUTE FUNCTION players_sync_player_stats();
+
+-- Full rebuild from the base tables, returns rows written
+CREATE OR REPLACE FUNCTION rebuild_player_season_stats() RETURNS INTEGER AS $$
+DECLARE
+    written INTEGER;
+BEGIN
+    -- Hold off concurrent goal/match/player writes so their refreshes can't interleave
+    LOCK TABLE match_goals, matches, players IN SHARE MODE;
+
+    DELETE FROM player_season_stats;
+
+    INSERT INTO player_season_stats (player_id, season_key, goals, appearances, clean_sheets, updated_at)
+    SELECT c.player_id, c.season_key, c.goals, c.appearances, c.clean_sheets, NOW()
+    FROM player_season_stats_compute() c;
+
+    GET DIAGNOSTICS written = ROW_COUNT;
+    RETURN written;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Populate on first deploy only; use rebuild_player_season_stats() to repair later
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM player_season_stats) THEN
+        PERFORM rebuild_player_season_stats();
+    END IF;
+END;
+$$;
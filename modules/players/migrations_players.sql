@@ -0,0 +1,29 @@
+-- Frequently filtered attributes promoted out of the statistics JSONB.
+-- create_player/update_player keep them in sync with statistics.
+ALTER TABLE IF EXISTS players
+ADD COLUMN IF NOT EXISTS position VARCHAR(50),
+ADD COLUMN IF NOT EXISTS squad_number INTEGER;
+
+-- Backfill (and repair) from statistics; only rows that differ are touched
+UPDATE players p
+SET position = v.position,
+    squad_number = v.squad_number
+FROM (
+    SELECT player_id,
+           -- Values the API would reject (see promoted_columns) are left NULL
+           CASE WHEN length(statistics->>'position') <= 50 THEN statistics->>'position' END AS position,
+           CASE WHEN statistics->>'squad_number' ~ '^\s*-?\d{1,9}\s*$'
+                THEN trim(statistics->>'squad_number')::int
+           END AS squad_number
+    FROM players
+    WHERE statistics IS NOT NULL
+) v
+WHERE p.player_id = v.player_id
+  AND (p.position IS DISTINCT FROM v.position OR p.squad_number IS DISTINCT FROM v.squad_number);
+
+-- Position filter on /players, in the same order as the keyset pagination
+CREATE INDEX IF NOT EXISTS idx_players_position_keyset
+    ON players (position, (COALESCE(first_name, '') || ' ' || COALESCE(last_name, '')), player_id);
+
+CREATE INDEX IF NOT EXISTS idx_players_team_squad_number
+    ON players (team_id, squad_number) WHERE squad_number IS NOT NULL;
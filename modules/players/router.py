@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
-from .manager import get_players, get_player_by_id, create_player, update_player, delete_player, get_top_scorers, get_clean_sheets
+from .manager import get_players, get_players_page, get_player_by_id, create_player, update_player, delete_player, get_top_scorers, get_clean_sheets
 from .models import PlayerCreate, PlayerUpdate
 from modules.shared.response import success_response, error_response
 from modules.auth.router import get_current_user
@@ -7,9 +7,12 @@ from modules.auth.router import get_current_user
 router = APIRouter()
 
 @router.get("/")
-async def list_players(team_id: int = None):
-    players = await get_players(team_id)
-    return success_response(players)
+async def list_players(team_id: int = None, position: str = None, squad_number: int = None,
+                       cursor: str = None, limit: int = None, paginate: bool = True):
+    """Players by name; pass paginate=false for the full unpaginated list"""
+    if not paginate:
+        return success_response(await get_players(team_id, position, squad_number))
+    return success_response(await get_players_page(team_id, cursor, limit, position, squad_number))
 
 @router.get("/top-scorers")
 async def list_top_scorers(season_id: int = None, limit: int = 10):
@@ -34,14 +37,20 @@ async def get_player(player_id: int):
 async def add_player(player: PlayerCreate, current_user: dict = Depends(get_current_user)):
     if current_user["role"] not in ["admin", "team_manager"]:
         return error_response("Unauthorized", 403)
-    player_id = await create_player(player)
+    try:
+        player_id = await create_player(player)
+    except ValueError as e:
+        return error_response(str(e), 400)
     return success_response({"player_id": player_id}, 201)
 
 @router.put("/{player_id}", dependencies=[Depends(get_current_user)])
 async def edit_player(player_id: int, player: PlayerUpdate, current_user: dict = Depends(get_current_user)):
     if current_user["role"] not in ["admin", "team_manager"]:
         return error_response("Unauthorized", 403)
-    updated = await update_player(player_id, player)
+    try:
+        updated = await update_player(player_id, player)
+    except ValueError as e:
+        return error_response(str(e), 400)
     if not updated:
         return error_response("Player not found", 404)
     return success_response({"message": "Player updated"})
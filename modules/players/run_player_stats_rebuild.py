@@ -0,0 +1,19 @@
+import asyncio
+import asyncpg
+from modules.shared.db import DATABASE_URL
+
+async def run_rebuild():
+    """Rebuild the player_season_stats table (run as: python -m modules.players.run_player_stats_rebuild)"""
+    conn = await asyncpg.connect(DATABASE_URL)
+    
+    try:
+        written = await conn.fetchval("SELECT rebuild_player_season_stats()")
+        print(f"✅ Player stats rebuild completed: {written} row(s) written")
+        
+    except Exception as e:
+        print(f"❌ Player stats rebuild failed: {e}")
+    finally:
+        await conn.close()
+
+if __name__ == "__main__":
+    asyncio.run(run_rebuild())
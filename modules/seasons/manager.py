@@ -1,9 +1,17 @@
-from modules.shared.db import get_db_connection
+from modules.shared.db import acquire_connection
+from modules.shared.cache import TTLCache
 from .models import SeasonCreate, SeasonUpdate
 
+_cache = TTLCache("seasons")
+
 async def get_seasons():
-    conn = await get_db_connection()
-    try:
+    return await _cache.get_or_load("all", _fetch_seasons)
+
+async def get_season_by_id(season_id: int):
+    return await _cache.get_or_load(("id", season_id), lambda: _fetch_season_by_id(season_id))
+
+async def _fetch_seasons():
+    async with acquire_connection() as conn:
         seasons = await conn.fetch("""
             SELECT 
                 s.season_id,
@@ -27,12 +35,9 @@ async def get_seasons():
             }
             for season in seasons
         ]
-    finally:
-        await conn.close()
 
-async def get_season_by_id(season_id: int):
-    conn = await get_db_connection()
-    try:
+async def _fetch_season_by_id(season_id: int):
+    async with acquire_connection() as conn:
         season = await conn.fetchrow("""
             SELECT 
                 s.season_id,
@@ -56,12 +61,9 @@ async def get_season_by_id(season_id: int):
                 "end_date": season["end_date"].isoformat() if season["end_date"] else None
             }
         return None
-    finally:
-        await conn.close()
 
 async def create_season(season_data: dict):
-    conn = await get_db_connection()
-    try:
+    async with acquire_connection() as conn:
         season_id = await conn.fetchval("""
             INSERT INTO seasons (league_id, season_name, start_date, end_date)
             VALUES ($1, $2, $3, $4) RETURNING season_id
@@ -70,13 +72,11 @@ async def create_season(season_data: dict):
         season_data.get('season_name'),
         season_data.get('start_date'),
         season_data.get('end_date'))
+        await _cache.invalidate()
         return season_id
-    finally:
-        await conn.close()
 
 async def update_season(season_id: int, season_data: dict):
-    conn = await get_db_connection()
-    try:
+    async with acquire_connection() as conn:
         result = await conn.execute("""
             UPDATE seasons 
             SET league_id = COALESCE($2, league_id),
@@ -90,14 +90,11 @@ async def update_season(season_id: int, season_data: dict):
         season_data.get('season_name'),
         season_data.get('start_date'),
         season_data.get('end_date'))
+        await _cache.invalidate()
         return result == "UPDATE 1"
-    finally:
-        await conn.close()
 
 async def delete_season(season_id: int):
-    conn = await get_db_connection()
-    try:
+    async with acquire_connection() as conn:
         result = await conn.execute("DELETE FROM seasons WHERE season_id = $1", season_id)
+        await _cache.invalidate()
         return result == "DELETE 1"
-    finally:
-        await conn.close()
@@ -0,0 +1,286 @@
+import asyncio
+import json
+import os
+import time
+import uuid
+import logging
+from collections import OrderedDict
+from datetime import date, datetime, time as dt_time
+from decimal import Decimal
+
+logger = logging.getLogger(__name__)
+
+CACHE_DEFAULT_TTL = float(os.getenv("CACHE_DEFAULT_TTL", "60"))
+CACHE_DEFAULT_MAXSIZE = int(os.getenv("CACHE_DEFAULT_MAXSIZE", "512"))
+# "memory" keeps everything in this process, "redis" shares entries between workers
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "crimax")
+CACHE_INVALIDATION_CHANNEL = f"{CACHE_KEY_PREFIX}:cache:invalidate"
+
+# Every cache registers itself here so stats and invalidation can be reached by name
+_caches = {}
+# Identifies this worker so it can ignore its own invalidation broadcasts
+_instance_id = uuid.uuid4().hex
+
+MISSING = object()
+
+# ==================== BACKENDS ====================
+
+class CacheBackend:
+    """Shared storage tier behind the per-process caches"""
+    async def get(self, key: str):
+        """Return the stored value or MISSING"""
+        raise NotImplementedError
+
+    async def set(self, key: str, value, ttl: float):
+        raise NotImplementedError
+
+    async def delete(self, key: str):
+        raise NotImplementedError
+
+    async def delete_prefix(self, prefix: str):
+        raise NotImplementedError
+
+    async def publish(self, channel: str, message: str):
+        raise NotImplementedError
+
+    async def subscribe(self, channel: str, handler):
+        """Call handler(message) for every message published on channel"""
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+class MemoryBackend(CacheBackend):
+    """Single-process backend; pub/sub is delivered in-process"""
+    def __init__(self, maxsize: int = None):
+        self.maxsize = maxsize or CACHE_DEFAULT_MAXSIZE * 8
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._handlers = {}  # channel -> [handler]
+
+    async def get(self, key: str):
+        entry = self._data.get(key)
+        if entry is None:
+            return MISSING
+        if entry[0] <= time.monotonic():
+            del self._data[key]
+            return MISSING
+        self._data.move_to_end(key)
+        return entry[1]
+
+    async def set(self, key: str, value, ttl: float):
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    async def delete(self, key: str):
+        self._data.pop(key, None)
+
+    async def delete_prefix(self, prefix: str):
+        for key in [k for k in self._data if k.startswith(prefix)]:
+            del self._data[key]
+
+    async def publish(self, channel: str, message: str):
+        for handler in self._handlers.get(channel, []):
+            handler(message)
+
+    async def subscribe(self, channel: str, handler):
+        self._handlers.setdefault(channel, []).append(handler)
+
+_backend: CacheBackend = MemoryBackend()
+
+def _json_default(obj):
+    if isinstance(obj, (datetime, date, dt_time)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dump_value(value) -> str:
+    """Serialize a cached value for network backends"""
+    return json.dumps(value, default=_json_default)
+
+def load_value(raw: str):
+    return json.loads(raw)
+
+# ==================== CACHE ====================
+
+class TTLCache:
+    """
+    Size-bounded LRU cache with a TTL per entry and single-flight loading.
+    Entries are kept in this process and mirrored in the configured backend
+    so other workers can reuse them. Cached values are shared between
+    requests and must be treated as read-only.
+    """
+    def __init__(self, name: str, maxsize: int = None, ttl: float = None):
+        self.name = name
+        self.maxsize = maxsize or CACHE_DEFAULT_MAXSIZE
+        self.ttl = ttl if ttl is not None else CACHE_DEFAULT_TTL
+        self.hits = 0
+        self.misses = 0
+        self.backend_hits = 0
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._inflight = {}  # key -> Future shared by concurrent loaders
+        # Bumped on every invalidation so a load that started before it
+        # doesn't put stale data back into the cache
+        self._generation = 0
+        _caches[name] = self
+
+    def _backend_key(self, key) -> str:
+        return f"{CACHE_KEY_PREFIX}:{self.name}:{key!r}"
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value, ttl: float = None):
+        ttl = self.ttl if ttl is None else ttl
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate_local(self, key_repr: str = None):
+        """Drop every local entry, or only the one whose key has this repr"""
+        self._generation += 1
+        if key_repr is None:
+            self._data.clear()
+            return
+        for key in [k for k in self._data if repr(k) == key_repr]:
+            del self._data[key]
+
+    async def invalidate(self):
+        """Drop every entry here, in the backend and in the other workers"""
+        self.invalidate_local()
+        try:
+            await _backend.delete_prefix(f"{CACHE_KEY_PREFIX}:{self.name}:")
+            await _backend.publish(
+                CACHE_INVALIDATION_CHANNEL,
+                json.dumps({"origin": _instance_id, "cache": self.name})
+            )
+        except Exception as e:
+            logger.warning(f"⚠️  Cache backend invalidation failed for '{self.name}': {e}")
+
+    async def delete(self, key):
+        """Drop one entry here, in the backend and in the other workers"""
+        self.invalidate_local(repr(key))
+        try:
+            await _backend.delete(self._backend_key(key))
+            await _backend.publish(
+                CACHE_INVALIDATION_CHANNEL,
+                json.dumps({"origin": _instance_id, "cache": self.name, "key": repr(key)})
+            )
+        except Exception as e:
+            logger.warning(f"⚠️  Cache backend delete failed for '{self.name}': {e}")
+
+    async def _load(self, key, loader, ttl: float, generation: int):
+        backend_key = self._backend_key(key)
+        try:
+            value = await _backend.get(backend_key)
+        except Exception as e:
+            logger.warning(f"⚠️  Cache backend read failed for '{self.name}': {e}")
+            value = MISSING
+        if value is not MISSING:
+            self.backend_hits += 1
+            return value
+
+        value = await loader()
+        if generation != self._generation:
+            return value
+        try:
+            await _backend.set(backend_key, value, ttl)
+        except Exception as e:
+            logger.warning(f"⚠️  Cache backend write failed for '{self.name}': {e}")
+        return value
+
+    async def get_or_load(self, key, loader, ttl: float = None):
+        """Return the cached value, or run loader() once for all concurrent callers"""
+        entry = self._data.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            self._data.move_to_end(key)
+            return entry[1]
+
+        self.misses += 1
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        ttl = self.ttl if ttl is None else ttl
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation
+        try:
+            value = await self._load(key, loader, ttl, generation)
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        if generation == self._generation:
+            self.set(key, value, ttl)
+        future.set_result(value)
+        return value
+
+    def stats(self):
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "backend_hits": self.backend_hits,
+        }
+
+async def invalidate_caches(*names: str):
+    """Clear caches by name (used when a write affects another module's cached reads)"""
+    for name in names:
+        cache = _caches.get(name)
+        if cache is not None:
+            await cache.invalidate()
+
+def get_cache_stats():
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+# ==================== LIFECYCLE ====================
+
+def _on_invalidation(message: str):
+    try:
+        payload = json.loads(message)
+    except (json.JSONDecodeError, TypeError):
+        return
+    if payload.get("origin") == _instance_id:
+        return
+    cache = _caches.get(payload.get("cache"))
+    if cache is not None:
+        cache.invalidate_local(payload.get("key"))
+
+async def init_cache_backend():
+    """Connect the configured backend and listen for invalidations from other workers"""
+    global _backend
+    if CACHE_BACKEND == "redis":
+        from .redis_cache import RedisBackend
+        _backend = RedisBackend(CACHE_REDIS_URL)
+    elif CACHE_BACKEND == "memory":
+        _backend = MemoryBackend()
+    else:
+        raise ValueError(f"Unknown CACHE_BACKEND: {CACHE_BACKEND}")
+    await _backend.subscribe(CACHE_INVALIDATION_CHANNEL, _on_invalidation)
+    logger.info(f"Cache backend ready: {CACHE_BACKEND}")
+
+async def close_cache_backend():
+    await _backend.close()
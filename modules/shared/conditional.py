@@ -0,0 +1,111 @@
+import hashlib
+import time
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+
+# How many URLs we remember a Last-Modified time for
+LAST_MODIFIED_MAXSIZE = 4096
+
+class ConditionalGetMiddleware:
+    """
+    Adds a strong ETag (content hash) and Last-Modified to successful JSON GET
+    responses and answers 304 Not Modified when the client already has them.
+    Streaming and non-JSON responses pass through untouched.
+    """
+    def __init__(self, app, maxsize: int = LAST_MODIFIED_MAXSIZE):
+        self.app = app
+        self.maxsize = maxsize
+        # url -> (etag, last_modified epoch seconds); Last-Modified is the
+        # first time this worker saw the current representation
+        self._seen = OrderedDict()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = dict(scope["headers"])
+        start_message = None
+        body_parts = []
+        passthrough = False
+
+        async def buffered_send(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = dict(message.get("headers", []))
+                content_type = headers.get(b"content-type", b"")
+                if message["status"] != 200 or not content_type.startswith(b"application/json"):
+                    passthrough = True
+                    await send(message)
+                    return
+                start_message = message
+                return
+            if message["type"] == "http.response.body":
+                body_parts.append(message.get("body", b""))
+                if message.get("more_body", False):
+                    return
+                await self._finish(scope, request_headers, start_message, b"".join(body_parts), send)
+
+        await self.app(scope, receive, buffered_send)
+
+    def _last_modified(self, scope, request_headers, etag: str):
+        # Per-user responses share a URL, so only track public ones
+        if b"authorization" in request_headers:
+            return None
+        url = scope["path"] + ("?" + scope["query_string"].decode("latin-1") if scope["query_string"] else "")
+        seen = self._seen.get(url)
+        if seen is None or seen[0] != etag:
+            seen = (etag, int(time.time()))
+        self._seen[url] = seen
+        self._seen.move_to_end(url)
+        while len(self._seen) > self.maxsize:
+            self._seen.popitem(last=False)
+        return seen[1]
+
+    @staticmethod
+    def _etag_matches(if_none_match: str, etag: str):
+        if if_none_match.strip() == "*":
+            return True
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        # Weak comparison, as RFC 9110 requires for If-None-Match
+        return etag in candidates or f"W/{etag}" in candidates
+
+    @staticmethod
+    def _not_modified_since(if_modified_since: str, last_modified: int):
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return last_modified <= since
+
+    async def _finish(self, scope, request_headers, start_message, body: bytes, send):
+        etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        last_modified = self._last_modified(scope, request_headers, etag)
+
+        validators = [(b"etag", etag.encode("latin-1"))]
+        if last_modified is not None:
+            validators.append((b"last-modified", formatdate(last_modified, usegmt=True).encode("latin-1")))
+
+        if_none_match = request_headers.get(b"if-none-match")
+        if_modified_since = request_headers.get(b"if-modified-since")
+        if if_none_match is not None:
+            not_modified = self._etag_matches(if_none_match.decode("latin-1"), etag)
+        elif if_modified_since is not None and last_modified is not None:
+            not_modified = self._not_modified_since(if_modified_since.decode("latin-1"), last_modified)
+        else:
+            not_modified = False
+
+        if not_modified:
+            headers = [
+                (name, value) for name, value in start_message.get("headers", [])
+                if name not in (b"content-length", b"content-type")
+            ]
+            await send({"type": "http.response.start", "status": 304, "headers": headers + validators})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        await send({**start_message, "headers": list(start_message.get("headers", [])) + validators})
+        await send({"type": "http.response.body", "body": body})
@@ -21,6 +21,41 @@ async def run_all_migrations(conn: asyncpg.Connection):
                 "name": "match_goals",
                 "path": Path(__file__).parent.parent / "matches" / "migrations_goals.sql",
                 "description": "Add match goals tracking table"
+            },
+            {
+                "name": "match_scores",
+                "path": Path(__file__).parent.parent / "matches" / "migrations_scores.sql",
+                "description": "Keep match score columns in sync with match goals"
+            },
+            {
+                "name": "standings",
+                "path": Path(__file__).parent.parent / "standings" / "migrations_standings.sql",
+                "description": "Add materialized league standings table"
+            },
+            {
+                "name": "pagination_indexes",
+                "path": Path(__file__).parent / "migrations_pagination.sql",
+                "description": "Add composite indexes for keyset pagination"
+            },
+            {
+                "name": "news",
+                "path": Path(__file__).parent.parent / "news" / "migrations_news.sql",
+                "description": "Add news listing indexes, full-text search and scheduling"
+            },
+            {
+                "name": "auth",
+                "path": Path(__file__).parent.parent / "auth" / "migrations_auth.sql",
+                "description": "Compact token blacklist keyed by digest, with created_at and expiry indexes"
+            },
+            {
+                "name": "players",
+                "path": Path(__file__).parent.parent / "players" / "migrations_players.sql",
+                "description": "Promote player position and squad number to indexed columns"
+            },
+            {
+                "name": "player_stats",
+                "path": Path(__file__).parent.parent / "players" / "migrations_player_stats.sql",
+                "description": "Add per-season player stats table for top scorers and clean sheets"
             }
         ]
         
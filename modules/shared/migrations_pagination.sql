@@ -0,0 +1,17 @@
+-- Composite indexes backing keyset pagination; each one matches the ORDER BY
+-- of the corresponding *_page query so a page is a single index range scan.
+
+CREATE INDEX IF NOT EXISTS idx_matches_keyset
+    ON matches ((COALESCE(date, '-infinity'::date)), (COALESCE(time, '00:00'::time)), match_id);
+
+CREATE INDEX IF NOT EXISTS idx_matches_season_keyset
+    ON matches (season_id, (COALESCE(date, '-infinity'::date)), (COALESCE(time, '00:00'::time)), match_id);
+
+CREATE INDEX IF NOT EXISTS idx_players_keyset
+    ON players ((COALESCE(first_name, '') || ' ' || COALESCE(last_name, '')), player_id);
+
+CREATE INDEX IF NOT EXISTS idx_players_team_keyset
+    ON players (team_id, (COALESCE(first_name, '') || ' ' || COALESCE(last_name, '')), player_id);
+
+CREATE INDEX IF NOT EXISTS idx_teams_keyset
+    ON teams (team_name, team_id);
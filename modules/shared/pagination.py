@@ -0,0 +1,59 @@
+import base64
+import json
+import os
+from datetime import date, datetime, time
+from fastapi import HTTPException
+
+PAGE_SIZE_DEFAULT = int(os.getenv("PAGE_SIZE_DEFAULT", "50"))
+PAGE_SIZE_MAX = int(os.getenv("PAGE_SIZE_MAX", "200"))
+
+def clamp_limit(limit: int = None) -> int:
+    """Page size from the query string, capped at PAGE_SIZE_MAX"""
+    if limit is None:
+        return PAGE_SIZE_DEFAULT
+    return max(1, min(limit, PAGE_SIZE_MAX))
+
+def _cursor_default(obj):
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} can't be used in a cursor")
+
+def encode_cursor(*values) -> str:
+    """Opaque cursor holding the sort key of the last row of a page"""
+    raw = json.dumps(values, default=_cursor_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, *types):
+    """
+    Decode a cursor back into its sort key, converting each value with the
+    matching callable in types (e.g. date.fromisoformat, int).
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("cursor has the wrong shape")
+        return [convert(value) for convert, value in zip(types, values)]
+    except (ValueError, TypeError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def nullable(convert):
+    """
+    Converter for a sort column that may be NULL. The cursor keeps the NULL,
+    and the query maps it to the same sentinel its COALESCE sort key uses.
+    """
+    return lambda value: None if value is None else convert(value)
+
+def page(rows: list, limit: int, sort_key) -> dict:
+    """
+    Build a page from rows fetched with LIMIT limit + 1; the extra row only
+    tells us whether there is a next page. sort_key(row) returns the values
+    the next cursor should start after.
+    """
+    has_more = len(rows) > limit
+    items = rows[:limit]
+    return {
+        "items": items,
+        "next_cursor": encode_cursor(*sort_key(items[-1])) if has_more else None,
+        "limit": limit,
+    }
@@ -0,0 +1,203 @@
+import asyncio
+import logging
+from collections import deque
+from urllib.parse import urlparse
+from .cache import CacheBackend, MISSING, dump_value, load_value
+
+logger = logging.getLogger(__name__)
+
+class RedisError(Exception):
+    pass
+
+# ==================== RESP PROTOCOL ====================
+
+def encode_command(*args) -> bytes:
+    """Encode a command as a RESP array of bulk strings"""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode("utf-8")
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+async def read_reply(reader: asyncio.StreamReader):
+    """Read one RESP reply; error replies are returned as RedisError instances"""
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Connection closed by server")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload.decode("utf-8")
+    if kind == b"-":
+        return RedisError(payload.decode("utf-8"))
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length == -1:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if kind == b"*":
+        length = int(payload)
+        if length == -1:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise RedisError(f"Unexpected reply type: {line!r}")
+
+class RedisConnection:
+    """
+    Single pipelined connection: commands are written as they come and
+    replies are matched to callers in order by one reader task.
+    """
+    def __init__(self, url: str):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self._reader = None
+        self._writer = None
+        self._pending = deque()
+        self._reader_task = None
+        self._connect_lock = asyncio.Lock()
+
+    @property
+    def connected(self):
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def open(self):
+        """Connect and run AUTH/SELECT; returns the raw stream pair"""
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        for command in self._handshake():
+            writer.write(encode_command(*command))
+            await writer.drain()
+            reply = await read_reply(reader)
+            if isinstance(reply, RedisError):
+                writer.close()
+                raise reply
+        return reader, writer
+
+    def _handshake(self):
+        if self.password:
+            yield ("AUTH", self.password)
+        if self.db:
+            yield ("SELECT", self.db)
+
+    async def _ensure_connected(self):
+        if self.connected:
+            return
+        async with self._connect_lock:
+            if self.connected:
+                return
+            self._reader, self._writer = await self.open()
+            self._reader_task = asyncio.create_task(self._read_loop())
+
+    async def _read_loop(self):
+        try:
+            while True:
+                reply = await read_reply(self._reader)
+                future = self._pending.popleft()
+                if future.done():
+                    continue
+                if isinstance(reply, RedisError):
+                    future.set_exception(reply)
+                else:
+                    future.set_result(reply)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._fail_pending(e)
+
+    def _fail_pending(self, error):
+        if self._writer is not None:
+            self._writer.close()
+        self._writer = None
+        while self._pending:
+            future = self._pending.popleft()
+            if not future.done():
+                future.set_exception(ConnectionError(f"Redis connection lost: {error}"))
+
+    async def execute(self, *args):
+        await self._ensure_connected()
+        future = asyncio.get_running_loop().create_future()
+        # Write and enqueue without yielding so replies stay in command order
+        self._writer.write(encode_command(*args))
+        self._pending.append(future)
+        await self._writer.drain()
+        return await future
+
+    async def close(self):
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+        self._fail_pending("closed")
+
+# ==================== BACKEND ====================
+
+class RedisBackend(CacheBackend):
+    """Cache backend speaking the Redis protocol, with pub/sub invalidation"""
+    SCAN_BATCH = 500
+    RECONNECT_DELAY = 1.0
+
+    def __init__(self, url: str):
+        self.url = url
+        self._conn = RedisConnection(url)
+        self._subscriber_tasks = []
+
+    async def get(self, key: str):
+        raw = await self._conn.execute("GET", key)
+        if raw is None:
+            return MISSING
+        return load_value(raw)
+
+    async def set(self, key: str, value, ttl: float):
+        await self._conn.execute("SET", key, dump_value(value), "PX", max(int(ttl * 1000), 1))
+
+    async def delete(self, key: str):
+        await self._conn.execute("DEL", key)
+
+    async def delete_prefix(self, prefix: str):
+        cursor = b"0"
+        while True:
+            cursor, keys = await self._conn.execute("SCAN", cursor, "MATCH", f"{prefix}*", "COUNT", self.SCAN_BATCH)
+            if keys:
+                await self._conn.execute("DEL", *keys)
+            if cursor in (b"0", 0):
+                break
+
+    async def publish(self, channel: str, message: str):
+        await self._conn.execute("PUBLISH", channel, message)
+
+    async def subscribe(self, channel: str, handler):
+        self._subscriber_tasks.append(asyncio.create_task(self._listen(channel, handler)))
+
+    async def _listen(self, channel: str, handler):
+        """Dedicated subscriber connection; reconnects until the backend is closed"""
+        while True:
+            writer = None
+            try:
+                reader, writer = await RedisConnection(self.url).open()
+                writer.write(encode_command("SUBSCRIBE", channel))
+                await writer.drain()
+                while True:
+                    reply = await read_reply(reader)
+                    if isinstance(reply, list) and len(reply) == 3 and reply[0] == b"message":
+                        try:
+                            handler(reply[2].decode("utf-8"))
+                        except Exception as e:
+                            logger.error(f"Cache invalidation handler failed: {e}", exc_info=True)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️  Cache subscriber on '{channel}' disconnected: {e}")
+                await asyncio.sleep(self.RECONNECT_DELAY)
+            finally:
+                if writer is not None:
+                    writer.close()
+
+    async def close(self):
+        for task in self._subscriber_tasks:
+            task.cancel()
+        self._subscriber_tasks = []
+        await self._conn.close()
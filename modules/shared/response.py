@@ -1,7 +1,14 @@
 from fastapi.responses import JSONResponse
-from datetime import datetime, date
+from datetime import datetime, date, time
+from decimal import Decimal
+from asyncpg import Record
 import json
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 class DateTimeEncoder(json.JSONEncoder):
     """Custom JSON encoder that handles datetime objects"""
     def default(self, obj):
@@ -19,9 +26,35 @@ def serialize_data(data):
         return data.isoformat()
     return data
 
+def json_default(obj):
+    """Types the encoders don't know natively"""
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, Record):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(content) -> bytes:
+    """Encode content to JSON bytes in a single pass (orjson when installed)"""
+    if orjson is not None:
+        return orjson.dumps(content, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content,
+        default=json_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that encodes datetimes, Decimals and Records itself"""
+    def render(self, content) -> bytes:
+        return dumps(content)
+
 def success_response(data, status_code=200):
-    serialized_data = serialize_data(data)
-    return JSONResponse(status_code=status_code, content={"status": "success", "data": serialized_data})
+    return FastJSONResponse(status_code=status_code, content={"status": "success", "data": data})
 
 def error_response(message, status_code=400):
-    return JSONResponse(status_code=status_code, content={"status": "error", "message": message})
\ No newline at end of file
+    return FastJSONResponse(status_code=status_code, content={"status": "error", "message": message})
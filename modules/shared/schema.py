@@ -8,8 +8,9 @@ CREATE TABLE IF NOT EXISTS users (
 );
 
 CREATE TABLE IF NOT EXISTS token_blacklist (
-    token TEXT PRIMARY KEY,
-    expires_at TIMESTAMP NOT NULL
+    token_hash BYTEA PRIMARY KEY,
+    expires_at TIMESTAMP NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
 );
 
 CREATE TABLE IF NOT EXISTS leagues (
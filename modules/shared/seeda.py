@@ -1,11 +1,11 @@
-import bcrypt
-from modules.shared.db import get_db_connection
+from modules.shared.db import acquire_connection
+from modules.auth.passwords import hash_password
 
 async def seed_data():
-    conn = await get_db_connection()
-    try:
+    # Hash before taking a connection so the bcrypt work doesn't hold the pool
+    admin_password = await hash_password("admin123")
+    async with acquire_connection() as conn:
         # Seed users only - 4 users (balanced for different roles)
-        admin_password = bcrypt.hashpw("admin123".encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
         await conn.execute("""
             INSERT INTO users (username, email, password, role)
             VALUES 
@@ -15,6 +15,3 @@ async def seed_data():
                 ('fan1', 'fan1@crimax.com', $1, 'guest')
             ON CONFLICT (username) DO NOTHING;
         """, admin_password)
-
-    finally:
-        await conn.close()
\ No newline at end of file
@@ -0,0 +1,76 @@
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Every periodic task registers itself here so main can start/stop them together
+_tasks = {}
+
+class PeriodicTask:
+    """
+    Runs func() every interval seconds in the background. Errors are logged
+    and the task keeps going. With run_on_stop, func() runs one last time on
+    shutdown (e.g. to flush buffered writes).
+    """
+    def __init__(self, name: str, interval: float, func, run_on_stop: bool = False):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.run_on_stop = run_on_stop
+        self.runs = 0
+        self.failures = 0
+        self._task = None
+        self._run = None  # run_once() in progress, if any
+        _tasks[name] = self
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            # Shielded so stop() lets a run finish instead of cancelling it halfway
+            self._run = asyncio.ensure_future(self.run_once())
+            try:
+                await asyncio.shield(self._run)
+            finally:
+                if self._run.done():
+                    self._run = None
+
+    async def run_once(self):
+        try:
+            await self.func()
+            self.runs += 1
+        except Exception as e:
+            self.failures += 1
+            logger.error(f"❌ Periodic task '{self.name}' failed: {e}", exc_info=True)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._run is not None:
+            await self._run
+            self._run = None
+        if self.run_on_stop:
+            await self.run_once()
+
+    def stats(self):
+        return {"interval": self.interval, "running": self._task is not None, "runs": self.runs, "failures": self.failures}
+
+def start_periodic_tasks():
+    for task in _tasks.values():
+        task.start()
+    logger.info(f"Started {len(_tasks)} periodic task(s): {', '.join(_tasks)}")
+
+async def stop_periodic_tasks():
+    for task in _tasks.values():
+        await task.stop()
+
+def get_task_stats():
+    return {name: task.stats() for name, task in _tasks.items()}
@@ -0,0 +1,232 @@
+-- Materialized league table, kept up to date incrementally from matches
+CREATE TABLE IF NOT EXISTS standings (
+    league_id INT NOT NULL REFERENCES leagues(league_id) ON DELETE CASCADE,
+    team_id INT NOT NULL REFERENCES teams(team_id) ON DELETE CASCADE,
+    matches_played INT NOT NULL DEFAULT 0,
+    wins INT NOT NULL DEFAULT 0,
+    draws INT NOT NULL DEFAULT 0,
+    losses INT NOT NULL DEFAULT 0,
+    goals_for INT NOT NULL DEFAULT 0,
+    goals_against INT NOT NULL DEFAULT 0,
+    points INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (league_id, team_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_standings_table
+    ON standings(league_id, points DESC, (goals_for - goals_against) DESC, goals_for DESC);
+
+-- One match result entering (sign = 1) or leaving (sign = -1) the table
+DO $$
+BEGIN
+    CREATE TYPE standings_change AS (
+        season_id INT, team1_id INT, team2_id INT, home_score INT, away_score INT, sign INT
+    );
+EXCEPTION WHEN duplicate_object THEN
+    NULL;
+END;
+$$;
+
+-- Apply the results leaving (old_matches) and entering (new_matches) the
+-- table, aggregated per team so a bulk write touches each standings row
+-- once. Deltas are applied under the row lock, so concurrent goal writes on
+-- different matches of the same team never overwrite each other.
+-- A match counts towards the table once a goal has been recorded for it.
+CREATE OR REPLACE FUNCTION matches_sync_standings() RETURNS TRIGGER AS $$
+DECLARE
+    v_changes standings_change[];
+BEGIN
+    -- The transition table queries are planned once per session with whatever
+    -- row counts came first, so they stick to set operations that stay linear
+    -- under any plan (a join of old_matches to new_matches would not).
+    IF TG_OP = 'UPDATE' THEN
+        -- Only matches whose result, season or teams actually changed
+        v_changes := ARRAY(
+            SELECT ROW(season_id, team1_id, team2_id, home_score, away_score, -1)::standings_change
+            FROM (
+                SELECT match_id, season_id, team1_id, team2_id, home_score, away_score FROM old_matches
+                EXCEPT
+                SELECT match_id, season_id, team1_id, team2_id, home_score, away_score FROM new_matches
+            ) o
+            UNION ALL
+            SELECT ROW(season_id, team1_id, team2_id, home_score, away_score, 1)::standings_change
+            FROM (
+                SELECT match_id, season_id, team1_id, team2_id, home_score, away_score FROM new_matches
+                EXCEPT
+                SELECT match_id, season_id, team1_id, team2_id, home_score, away_score FROM old_matches
+            ) n
+        );
+    ELSIF TG_OP = 'INSERT' THEN
+        v_changes := ARRAY(
+            SELECT ROW(season_id, team1_id, team2_id, home_score, away_score, 1)::standings_change
+            FROM new_matches
+        );
+    ELSE
+        v_changes := ARRAY(
+            SELECT ROW(season_id, team1_id, team2_id, home_score, away_score, -1)::standings_change
+            FROM old_matches
+        );
+    END IF;
+
+    IF cardinality(v_changes) = 0 THEN
+        RETURN NULL;
+    END IF;
+
+    WITH changes AS (
+        SELECT * FROM unnest(v_changes)
+    )
+    INSERT INTO standings AS st (
+        league_id, team_id, matches_played, wins, draws, losses,
+        goals_for, goals_against, points, updated_at
+    )
+    SELECT
+        r.league_id,
+        r.team_id,
+        SUM(r.sign),
+        SUM(r.sign * (r.score_for > r.score_against)::int),
+        SUM(r.sign * (r.score_for = r.score_against)::int),
+        SUM(r.sign * (r.score_for < r.score_against)::int),
+        SUM(r.sign * r.score_for),
+        SUM(r.sign * r.score_against),
+        SUM(r.sign * CASE
+            WHEN r.score_for > r.score_against THEN 3
+            WHEN r.score_for = r.score_against THEN 1
+            ELSE 0
+        END),
+        NOW()
+    FROM (
+        SELECT s.league_id, c.team1_id AS team_id, c.sign,
+               COALESCE(c.home_score, 0) AS score_for, COALESCE(c.away_score, 0) AS score_against
+        FROM changes c
+        JOIN seasons s ON c.season_id = s.season_id
+        WHERE (COALESCE(c.home_score, 0) > 0 OR COALESCE(c.away_score, 0) > 0)
+          AND c.team1_id IS NOT NULL AND c.team2_id IS NOT NULL
+        UNION ALL
+        SELECT s.league_id, c.team2_id AS team_id, c.sign,
+               COALESCE(c.away_score, 0) AS score_for, COALESCE(c.home_score, 0) AS score_against
+        FROM changes c
+        JOIN seasons s ON c.season_id = s.season_id
+        WHERE (COALESCE(c.home_score, 0) > 0 OR COALESCE(c.away_score, 0) > 0)
+          AND c.team1_id IS NOT NULL AND c.team2_id IS NOT NULL
+    ) r
+    WHERE r.league_id IS NOT NULL
+    GROUP BY r.league_id, r.team_id
+    -- Sorted so concurrent writers lock standings rows in the same order
+    ORDER BY r.league_id, r.team_id
+    ON CONFLICT (league_id, team_id) DO UPDATE
+    SET matches_played = st.matches_played + EXCLUDED.matches_played,
+        wins = st.wins + EXCLUDED.wins,
+        draws = st.draws + EXCLUDED.draws,
+        losses = st.losses + EXCLUDED.losses,
+        goals_for = st.goals_for + EXCLUDED.goals_for,
+        goals_against = st.goals_against + EXCLUDED.goals_against,
+        points = st.points + EXCLUDED.points,
+        updated_at = NOW();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Replaced by the statement-level triggers below
+DROP TRIGGER IF EXISTS trg_matches_standings_insert_delete ON matches;
+DROP FUNCTION IF EXISTS standings_apply_match(INT, INT, INT, INT, INT, INT);
+DROP FUNCTION IF EXISTS standings_apply_result(INT, INT, INT, INT, INT);
+
+DROP TRIGGER IF EXISTS trg_matches_standings_insert ON matches;
+CREATE TRIGGER trg_matches_standings_insert
+AFTER INSERT ON matches
+REFERENCING NEW TABLE AS new_matches
+FOR EACH STATEMENT EXECUTE FUNCTION matches_sync_standings();
+
+DROP TRIGGER IF EXISTS trg_matches_standings_update ON matches;
+CREATE TRIGGER trg_matches_standings_update
+AFTER UPDATE ON matches
+REFERENCING OLD TABLE AS old_matches NEW TABLE AS new_matches
+FOR EACH STATEMENT EXECUTE FUNCTION matches_sync_standings();
+
+DROP TRIGGER IF EXISTS trg_matches_standings_delete ON matches;
+CREATE TRIGGER trg_matches_standings_delete
+AFTER DELETE ON matches
+REFERENCING OLD TABLE AS old_matches
+FOR EACH STATEMENT EXECUTE FUNCTION matches_sync_standings();
+
+-- Full rebuild for one league (or every league when NULL), returns rows written
+CREATE OR REPLACE FUNCTION rebuild_standings(p_league_id INT DEFAULT NULL) RETURNS INTEGER AS $$
+DECLARE
+    written INTEGER;
+BEGIN
+    -- Hold off concurrent match writes so their deltas can't interleave with the rebuild
+    LOCK TABLE matches IN SHARE MODE;
+
+    DELETE FROM standings WHERE p_league_id IS NULL OR league_id = p_league_id;
+
+    INSERT INTO standings (
+        league_id, team_id, matches_played, wins, draws, losses,
+        goals_for, goals_against, points, updated_at
+    )
+    SELECT
+        r.league_id,
+        r.team_id,
+        COUNT(*),
+        COUNT(*) FILTER (WHERE r.score_for > r.score_against),
+        COUNT(*) FILTER (WHERE r.score_for = r.score_against),
+        COUNT(*) FILTER (WHERE r.score_for < r.score_against),
+        SUM(r.score_for),
+        SUM(r.score_against),
+        SUM(CASE
+            WHEN r.score_for > r.score_against THEN 3
+            WHEN r.score_for = r.score_against THEN 1
+            ELSE 0
+        END),
+        NOW()
+    FROM (
+        SELECT s.league_id, m.team1_id AS team_id,
+               COALESCE(m.home_score, 0) AS score_for, COALESCE(m.away_score, 0) AS score_against
+        FROM matches m
+        JOIN seasons s ON m.season_id = s.season_id
+        WHERE (COALESCE(m.home_score, 0) > 0 OR COALESCE(m.away_score, 0) > 0)
+          AND m.team1_id IS NOT NULL AND m.team2_id IS NOT NULL
+        UNION ALL
+        SELECT s.league_id, m.team2_id AS team_id,
+               COALESCE(m.away_score, 0) AS score_for, COALESCE(m.home_score, 0) AS score_against
+        FROM matches m
+        JOIN seasons s ON m.season_id = s.season_id
+        WHERE (COALESCE(m.home_score, 0) > 0 OR COALESCE(m.away_score, 0) > 0)
+          AND m.team1_id IS NOT NULL AND m.team2_id IS NOT NULL
+    ) r
+    WHERE r.league_id IS NOT NULL
+      AND (p_league_id IS NULL OR r.league_id = p_league_id)
+    GROUP BY r.league_id, r.team_id;
+
+    GET DIAGNOSTICS written = ROW_COUNT;
+    RETURN written;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Moving a season to another league moves its results with it
+CREATE OR REPLACE FUNCTION seasons_sync_standings() RETURNS TRIGGER AS $$
+BEGIN
+    IF OLD.league_id IS NOT NULL THEN
+        PERFORM rebuild_standings(OLD.league_id);
+    END IF;
+    IF NEW.league_id IS NOT NULL THEN
+        PERFORM rebuild_standings(NEW.league_id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_seasons_standings ON seasons;
+CREATE TRIGGER trg_seasons_standings
+AFTER UPDATE OF league_id ON seasons
+FOR EACH ROW
+WHEN (OLD.league_id IS DISTINCT FROM NEW.league_id)
+EXECUTE FUNCTION seasons_sync_standings();
+
+-- Populate on first deploy only; use rebuild_standings() to repair later
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM standings) THEN
+        PERFORM rebuild_standings();
+    END IF;
+END;
+$$;
@@ -0,0 +1,20 @@
+import asyncio
+import asyncpg
+import sys
+from modules.shared.db import DATABASE_URL
+
+async def run_rebuild(league_id=None):
+    """Rebuild the standings table (run as: python -m modules.standings.run_standings_rebuild [league_id])"""
+    conn = await asyncpg.connect(DATABASE_URL)
+    
+    try:
+        written = await conn.fetchval("SELECT rebuild_standings($1)", league_id)
+        print(f"✅ Standings rebuild completed: {written} row(s) written")
+        
+    except Exception as e:
+        print(f"❌ Standings rebuild failed: {e}")
+    finally:
+        await conn.close()
+
+if __name__ == "__main__":
+    asyncio.run(run_rebuild(int(sys.argv[1]) if len(sys.argv) > 1 else None))
@@ -1,58 +1,58 @@
-from modules.shared.db import get_db_connection
+from modules.shared.db import acquire_connection
+from modules.shared.cache import TTLCache
+from modules.shared.pagination import clamp_limit, decode_cursor, page
 from .models import TeamCreate, TeamUpdate
-import json
+
+_cache = TTLCache("teams")
 
 async def get_teams():
-    conn = await get_db_connection()
-    try:
-        teams = await conn.fetch("SELECT * FROM teams")
-        result = []
-        for team in teams:
-            team_dict = dict(team)
-            # Parse contact_info JSON string to dict
-            if team_dict.get('contact_info'):
-                try:
-                    team_dict['contact_info'] = json.loads(team_dict['contact_info'])
-                except (json.JSONDecodeError, TypeError):
-                    team_dict['contact_info'] = {}
-            result.append(team_dict)
-        return result
-    finally:
-        await conn.close()
+    return await _cache.get_or_load("all", _fetch_teams)
+
+async def get_teams_page(cursor: str = None, limit: int = None):
+    limit = clamp_limit(limit)
+    return await _cache.get_or_load(("page", cursor, limit), lambda: _fetch_teams_page(cursor, limit))
 
 async def get_team_by_id(team_id: int):
-    conn = await get_db_connection()
-    try:
+    return await _cache.get_or_load(("id", team_id), lambda: _fetch_team_by_id(team_id))
+
+async def _fetch_teams():
+    async with acquire_connection() as conn:
+        teams = await conn.fetch("SELECT * FROM teams")
+        return [dict(team) for team in teams]
+
+async def _fetch_teams_page(cursor: str, limit: int):
+    """One page of teams ordered by name and id"""
+    async with acquire_connection() as conn:
+        if cursor:
+            after_name, after_id = decode_cursor(cursor, str, int)
+            teams = await conn.fetch("""
+                SELECT * FROM teams
+                WHERE (team_name, team_id) > ($1, $2)
+                ORDER BY team_name, team_id
+                LIMIT $3
+            """, after_name, after_id, limit + 1)
+        else:
+            teams = await conn.fetch("SELECT * FROM teams ORDER BY team_name, team_id LIMIT $1", limit + 1)
+        return page([dict(team) for team in teams], limit, lambda team: (team["team_name"], team["team_id"]))
+
+async def _fetch_team_by_id(team_id: int):
+    async with acquire_connection() as conn:
         team = await conn.fetchrow("SELECT * FROM teams WHERE team_id = $1", team_id)
-        if team:
-            team_dict = dict(team)
-            # Parse contact_info JSON string to dict
-            if team_dict.get('contact_info'):
-                try:
-                    team_dict['contact_info'] = json.loads(team_dict['contact_info'])
-                except (json.JSONDecodeError, TypeError):
-                    team_dict['contact_info'] = {}
-            return team_dict
-        return None
-    finally:
-        await conn.close()
+        return dict(team) if team else None
 
 async def create_team(team: TeamCreate):
-    contact_info = json.dumps(team.contact_info) if team.contact_info else None
-    conn = await get_db_connection()
-    try:
+    contact_info = team.contact_info or None
+    async with acquire_connection() as conn:
         team_id = await conn.fetchval("""
             INSERT INTO teams (league_id, division_id, team_name, logo, contact_info)
             VALUES ($1, $2, $3, $4, $5) RETURNING team_id
         """, team.league_id, team.division_id, team.team_name, team.logo, contact_info)
+        await _cache.invalidate()
         return team_id
-    finally:
-        await conn.close()
 
 async def update_team(team_id: int, team: TeamUpdate):
-    conn = await get_db_connection()
-    contact_info = json.dumps(team.contact_info) if team.contact_info else None
-    try:
+    contact_info = team.contact_info or None
+    async with acquire_connection() as conn:
         result = await conn.execute("""
             UPDATE teams 
             SET team_name = COALESCE($2, team_name),
@@ -62,14 +62,11 @@ async def update_team(team_id: int, team: TeamUpdate):
                 division_id = COALESCE($6, division_id)
             WHERE team_id = $1
         """, team_id, team.team_name, team.logo, contact_info, team.league_id, team.division_id)
+        await _cache.invalidate()
         return result == "UPDATE 1"
-    finally:
-        await conn.close()
 
 async def delete_team(team_id: int):
-    conn = await get_db_connection()
-    try:
+    async with acquire_connection() as conn:
         result = await conn.execute("DELETE FROM teams WHERE team_id = $1", team_id)
-        return result == "DELETE 1"
-    finally:
-        await conn.close()
\ No newline at end of file
+        await _cache.invalidate()
+        return result == "DELETE 1"
\ No newline at end of file
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
-from .manager import get_teams, get_team_by_id, create_team, update_team, delete_team
+from .manager import get_teams, get_teams_page, get_team_by_id, create_team, update_team, delete_team
 from .models import TeamCreate, TeamUpdate
 from modules.shared.response import success_response, error_response
 from modules.auth.router import get_current_user
@@ -7,9 +7,11 @@ from modules.auth.router import get_current_user
 router = APIRouter()
 
 @router.get("/")
-async def list_teams():
-    teams = await get_teams()
-    return success_response(teams)
+async def list_teams(cursor: str = None, limit: int = None, paginate: bool = True):
+    """Teams by name; pass paginate=false for the full unpaginated list"""
+    if not paginate:
+        return success_response(await get_teams())
+    return success_response(await get_teams_page(cursor, limit))
 
 @router.get("/{team_id}")
 async def get_team(team_id: int):
@@ -1,38 +1,38 @@
-from modules.shared.db import get_db_connection
+from modules.shared.db import acquire_connection
+from modules.shared.cache import TTLCache
 from .models import VenueCreate, VenueUpdate
 
+_cache = TTLCache("venues")
+
 async def get_venues():
-    conn = await get_db_connection()
-    try:
+    return await _cache.get_or_load("all", _fetch_venues)
+
+async def get_venue_by_id(venue_id: int):
+    return await _cache.get_or_load(("id", venue_id), lambda: _fetch_venue_by_id(venue_id))
+
+async def _fetch_venues():
+    async with acquire_connection() as conn:
         venues = await conn.fetch("SELECT * FROM venues ORDER BY venue_name")
         return [dict(venue) for venue in venues]
-    finally:
-        await conn.close()
 
-async def get_venue_by_id(venue_id: int):
-    conn = await get_db_connection()
-    try:
+async def _fetch_venue_by_id(venue_id: int):
+    async with acquire_connection() as conn:
         venue = await conn.fetchrow("SELECT * FROM venues WHERE venue_id = $1", venue_id)
         if venue:
             return dict(venue)
         return None
-    finally:
-        await conn.close()
 
 async def create_venue(venue: VenueCreate):
-    conn = await get_db_connection()
-    try:
+    async with acquire_connection() as conn:
         venue_id = await conn.fetchval("""
             INSERT INTO venues (venue_name, address, capacity)
             VALUES ($1, $2, $3) RETURNING venue_id
         """, venue.venue_name, venue.address, venue.capacity)
+        await _cache.invalidate()
         return venue_id
-    finally:
-        await conn.close()
 
 async def update_venue(venue_id: int, venue: VenueUpdate):
-    conn = await get_db_connection()
-    try:
+    async with acquire_connection() as conn:
         result = await conn.execute("""
             UPDATE venues 
             SET venue_name = COALESCE($2, venue_name),
@@ -40,14 +40,11 @@ async def update_venue(venue_id: int, venue: VenueUpdate):
                 capacity = COALESCE($4, capacity)
             WHERE venue_id = $1
         """, venue_id, venue.venue_name, venue.address, venue.capacity)
+        await _cache.invalidate()
         return result == "UPDATE 1"
-    finally:
-        await conn.close()
 
 async def delete_venue(venue_id: int):
-    conn = await get_db_connection()
-    try:
+    async with acquire_connection() as conn:
         result = await conn.execute("DELETE FROM venues WHERE venue_id = $1", venue_id)
+        await _cache.invalidate()
         return result == "DELETE 1"
-    finally:
-        await conn.close()
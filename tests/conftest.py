@@ -0,0 +1,90 @@
+import os
+import uuid
+import pytest
+
+# Database-backed tests run the full app (schema, migrations, seed data) against
+# this database and leave rows behind, so point it at a throwaway database.
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture(scope="session")
+def client():
+    """TestClient for the app, started against TEST_DATABASE_URL"""
+    if not TEST_DATABASE_URL:
+        pytest.skip("set TEST_DATABASE_URL to run database-backed tests")
+    from fastapi.testclient import TestClient
+    from modules.shared import db
+    db.DATABASE_URL = TEST_DATABASE_URL
+    from main import app
+    with TestClient(app) as client:
+        yield client
+
+@pytest.fixture
+def run(client):
+    """Run a coroutine function on the app's event loop, where the pool lives"""
+    def call(func, *args):
+        return client.portal.call(func, *args)
+    return call
+
+@pytest.fixture
+def fetch(run):
+    """Query the test database through the app's pool"""
+    from modules.shared.db import acquire_connection
+
+    async def _fetch(query, *args):
+        async with acquire_connection() as conn:
+            return [dict(row) for row in await conn.fetch(query, *args)]
+
+    return lambda query, *args: run(_fetch, query, *args)
+
+@pytest.fixture
+def page_through(client):
+    """Follow next_cursor from the first page to the last, returning every item"""
+    def follow(path, params, limit, items_key="items", headers=None):
+        items, cursor = [], None
+        for _ in range(100):
+            query = {**params, "limit": limit, **({"cursor": cursor} if cursor else {})}
+            data = client.get(path, params=query, headers=headers).json()["data"]
+            items.extend(data[items_key])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                return items
+        raise AssertionError(f"paging {path} did not reach the last page")
+    return follow
+
+@pytest.fixture(scope="session")
+def admin_headers(client):
+    response = client.post("/auth/login", json={"username": "admin", "password": "admin123"})
+    return {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+
+@pytest.fixture(scope="session")
+def guest_headers(client):
+    """A logged-in user without editing rights"""
+    username = f"guest_{uuid.uuid4().hex[:8]}"
+    client.post("/auth/register", json={
+        "username": username, "email": f"{username}@example.com", "password": "secret123", "role": "guest"
+    })
+    response = client.post("/auth/login", json={"username": username, "password": "secret123"})
+    return {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+
+@pytest.fixture
+def unique():
+    """Suffix that keeps names unique across runs on the same database"""
+    return uuid.uuid4().hex[:8]
+
+@pytest.fixture
+def season(fetch, unique):
+    """A fresh league with two teams and a season"""
+    league_id = fetch("INSERT INTO leagues (league_name) VALUES ($1) RETURNING league_id", f"League {unique}")[0]["league_id"]
+    team_ids = [
+        fetch("INSERT INTO teams (league_id, team_name) VALUES ($1, $2) RETURNING team_id", league_id, f"Team {unique} {side}")[0]["team_id"]
+        for side in ("home", "away")
+    ]
+    season_id = fetch("""
+        INSERT INTO seasons (league_id, season_name, start_date, end_date)
+        VALUES ($1, '2025', '2025-01-01', '2025-12-31') RETURNING season_id
+    """, league_id)[0]["season_id"]
+    return {"league_id": league_id, "season_id": season_id, "team_ids": team_ids}
@@ -0,0 +1,131 @@
+import asyncio
+import fnmatch
+import time
+from modules.shared.redis_cache import RedisError, read_reply
+
+def encode_reply(reply) -> bytes:
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, RedisError):
+        return b"-%s\r\n" % str(reply).encode("utf-8")
+    if isinstance(reply, str):
+        return b"+%s\r\n" % reply.encode("utf-8")
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, bytes):
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+    return b"*%d\r\n" % len(reply) + b"".join(encode_reply(item) for item in reply)
+
+class FakeRedisServer:
+    """
+    In-process server for the subset of Redis that RedisBackend uses:
+    AUTH, SELECT, PING, GET, SET PX, DEL, SCAN MATCH COUNT, PUBLISH, SUBSCRIBE
+    """
+    def __init__(self, password: str = None):
+        self.password = password
+        self.data = {}  # key -> (value, expires_at or None)
+        # Keys in insertion order; SCAN cursors are positions in it, so keys
+        # deleted mid-scan don't make it skip others (as Redis guarantees)
+        self._slots = {}  # key -> position
+        self._next_slot = 1
+        self.commands = []  # names of every command received, in order
+        self._subscribers = {}  # channel -> set of writers
+        self._writers = set()
+        self._server = None
+        self.port = None
+
+    @property
+    def url(self):
+        auth = f":{self.password}@" if self.password else ""
+        return f"redis://{auth}127.0.0.1:{self.port}/1"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.disconnect_all()
+        self._server.close()
+        await self._server.wait_closed()
+
+    def disconnect_all(self):
+        """Drop every client connection, as a server restart would"""
+        for writer in list(self._writers):
+            writer.close()
+
+    def subscriber_count(self, channel: str) -> int:
+        return len(self._subscribers.get(channel, ()))
+
+    async def _handle(self, reader, writer):
+        self._writers.add(writer)
+        authenticated = self.password is None
+        try:
+            while True:
+                command = await read_reply(reader)
+                name, args = command[0].decode("utf-8").upper(), command[1:]
+                self.commands.append(name)
+                if name == "AUTH":
+                    authenticated = args[0].decode("utf-8") == self.password
+                    reply = "OK" if authenticated else RedisError("WRONGPASS invalid password")
+                elif not authenticated:
+                    reply = RedisError("NOAUTH Authentication required")
+                else:
+                    reply = self._execute(name, args, writer)
+                writer.write(encode_reply(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            for writers in self._subscribers.values():
+                writers.discard(writer)
+            writer.close()
+
+    def _get(self, key):
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self.data[key]
+            return None
+        return entry[0]
+
+    def _execute(self, name, args, writer):
+        if name in ("SELECT", "PING"):
+            return "OK" if name == "SELECT" else "PONG"
+        if name == "GET":
+            return self._get(args[0])
+        if name == "SET":
+            expires_at = None
+            if len(args) == 4 and args[2].upper() == b"PX":
+                expires_at = time.monotonic() + int(args[3]) / 1000
+            self.data[args[0]] = (args[1], expires_at)
+            if args[0] not in self._slots:
+                self._slots[args[0]] = self._next_slot
+                self._next_slot += 1
+            return "OK"
+        if name == "DEL":
+            for key in args:
+                self._slots.pop(key, None)
+            return sum(self.data.pop(key, None) is not None for key in args)
+        if name == "SCAN":
+            start = int(args[0])
+            options = {args[i].upper(): args[i + 1] for i in range(1, len(args), 2)}
+            pattern = options.get(b"MATCH", b"*").decode("utf-8")
+            count = int(options.get(b"COUNT", 10))
+            remaining = sorted((slot, key) for key, slot in self._slots.items() if slot >= start)
+            batch = [key for _, key in remaining[:count]]
+            cursor = remaining[count][0] if len(remaining) > count else 0
+            return [str(cursor).encode(), [
+                key for key in batch
+                if self._get(key) is not None and fnmatch.fnmatchcase(key.decode("utf-8"), pattern)
+            ]]
+        if name == "PUBLISH":
+            subscribers = self._subscribers.get(args[0], set())
+            for subscriber in subscribers:
+                subscriber.write(encode_reply([b"message", args[0], args[1]]))
+            return len(subscribers)
+        if name == "SUBSCRIBE":
+            self._subscribers.setdefault(args[0], set()).add(writer)
+            return [b"subscribe", args[0], 1]
+        return RedisError(f"ERR unknown command '{name}'")
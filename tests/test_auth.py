@@ -0,0 +1,24 @@
+import hashlib
+from datetime import datetime, timedelta
+from modules.auth import manager as auth_manager
+from modules.auth.manager import TokenBlacklist
+
+class SkewedDatetime(datetime):
+    """App clock two hours ahead of the database's"""
+    @classmethod
+    def now(cls, tz=None):
+        return datetime.now(tz) + timedelta(hours=2)
+
+def test_blacklist_refresh_uses_database_clock(run, fetch, unique, monkeypatch):
+    monkeypatch.setattr(auth_manager, "datetime", SkewedDatetime)
+    blacklist = TokenBlacklist()
+    run(blacklist.refresh)
+    db_now = fetch("SELECT LOCALTIMESTAMP AS now")[0]["now"]
+    assert abs(blacklist._watermark - db_now) < timedelta(seconds=5)
+
+    token_hash = hashlib.sha256(f"test:{unique}".encode()).digest()
+    fetch("""
+        INSERT INTO token_blacklist (token_hash, expires_at) VALUES ($1, LOCALTIMESTAMP + interval '1 day')
+    """, token_hash)
+    run(blacklist.refresh)
+    assert token_hash in blacklist
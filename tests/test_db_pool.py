@@ -0,0 +1,39 @@
+import pytest
+from fastapi.testclient import TestClient
+from modules.shared.db import acquire_connection, get_pool_stats
+
+def test_debug_endpoints_require_auth():
+    from main import app
+    # Not entered as a context manager: no startup, so no database is needed
+    client = TestClient(app)
+    for path in ("/debug/db", "/debug/cache", "/debug/tasks"):
+        assert client.get(path).status_code == 401
+
+def test_debug_endpoints_require_admin(client, guest_headers):
+    assert client.get("/debug/db", headers=guest_headers).status_code == 403
+
+def test_match_routes_release_connections(client, admin_headers, season):
+    match_id = client.post("/matches/", json={
+        "team1_id": season["team_ids"][0], "team2_id": season["team_ids"][1], "season_id": season["season_id"],
+        "date": "2025-01-01", "time": "15:00:00",
+    }, headers=admin_headers).json()["data"]["match_id"]
+
+    for _ in range(3):
+        # Found, not found and error paths of the manager-backed routes
+        client.get(f"/matches/{match_id}/stats")
+        client.get(f"/matches/{match_id}/statistics")
+        client.get("/matches/999999999/statistics")
+        client.get("/matches/999999999/stats")
+
+    assert get_pool_stats()["outstanding"] == 0
+    assert client.get("/debug/db", headers=admin_headers).json()["outstanding"] == 0
+
+def test_acquire_connection_releases_on_error(run):
+    async def fail():
+        async with acquire_connection() as conn:
+            await conn.execute("SELECT 1")
+            raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        run(fail)
+    assert get_pool_stats()["outstanding"] == 0
@@ -0,0 +1,27 @@
+import asyncio
+import json
+from modules.exports import manager as export_manager
+
+def test_export_requires_login(client, admin_headers, season):
+    assert client.get("/export/standings").status_code == 401
+    response = client.get("/export/standings", params={"league_id": season["league_id"]}, headers=admin_headers)
+    assert response.status_code == 200
+    assert [json.loads(line) for line in response.text.splitlines()] == []
+
+def test_export_slots_are_released(client, fetch, admin_headers, season, monkeypatch):
+    monkeypatch.setattr(export_manager, "_export_slots", asyncio.Semaphore(1))
+    home, away = season["team_ids"]
+    fetch("""
+        INSERT INTO matches (season_id, team1_id, team2_id, date, time) VALUES ($1, $2, $3, '2025-01-01', '15:00')
+    """, season["season_id"], home, away)
+    for _ in range(3):
+        response = client.get("/export/matches", params={"season_id": season["season_id"]}, headers=admin_headers)
+        assert response.status_code == 200
+        assert len(response.text.splitlines()) == 1
+
+def test_export_answers_503_when_slots_stay_busy(client, admin_headers, monkeypatch):
+    monkeypatch.setattr(export_manager, "_export_slots", asyncio.Semaphore(0))
+    monkeypatch.setattr(export_manager, "EXPORT_SLOT_TIMEOUT", 0.05)
+    response = client.get("/export/goals", headers=admin_headers)
+    assert response.status_code == 503
+    assert response.json()["status"] == "error"
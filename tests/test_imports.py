@@ -0,0 +1,65 @@
+import json
+
+def test_goal_import_uses_column_defaults(client, fetch, admin_headers, season):
+    home, away = season["team_ids"]
+    match_id = fetch("""
+        INSERT INTO matches (season_id, team1_id, team2_id, date, time) VALUES ($1, $2, $3, '2025-01-01', '15:00')
+        RETURNING match_id
+    """, season["season_id"], home, away)[0]["match_id"]
+    player_id = fetch("""
+        INSERT INTO players (team_id, first_name, last_name) VALUES ($1, 'Ada', 'Striker') RETURNING player_id
+    """, home)[0]["player_id"]
+
+    body = (
+        f'{{"match_id": {match_id}, "player_id": {player_id}, "team_id": {home}, "minute": 10}}\n'
+        f'{{"match_id": {match_id}, "player_id": {player_id}, "team_id": {home}, "minute": 20, "goal_type": "penalty"}}\n'
+    )
+    response = client.post("/import/goals", content=body, headers={**admin_headers, "Content-Type": "application/x-ndjson"})
+    assert response.json()["data"]["inserted"] == 2
+    goals = fetch("SELECT minute, goal_type FROM match_goals WHERE match_id = $1 ORDER BY minute", match_id)
+    assert goals == [{"minute": 10, "goal_type": "regular"}, {"minute": 20, "goal_type": "penalty"}]
+
+def chunks(body: bytes, size: int):
+    for i in range(0, len(body), size):
+        yield body[i:i + size]
+
+def post_import(client, kind, body, headers, content_type):
+    return client.post(f"/import/{kind}", content=body, headers={**headers, "Content-Type": content_type})
+
+def test_ndjson_import_keeps_unicode_line_separators(client, fetch, admin_headers, season, unique):
+    # Written unescaped by the NDJSON export; str.splitlines would break on each
+    names = [f"Alpha\u2028{unique}", f"Beta\u2029\x85{unique}"]
+    body = "".join(
+        json.dumps({"league_id": season["league_id"], "team_name": name}, ensure_ascii=False) + "\n" for name in names
+    )
+    result = post_import(client, "teams", body.encode(), admin_headers, "application/x-ndjson").json()["data"]
+    assert (result["received"], result["inserted"], result["errors"]) == (2, 2, [])
+    stored = fetch("SELECT team_name FROM teams WHERE team_name = ANY($1::text[]) ORDER BY team_name", names)
+    assert [row["team_name"] for row in stored] == names
+
+def test_csv_import_streams_chunks(client, fetch, admin_headers, season, unique):
+    body = (
+        "\ufeffleague_id,team_name\r\n"
+        f'{season["league_id"]},"Multi\r\nLine {unique}"\r\n'
+        "\r\n"
+        f'{season["league_id"]},Ümlaut\x0c\x1c {unique}\r\n'
+        "not-a-number,Broken\r\n"
+    ).encode()
+
+    # Cut mid-line and inside the two-byte "Ü"
+    result = post_import(client, "teams", chunks(body, 7), admin_headers, "text/csv").json()["data"]
+    assert (result["received"], result["inserted"]) == (3, 2)
+    assert [error["row"] for error in result["errors"]] == [6]
+    stored = fetch("SELECT team_name FROM teams WHERE league_id = $1 ORDER BY team_id", season["league_id"])
+    assert [row["team_name"] for row in stored][-2:] == [f"Multi\r\nLine {unique}", f"Ümlaut\x0c\x1c {unique}"]
+
+def test_import_rejects_oversized_body(client, fetch, admin_headers, season, unique, monkeypatch):
+    from modules.imports import router as import_router
+    monkeypatch.setattr(import_router, "IMPORT_MAX_BYTES", 200)
+    body = "".join(
+        f'{{"league_id": {season["league_id"]}, "team_name": "Big {unique} {i}"}}\n' for i in range(10)
+    ).encode()
+    # The first rows are already copied when the limit is hit; they are rolled back
+    response = post_import(client, "teams", chunks(body, 50), admin_headers, "application/x-ndjson")
+    assert response.status_code == 413
+    assert fetch("SELECT count(*) FROM teams WHERE team_name LIKE $1", f"Big {unique}%")[0]["count"] == 0
@@ -0,0 +1,39 @@
+from datetime import date, time
+
+def test_match_pages_include_matches_without_date(fetch, page_through, season):
+    home, away = season["team_ids"]
+    schedule = [
+        (None, None), (None, time(18, 0)), (None, None),
+        (date(2025, 1, 1), None), (date(2025, 1, 1), time(15, 0)), (date(2025, 2, 1), time(12, 0)),
+    ]
+    match_ids = [
+        fetch("""
+            INSERT INTO matches (season_id, team1_id, team2_id, date, time) VALUES ($1, $2, $3, $4, $5)
+            RETURNING match_id
+        """, season["season_id"], home, away, match_date, match_time)[0]["match_id"]
+        for match_date, match_time in schedule
+    ]
+
+    for limit in (1, 2, 4):
+        items = page_through("/matches/", {"season_id": season["season_id"]}, limit)
+        # NULL dates first (NULL time before 18:00), then by date and time
+        assert [item["match_id"] for item in items] == [
+            match_ids[0], match_ids[2], match_ids[1], match_ids[3], match_ids[4], match_ids[5]
+        ]
+
+def test_goal_batch_requires_editor(client, fetch, season, admin_headers, guest_headers):
+    home, away = season["team_ids"]
+    match_id = fetch("""
+        INSERT INTO matches (season_id, team1_id, team2_id, date, time) VALUES ($1, $2, $3, '2025-01-01', '15:00')
+        RETURNING match_id
+    """, season["season_id"], home, away)[0]["match_id"]
+    player_id = fetch("""
+        INSERT INTO players (team_id, first_name, last_name) VALUES ($1, 'Ada', 'Striker') RETURNING player_id
+    """, home)[0]["player_id"]
+    batch = {"goals": [{"match_id": match_id, "player_id": player_id, "team_id": home, "minute": 10}]}
+
+    assert client.post("/matches/goals/batch", json=batch).status_code == 401
+    assert client.post("/matches/goals/batch", json=batch, headers=guest_headers).status_code == 403
+    assert fetch("SELECT count(*) FROM match_goals WHERE match_id = $1", match_id)[0]["count"] == 0
+    response = client.post("/matches/goals/batch", json=batch, headers=admin_headers)
+    assert response.json()["data"]["matches"] == [{"match_id": match_id, "home_score": 1, "away_score": 0}]
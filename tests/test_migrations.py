@@ -0,0 +1,103 @@
+import hashlib
+import uuid
+from urllib.parse import urlparse
+import asyncpg
+import pytest
+from conftest import TEST_DATABASE_URL
+from modules.shared.migrations import run_all_migrations
+from modules.shared.schema import CREATE_TABLES
+
+pytestmark = pytest.mark.anyio
+
+# token_blacklist as created before tokens were stored as digests
+BASELINE_TOKEN_BLACKLIST = """
+CREATE TABLE token_blacklist (
+    token TEXT PRIMARY KEY,
+    expires_at TIMESTAMP NOT NULL
+);
+"""
+
+@pytest.fixture
+async def empty_database():
+    """URL of a new, empty database next to TEST_DATABASE_URL"""
+    if not TEST_DATABASE_URL:
+        pytest.skip("set TEST_DATABASE_URL to run database-backed tests")
+    name = f"crimax_upgrade_{uuid.uuid4().hex[:8]}"
+    admin = await asyncpg.connect(TEST_DATABASE_URL)
+    await admin.execute(f"CREATE DATABASE {name}")
+    try:
+        yield urlparse(TEST_DATABASE_URL)._replace(path=f"/{name}").geturl()
+    finally:
+        await admin.execute(f"DROP DATABASE {name} WITH (FORCE)")
+        await admin.close()
+
+async def test_startup_upgrades_baseline_token_blacklist(empty_database):
+    conn = await asyncpg.connect(empty_database)
+    try:
+        await conn.execute(BASELINE_TOKEN_BLACKLIST)
+        await conn.execute(
+            "INSERT INTO token_blacklist (token, expires_at) VALUES ('old.jwt.token', NOW() + interval '1 hour')"
+        )
+
+        # What init_db runs on every start, twice to check it stays idempotent
+        for _ in range(2):
+            await conn.execute(CREATE_TABLES)
+            await run_all_migrations(conn)
+
+        columns = await conn.fetch("""
+            SELECT column_name, data_type FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = 'token_blacklist'
+            ORDER BY column_name
+        """)
+        assert [tuple(row) for row in columns] == [
+            ("created_at", "timestamp without time zone"),
+            ("expires_at", "timestamp without time zone"),
+            ("token_hash", "bytea"),
+        ]
+        indexes = await conn.fetch("SELECT indexname FROM pg_indexes WHERE tablename = 'token_blacklist' ORDER BY 1")
+        assert [row["indexname"] for row in indexes] == [
+            "idx_token_blacklist_created", "idx_token_blacklist_expires", "token_blacklist_pkey"
+        ]
+        assert await conn.fetchval("SELECT token_hash FROM token_blacklist") == hashlib.sha256(b"old.jwt.token").digest()
+    finally:
+        await conn.close()
+
+async def test_score_backfill_runs_on_first_deploy_only(empty_database):
+    conn = await asyncpg.connect(empty_database)
+    try:
+        await conn.execute(CREATE_TABLES)
+        await run_all_migrations(conn)
+        # As before the score triggers existed: goals recorded, scores never maintained
+        for operation in ("insert", "update", "delete"):
+            await conn.execute(f"DROP TRIGGER trg_match_goals_scores_{operation} ON match_goals")
+        league_id = await conn.fetchval("INSERT INTO leagues (league_name) VALUES ('League') RETURNING league_id")
+        home, away = [
+            await conn.fetchval("INSERT INTO teams (league_id, team_name) VALUES ($1, $2) RETURNING team_id", league_id, name)
+            for name in ("Home", "Away")
+        ]
+        season_id = await conn.fetchval("""
+            INSERT INTO seasons (league_id, season_name, start_date, end_date)
+            VALUES ($1, '2025', '2025-01-01', '2025-12-31') RETURNING season_id
+        """, league_id)
+        match_id = await conn.fetchval("""
+            INSERT INTO matches (season_id, team1_id, team2_id, date, time)
+            VALUES ($1, $2, $3, '2025-01-01', '15:00') RETURNING match_id
+        """, season_id, home, away)
+        player_id = await conn.fetchval(
+            "INSERT INTO players (team_id, first_name, last_name) VALUES ($1, 'Ada', 'Striker') RETURNING player_id", home
+        )
+        await conn.execute(
+            "INSERT INTO match_goals (match_id, player_id, team_id, minute) VALUES ($1, $2, $3, 10)", match_id, player_id, home
+        )
+        scores = "SELECT home_score, away_score FROM matches WHERE match_id = $1"
+        assert tuple(await conn.fetchrow(scores, match_id)) == (0, 0)
+
+        await run_all_migrations(conn)
+        assert tuple(await conn.fetchrow(scores, match_id)) == (1, 0)
+
+        # Once the triggers are in place a restart leaves the scores alone
+        await conn.execute("UPDATE matches SET home_score = 5 WHERE match_id = $1", match_id)
+        await run_all_migrations(conn)
+        assert tuple(await conn.fetchrow(scores, match_id)) == (5, 0)
+    finally:
+        await conn.close()
@@ -0,0 +1,74 @@
+from datetime import datetime
+
+def test_news_pages_reach_drafts(fetch, page_through, admin_headers, unique):
+    section_id = fetch("""
+        INSERT INTO sections (section_name, slug) VALUES ($1, $1) RETURNING section_id
+    """, f"section-{unique}")[0]["section_id"]
+    articles = [
+        (datetime(2025, 3, 1), datetime(2025, 2, 1)),
+        (datetime(2025, 1, 1), datetime(2025, 1, 1)),
+        (None, datetime(2025, 4, 1)),  # drafts
+        (None, datetime(2025, 4, 1)),
+        (None, None),
+    ]
+    news_ids = [
+        fetch("""
+            INSERT INTO news (section_id, title, slug, content, is_published, published_at, created_at)
+            VALUES ($1, $2, $2, 'Body', $3, $4, $5) RETURNING news_id
+        """, section_id, f"news-{unique}-{i}", published_at is not None, published_at, created_at)[0]["news_id"]
+        for i, (published_at, created_at) in enumerate(articles)
+    ]
+
+    for limit in (1, 2, 3):
+        items = page_through("/news/", {"section_id": section_id}, limit, items_key="news", headers=admin_headers)
+        # Published newest first, then drafts by creation time, newest id first on ties
+        assert [item["news_id"] for item in items] == [
+            news_ids[0], news_ids[1], news_ids[3], news_ids[2], news_ids[4]
+        ]
+
+def test_unpublished_news_is_hidden_from_readers(client, fetch, admin_headers, guest_headers, unique):
+    section_id = fetch("""
+        INSERT INTO sections (section_name, slug) VALUES ($1, $1) RETURNING section_id
+    """, f"section-{unique}")[0]["section_id"]
+    published, future, draft = [
+        fetch("""
+            INSERT INTO news (section_id, title, slug, content, is_published, published_at)
+            VALUES ($1, $2, $2, 'Body', $3, $4) RETURNING news_id
+        """, section_id, f"news-{unique}-{i}", is_published, published_at)[0]["news_id"]
+        for i, (is_published, published_at) in enumerate([
+            (True, datetime(2025, 1, 1)), (True, datetime(2999, 1, 1)), (False, None)
+        ])
+    ]
+    scheduled = client.post("/news/", headers=admin_headers, json={
+        "section_id": section_id, "title": "Scheduled", "slug": f"news-{unique}-scheduled",
+        "content": "Body", "is_published": True, "published_at": "2999-01-01T00:00:00",
+    }).json()["data"]["news_id"]
+
+    for headers in (None, guest_headers):
+        listed = client.get("/news/", params={"section_id": section_id}, headers=headers).json()["data"]
+        assert ([item["news_id"] for item in listed["news"]], listed["total"]) == ([published], 1)
+        for news_id in (future, draft, scheduled):
+            assert client.get(f"/news/{news_id}", headers=headers).status_code == 404
+        assert client.get(f"/news/slug/news-{unique}-scheduled", headers=headers).status_code == 404
+        assert client.get(f"/news/{published}", headers=headers).status_code == 200
+
+    listed = client.get("/news/", params={"section_id": section_id}, headers=admin_headers).json()["data"]
+    assert sorted(item["news_id"] for item in listed["news"]) == sorted([published, future, draft, scheduled])
+    assert client.get(f"/news/{scheduled}", headers=admin_headers).json()["data"]["scheduled_at"] is not None
+
+def test_search_skips_unpublished_news(client, fetch, admin_headers, unique):
+    word = f"zebra{unique}"
+    published, future, draft = [
+        fetch("""
+            INSERT INTO news (title, slug, content, is_published, published_at)
+            VALUES ($1, $1, $2, $3, $4) RETURNING news_id
+        """, f"news-{unique}-{i}", f"Secret {word} story", is_published, published_at)[0]["news_id"]
+        for i, (is_published, published_at) in enumerate([
+            (True, datetime(2025, 1, 1)), (True, datetime(2999, 1, 1)), (False, None)
+        ])
+    ]
+
+    hits = client.get("/news/search", params={"q": word}).json()["data"]["news"]
+    assert [hit["news_id"] for hit in hits] == [published]
+    hits = client.get("/news/search", params={"q": word}, headers=admin_headers).json()["data"]["news"]
+    assert sorted(hit["news_id"] for hit in hits) == sorted([published, future, draft])
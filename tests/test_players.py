@@ -0,0 +1,41 @@
+import pytest
+from modules.players.manager import promoted_columns
+
+@pytest.mark.parametrize("statistics, expected", [
+    (None, (None, None)),
+    ({"goals": 3}, (None, None)),
+    ({"position": "Forward", "squad_number": 9}, ("Forward", 9)),
+    ({"squad_number": " 10 "}, (None, 10)),
+    ({"squad_number": 7.0}, (None, 7)),
+    ({"position": 4, "squad_number": -2**31}, ("4", -2**31)),
+])
+def test_promoted_columns(statistics, expected):
+    assert promoted_columns(statistics) == expected
+
+@pytest.mark.parametrize("statistics", [
+    {"squad_number": 7.9},
+    {"squad_number": "7.9"},
+    {"squad_number": "seven"},
+    {"squad_number": True},
+    {"squad_number": [7]},
+    {"squad_number": 2**31},
+    {"position": "x" * 51},
+])
+def test_promoted_columns_rejects_values_that_dont_fit(statistics):
+    with pytest.raises(ValueError):
+        promoted_columns(statistics)
+
+def test_player_routes_reject_invalid_promoted_columns(client, fetch, admin_headers, season):
+    player = {"team_id": season["team_ids"][0], "first_name": "Ada", "last_name": "Striker"}
+    response = client.post("/players/", json={**player, "statistics": {"squad_number": 7.9}}, headers=admin_headers)
+    assert response.status_code == 400
+    response = client.post("/players/", json={**player, "statistics": {"position": "x" * 51}}, headers=admin_headers)
+    assert response.status_code == 400
+
+    response = client.post("/players/", json={**player, "statistics": {"position": "Forward", "squad_number": 9}}, headers=admin_headers)
+    assert response.status_code == 201
+    player_id = response.json()["data"]["player_id"]
+    response = client.put(f"/players/{player_id}", json={"statistics": {"squad_number": 2**31}}, headers=admin_headers)
+    assert response.status_code == 400
+    row = fetch("SELECT position, squad_number FROM players WHERE player_id = $1", player_id)[0]
+    assert row == {"position": "Forward", "squad_number": 9}
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import pytest
+from modules.shared import cache
+from modules.shared.cache import CACHE_INVALIDATION_CHANNEL, MISSING, TTLCache
+from modules.shared.redis_cache import RedisBackend, RedisError
+from fake_redis import FakeRedisServer
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+async def server():
+    server = FakeRedisServer(password="secret")
+    await server.start()
+    yield server
+    await server.stop()
+
+@pytest.fixture
+async def backend(server, monkeypatch):
+    """RedisBackend installed as the cache backend, as init_cache_backend() would"""
+    backend = RedisBackend(server.url)
+    backend.RECONNECT_DELAY = 0.01
+    monkeypatch.setattr(cache, "_backend", backend)
+    await backend.subscribe(CACHE_INVALIDATION_CHANNEL, cache._on_invalidation)
+    await wait_for(lambda: server.subscriber_count(CACHE_INVALIDATION_CHANNEL.encode()) == 1)
+    yield backend
+    await backend.close()
+
+async def wait_for(condition, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.005)
+
+def other_worker_message(**payload):
+    return json.dumps({"origin": "other-worker", **payload})
+
+async def test_get_set_and_ttl(server, backend):
+    assert await backend.get("missing") is MISSING
+    await backend.set("k", {"name": "Crimax", "ids": [1, 2]}, ttl=0.05)
+    assert await backend.get("k") == {"name": "Crimax", "ids": [1, 2]}
+    await asyncio.sleep(0.1)
+    assert await backend.get("k") is MISSING
+    # The handshake ran AUTH and SELECT before the first command
+    assert server.commands[:2] == ["AUTH", "SELECT"]
+
+async def test_wrong_password_is_rejected(server):
+    backend = RedisBackend(server.url.replace("secret", "wrong"))
+    with pytest.raises(RedisError):
+        await backend.get("k")
+    await backend.close()
+
+async def test_delete_prefix_scans_in_batches(backend):
+    backend.SCAN_BATCH = 3
+    for i in range(10):
+        await backend.set(f"crimax:a:{i}", i, ttl=60)
+        await backend.set(f"crimax:ab:{i}", i, ttl=60)
+    await backend.delete_prefix("crimax:a:")
+    assert [await backend.get(f"crimax:a:{i}") for i in range(10)] == [MISSING] * 10
+    assert [await backend.get(f"crimax:ab:{i}") for i in range(10)] == list(range(10))
+
+async def test_delete_removes_one_key(server, backend):
+    await backend.set("crimax:t:1", 1, ttl=60)
+    await backend.set("crimax:t:2", 2, ttl=60)
+    await backend.delete("crimax:t:1")
+    assert await backend.get("crimax:t:1") is MISSING
+    assert await backend.get("crimax:t:2") == 2
+    assert "SCAN" not in server.commands
+
+async def test_cache_reads_other_workers_entries(backend):
+    shared = TTLCache("test_shared", ttl=60)
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        return {"value": 1}
+
+    assert await shared.get_or_load("k", loader) == {"value": 1}
+    # Another worker with an empty local cache reuses the backend entry
+    shared.invalidate_local()
+    assert await shared.get_or_load("k", loader) == {"value": 1}
+    assert len(loads) == 1
+    assert shared.backend_hits == 1
+
+async def test_invalidate_clears_backend_and_other_workers(backend):
+    local = TTLCache("test_invalidate", ttl=60)
+    local.set("a", 1)
+    await backend.set(local._backend_key("a"), 1, ttl=60)
+    other = RedisBackend(backend.url)
+    received = []
+    await other.subscribe(CACHE_INVALIDATION_CHANNEL, received.append)
+    await asyncio.sleep(0.05)
+
+    await local.invalidate()
+    await wait_for(lambda: received)
+    assert json.loads(received[0]) == {"origin": cache._instance_id, "cache": "test_invalidate"}
+    assert await backend.get(local._backend_key("a")) is MISSING
+    await other.close()
+
+async def test_invalidation_from_other_worker(backend):
+    local = TTLCache("test_remote", ttl=60)
+    local.set("a", 1)
+    local.set("b", 2)
+    other = RedisBackend(backend.url)
+
+    # A single-key delete only drops that key
+    await other.publish(CACHE_INVALIDATION_CHANNEL, other_worker_message(cache="test_remote", key=repr("a")))
+    await wait_for(lambda: local.get("a") is None)
+    assert local.get("b") == 2
+
+    await other.publish(CACHE_INVALIDATION_CHANNEL, other_worker_message(cache="test_remote"))
+    await wait_for(lambda: local.get("b") is None)
+    await other.close()
+
+async def test_own_invalidations_are_ignored(backend):
+    local = TTLCache("test_own", ttl=60)
+    local.set("a", 1)
+    await backend.publish(
+        CACHE_INVALIDATION_CHANNEL, json.dumps({"origin": cache._instance_id, "cache": "test_own"})
+    )
+    await asyncio.sleep(0.05)
+    assert local.get("a") == 1
+
+async def test_cache_delete_uses_single_key(server, backend):
+    tokens = TTLCache("test_tokens", ttl=60)
+    await tokens.get_or_load("t1", lambda: asyncio.sleep(0, result=True))
+    await tokens.get_or_load("t2", lambda: asyncio.sleep(0, result=True))
+    await tokens.delete("t1")
+    assert tokens.get("t1") is None
+    assert tokens.get("t2") is True
+    assert await backend.get(tokens._backend_key("t1")) is MISSING
+    assert await backend.get(tokens._backend_key("t2")) is True
+    assert "SCAN" not in server.commands
+
+async def test_reconnects_after_connection_loss(server, backend):
+    await backend.set("k", 1, ttl=60)
+    server.disconnect_all()
+    # Commands reconnect once the reader has noticed the lost connection
+    await wait_for(lambda: not backend._conn.connected)
+    assert await backend.get("k") == 1
+
+    # The subscriber reconnects too and keeps delivering invalidations
+    local = TTLCache("test_resubscribe", ttl=60)
+    local.set("a", 1)
+    channel = CACHE_INVALIDATION_CHANNEL.encode()
+    await wait_for(lambda: server.subscriber_count(channel) == 1)
+    await backend.publish(CACHE_INVALIDATION_CHANNEL, other_worker_message(cache="test_resubscribe"))
+    await wait_for(lambda: local.get("a") is None)
+
+async def test_pending_commands_fail_on_connection_loss(server, backend):
+    await backend.set("k", 1, ttl=60)
+    reads = [asyncio.create_task(backend.get("k")) for _ in range(3)]
+    await asyncio.sleep(0)
+    server.disconnect_all()
+    results = await asyncio.gather(*reads, return_exceptions=True)
+    assert all(result == 1 or isinstance(result, ConnectionError) for result in results)
+    await wait_for(lambda: not backend._conn.connected)
+    assert await backend.get("k") == 1
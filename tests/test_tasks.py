@@ -0,0 +1,71 @@
+import asyncio
+from contextlib import asynccontextmanager
+import pytest
+from modules.news import manager as news_manager
+from modules.news.manager import ViewCounter
+from modules.shared import tasks
+from modules.shared.tasks import PeriodicTask
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+def periodic_task():
+    """Build PeriodicTasks that are unregistered again after the test"""
+    created = []
+
+    def build(name, *args, **kwargs):
+        created.append(name)
+        return PeriodicTask(name, *args, **kwargs)
+
+    yield build
+    for name in created:
+        tasks._tasks.pop(name, None)
+
+async def test_stop_waits_for_running_call(periodic_task):
+    started, finished = asyncio.Event(), []
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(0.05)
+        finished.append(True)
+
+    task = periodic_task("test_slow", 0.001, slow)
+    task.start()
+    await started.wait()
+    await task.stop()
+    assert finished == [True]
+    assert task.stats()["runs"] == 1
+    assert task.stats()["running"] is False
+
+async def test_stop_runs_once_more_when_asked(periodic_task):
+    calls = []
+
+    async def record():
+        calls.append(True)
+
+    task = periodic_task("test_final", 3600, record, run_on_stop=True)
+    task.start()
+    await task.stop()
+    assert calls == [True]
+
+async def test_cancelled_view_flush_keeps_views(monkeypatch):
+    started = asyncio.Event()
+
+    @asynccontextmanager
+    async def hanging_connection():
+        started.set()
+        await asyncio.sleep(3600)
+        yield
+
+    monkeypatch.setattr(news_manager, "acquire_connection", hanging_connection)
+    counter = ViewCounter()
+    counter.add(1, 3)
+    counter.add(2)
+    flush = asyncio.create_task(counter.flush())
+    await started.wait()
+    counter.add(1)  # a view counted while the flush is running
+    flush.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await flush
+    assert (counter.pending(1), counter.pending(2)) == (4, 1)
+    assert counter.flushed_snapshot() == {}